@@ -0,0 +1,116 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import pandas as pd
+from typing import Optional
+
+import config
+from model import get_model_client
+
+# Parsed news columns that determine the LLM prompt
+NEWS_KEY_COLUMNS = ['time_published', 'title', 'summary', 'url']
+
+
+def hash_news(df_news: pd.DataFrame) -> str:
+    """
+    Stable content hash of the parsed news rows.
+
+    Only the columns that end up in the prompt are hashed, so two fetches of the
+    same articles give the same hash even if other metadata differs.
+    """
+    columns = [c for c in NEWS_KEY_COLUMNS if c in df_news.columns]
+    digest = hashlib.sha256(','.join(columns).encode('utf-8'))
+    if columns and not df_news.empty:
+        row_hashes = pd.util.hash_pandas_object(df_news[columns].astype(str), index=False)
+        digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Disk-backed cache of LLM analyses with size-bounded LRU eviction.
+
+    Entries are keyed by symbol, signal date, a hash of the parsed news, the
+    model in use, the language and the prompt template version, so any change
+    in the inputs of an analysis results in a miss. Safe to share between the
+    worker threads of app.run.
+    """
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.path = path or config.ANALYSIS_CACHE_PATH
+        self.max_entries = max_entries or config.ANALYSIS_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " key TEXT PRIMARY KEY,"
+            " analysis TEXT NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS analyses_last_access ON analyses (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        symbol: str,
+        signal_date: pd.Timestamp,
+        df_news: pd.DataFrame,
+        lang: str,
+        model: str = None,
+        prompt_version: int = None
+    ) -> str:
+        """
+        Build the cache key of one analysis.
+        """
+        parts = [
+            symbol.upper(),
+            pd.Timestamp(signal_date).strftime('%Y-%m-%d'),
+            hash_news(df_news),
+            model or get_model_client().model_id,
+            lang,
+            str(prompt_version if prompt_version is not None else config.PROMPT_TEMPLATE_VERSION),
+        ]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached analysis for `key`, or None on a miss.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis FROM analyses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE analyses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, analysis: str) -> None:
+        """
+        Store an analysis, evicting the least recently used entries over the limit.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, analysis, last_access) VALUES (?, ?, ?)",
+                (key, analysis, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM analyses WHERE key IN ("
+                " SELECT key FROM analyses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
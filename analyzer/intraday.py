@@ -0,0 +1,168 @@
+import datetime
+import math
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union
+
+import pandas as pd
+
+# Name -> length in seconds of the sliding windows; None measures the move
+# since the first bar of the session
+DEFAULT_WINDOWS = {'5m': 300, '30m': 1800, 'open': None}
+
+Time = Union[float, int, datetime.datetime, pd.Timestamp]
+
+
+class IntradaySignal(NamedTuple):
+    time: pd.Timestamp
+    symbol: str
+    window: str         # name of the window whose threshold was crossed
+    pct_change: float   # move over the window, in percent
+    price: float
+    reference: float    # price at the start of the window
+
+
+class _SymbolState:
+    """
+    Fixed-size state of one symbol: a ring of the last close of every
+    `resolution` slot covering the longest window, the session open and
+    whether each window may fire again.
+    """
+    __slots__ = ('ring', 'last_slot', 'last_time', 'open', 'armed')
+
+    def __init__(self, size: int, slot: int, t: float, price: float, n_windows: int):
+        # No reference before the session started
+        self.ring = [math.nan] * size
+        self.ring[slot % size] = price
+        self.last_slot = slot
+        self.last_time = t
+        self.open = price
+        self.armed = [True] * n_windows
+
+
+class IntradayMoveDetector:
+    """
+    Streaming detector of intraday moves, fed one bar (or tick) at a time.
+
+    For every symbol it keeps O(1) state: the last price of each
+    `resolution`-second slot over the longest window (gaps are carried
+    forward), plus the session open. Each update compares the price with the
+    price one window ago (and with the session open) and emits a signal the
+    moment a window's threshold is crossed. A window fires again only after
+    its move fell back below `rearm_ratio` times its threshold, so a lasting
+    move is reported once.
+
+    A new session starts at the first bar of a symbol and after a gap of
+    more than `session_gap` seconds (the overnight break).
+
+    Args:
+        thresholds: Window name -> threshold in percent
+                    (defaults to config.INTRADAY_THRESHOLDS).
+        windows: Window name -> length in seconds, None for the session open.
+        resolution: Slot length in seconds; windows must be multiples of it.
+        rearm_ratio: Fraction of the threshold a move must fall back below
+                     before the window can fire again.
+        session_gap: Seconds without bars that start a new session.
+    """
+
+    def __init__(
+        self,
+        thresholds: Dict[str, float] = None,
+        windows: Dict[str, int] = None,
+        resolution: int = 60,
+        rearm_ratio: float = 0.5,
+        session_gap: float = 4 * 3600
+    ):
+        if thresholds is None:
+            import config
+            thresholds = config.INTRADAY_THRESHOLDS
+        windows = dict(DEFAULT_WINDOWS if windows is None else windows)
+        unknown = set(thresholds) - set(windows)
+        if unknown:
+            raise ValueError(f'No window defined for thresholds {sorted(unknown)}')
+        for name, seconds in windows.items():
+            if seconds is not None and (seconds <= 0 or seconds % resolution):
+                raise ValueError(f'Window {name!r} must be a positive multiple of {resolution}s')
+
+        self.resolution = resolution
+        self.rearm_ratio = rearm_ratio
+        self.session_gap = session_gap
+        # (name, slots back or None, threshold) of the windows with a threshold
+        self._windows: List[Tuple[str, int, float]] = [
+            (name, None if seconds is None else seconds // resolution, thresholds[name])
+            for name, seconds in windows.items() if name in thresholds
+        ]
+        self._size = max([slots for _, slots, _ in self._windows if slots] + [0]) + 1
+        self._states: Dict[str, _SymbolState] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def reset(self, symbol: str = None) -> None:
+        """Forget the state of `symbol` (of every symbol by default)."""
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states.pop(symbol, None)
+
+    def update(self, symbol: str, time: Time, price: float) -> List[IntradaySignal]:
+        """
+        Feed one bar of `symbol` (bars of a symbol must come in time order;
+        late ones are ignored).
+
+        Args:
+            symbol: Ticker symbol.
+            time: Bar time, as epoch seconds or a (tz-aware) datetime.
+            price: Last (close) price of the bar.
+
+        Returns:
+            List[IntradaySignal]: Thresholds crossed by this bar (usually empty).
+        """
+        t = time.timestamp() if isinstance(time, datetime.datetime) else float(time)
+        slot = int(t // self.resolution)
+        size = self._size
+        state = self._states.get(symbol)
+
+        if state is None or t - state.last_time > self.session_gap:
+            self._states[symbol] = _SymbolState(size, slot, t, price, len(self._windows))
+            return []
+        if slot < state.last_slot:
+            return []
+
+        ring = state.ring
+        if slot > state.last_slot:
+            # Carry the last price over the slots without bars (at most one ring)
+            last_price = ring[state.last_slot % size]
+            for missing in range(max(state.last_slot + 1, slot - size + 1), slot):
+                ring[missing % size] = last_price
+        ring[slot % size] = price
+        state.last_slot = slot
+        state.last_time = t
+
+        signals = []
+        armed = state.armed
+        for i, (name, slots, threshold) in enumerate(self._windows):
+            reference = state.open if slots is None else ring[(slot - slots) % size]
+            if not reference or reference != reference:  # zero or NaN
+                continue
+            pct = (price / reference - 1) * 100
+            move = abs(pct)
+            if move >= threshold:
+                if armed[i]:
+                    armed[i] = False
+                    signals.append(IntradaySignal(
+                        pd.Timestamp(t, unit='s', tz='UTC'), symbol, name, pct, price, reference
+                    ))
+            elif move < threshold * self.rearm_ratio:
+                armed[i] = True
+        return signals
+
+    def update_many(self, bars: Iterable[Tuple[str, Time, float]]) -> List[IntradaySignal]:
+        """
+        Feed (symbol, time, price) bars in order; all signals they trigger.
+        """
+        signals = []
+        update = self.update
+        for symbol, time, price in bars:
+            found = update(symbol, time, price)
+            if found:
+                signals.extend(found)
+        return signals
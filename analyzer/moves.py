@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import List, NamedTuple
 
 
 def detect_significant_moves(
@@ -25,3 +26,118 @@ def detect_significant_moves(
     # Find dates with significant moves
     mask = df_prices['pct_change'].abs() >= threshold_pct
     return df_prices.index[mask].tolist()
+
+
+class MoveSignal(NamedTuple):
+    date: pd.Timestamp
+    symbol: str
+    pct_change: float
+    score: float  # move size in units of the method's threshold measure (%, z, ATRs)
+
+
+def _rolling_prior_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Per row t, the column sums of values[t - window:t] (the rows before t).
+    """
+    csum = np.zeros((values.shape[0] + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=csum[1:])
+    upper = csum[:-1]
+    lower = np.zeros_like(upper)
+    lower[window:] = csum[:-window - 1]
+    return upper - lower
+
+
+def _previous_valid(values: np.ndarray) -> np.ndarray:
+    """
+    Per row t, the column values of the last row before t that is not NaN
+    (NaN if there is none), so a gap in a column does not hide the next move.
+    """
+    rows = np.arange(values.shape[0])[:, None]
+    last = np.where(np.isnan(values), -1, rows)
+    np.maximum.accumulate(last, axis=0, out=last)
+    prev_row = np.full_like(last, -1)
+    prev_row[1:] = last[:-1]
+    prev = values[np.clip(prev_row, 0, None), np.arange(values.shape[1])]
+    prev[prev_row < 0] = np.nan
+    return prev
+
+
+def detect_significant_moves_panel(
+    close: pd.DataFrame,
+    threshold: float,
+    method: str = 'pct',
+    window: int = 20,
+    high: pd.DataFrame = None,
+    low: pd.DataFrame = None
+) -> List[MoveSignal]:
+    """
+    Detect significant daily moves across a whole dates x symbols panel in one
+    vectorized pass. The input frames are neither modified nor copied beyond
+    the NumPy view of their values. Missing closes (holidays, halts, symbols
+    listed later) are skipped: a day's move is taken against the symbol's
+    last known close.
+
+    Methods:
+        'pct':    |pct_change| >= threshold (percent, as detect_significant_moves).
+        'zscore': the day's return is at least `threshold` standard deviations
+                  from the mean of the previous `window` returns of that symbol.
+        'atr':    |close - prev_close| >= `threshold` times the average true
+                  range of the previous `window` days (uses `high`/`low` when
+                  given, otherwise close-to-close ranges).
+
+    Args:
+        close: Close prices, datetime index, one column per symbol.
+        threshold: Threshold in the unit of `method`.
+        method: One of 'pct', 'zscore', 'atr'.
+        window: Look-back window (days) of the volatility-normalized methods.
+        high: Optional high prices aligned with `close` (for 'atr').
+        low: Optional low prices aligned with `close` (for 'atr').
+
+    Returns:
+        List[MoveSignal]: Signals sorted by date, then by symbol column order.
+    """
+    c = close.to_numpy(dtype=float)
+    prev = _previous_valid(c)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = (c / prev - 1) * 100
+
+        if method == 'pct':
+            score = np.abs(pct) / threshold
+        elif method == 'zscore':
+            valid = ~np.isnan(pct)
+            r = np.where(valid, pct, 0.0)
+            count = _rolling_prior_sum(valid.astype(float), window)
+            total = _rolling_prior_sum(r, window)
+            total_sq = _rolling_prior_sum(r * r, window)
+            mean = total / count
+            var = (total_sq - total * mean) / (count - 1)
+            std = np.sqrt(np.clip(var, 0, None))
+            z = (pct - mean) / std
+            z[count < max(2, window // 2)] = np.nan
+            score = np.abs(z) / threshold
+        elif method == 'atr':
+            move = np.abs(c - prev)
+            if high is not None and low is not None:
+                h = high.to_numpy(dtype=float)
+                l = low.to_numpy(dtype=float)
+                true_range = np.fmax(h - l, np.fmax(np.abs(h - prev), np.abs(l - prev)))
+            else:
+                true_range = move
+            valid = ~np.isnan(true_range)
+            count = _rolling_prior_sum(valid.astype(float), window)
+            atr = _rolling_prior_sum(np.where(valid, true_range, 0.0), window) / count
+            atr[count < max(1, window // 2)] = np.nan
+            score = move / atr / threshold
+        else:
+            raise ValueError(f"Unknown method '{method}', expected 'pct', 'zscore' or 'atr'")
+
+        mask = score >= 1.0
+
+    rows, cols = np.nonzero(mask)
+    dates = close.index
+    symbols = close.columns
+    return [
+        MoveSignal(dates[i], symbols[j], float(pct[i, j]), float(score[i, j] * threshold))
+        for i, j in zip(rows, cols)
+    ]
@@ -0,0 +1,48 @@
+import datetime
+import pandas as pd
+from typing import Dict
+
+
+class NewsIndex:
+    """
+    Parsed news of a whole date range, grouped by publication date.
+
+    Built once from the result of a range fetch, then read per signal date
+    instead of fetching the news of every signal separately. Publication
+    times are bucketed by their UTC date, the same day boundaries the
+    per-date NewsAPI queries use.
+
+    With `covered_from`, the news is only known to be whole from that date on
+    (e.g. a range fetch cut short by a limit): earlier dates read as empty,
+    so they are fetched on their own.
+    """
+
+    def __init__(
+        self,
+        df_news: pd.DataFrame,
+        time_column: str = 'time_published',
+        covered_from: datetime.date = None
+    ):
+        self.columns = df_news.columns
+        self.covered_from = covered_from
+        self._by_date: Dict[datetime.date, pd.DataFrame] = {}
+        if df_news.empty or time_column not in df_news.columns:
+            return
+
+        published = pd.to_datetime(df_news[time_column], utc=True, errors='coerce')
+        days = published.dt.date
+        for day, rows in df_news.groupby(days, sort=False):
+            self._by_date[day] = rows.reset_index(drop=True)
+
+    def for_date(self, signal_date: pd.Timestamp) -> pd.DataFrame:
+        """
+        News published on the calendar date of `signal_date` (empty if none).
+        """
+        day = pd.Timestamp(signal_date).date()
+        rows = None if self.covered_from is not None and day < self.covered_from else self._by_date.get(day)
+        if rows is None:
+            return pd.DataFrame(columns=self.columns)
+        return rows
+
+    def __len__(self) -> int:
+        return len(self._by_date)
@@ -1,71 +1,274 @@
+import json
+import logging
 import pandas as pd
-from typing import Optional, Dict, Any
-from openai import OpenAI
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import config
+from model import ModelClient, get_model_client
 from config_lang import LANG_CONFIG
-import streamlit as st
+from analyzer.prompt import build_news_text, estimate_tokens
+
+# (df_news, signal_date, price_change_pct) for one signal in a batched request
+SignalNews = Tuple[pd.DataFrame, pd.Timestamp, float]
+
+logger = logging.getLogger(__name__)
+
+
+def is_incomplete_analysis(text: Optional[str], lang: str = "zh") -> bool:
+    """
+    Whether `text` is an error message or an answer cut off by the deadline,
+    i.e. whether asking again may give a better one.
+    """
+    config_lang = LANG_CONFIG.get(lang, LANG_CONFIG["en"])
+    if not text or not text.strip():
+        return True
+    return text.startswith(config_lang["error_prefix"]) or text.endswith(config_lang["partial_notice"])
+
+
+def is_final_analysis(text: Optional[str], lang: str = "zh") -> bool:
+    """
+    Whether `text` is a real LLM answer rather than a placeholder, error
+    message or partial answer, i.e. whether it is worth caching.
+    """
+    config_lang = LANG_CONFIG.get(lang, LANG_CONFIG["en"])
+    if is_incomplete_analysis(text, lang):
+        return False
+    return text not in (config_lang["no_news"], config_lang["no_api_key"])
+
+
+def _signal_context(
+    signal_date: pd.Timestamp,
+    price_change_pct: float,
+    config_lang: Dict[str, Any]
+) -> Dict[str, str]:
+    """
+    Format the date and move direction of a signal for the prompt templates.
+    """
+    return {
+        "date_str": signal_date.strftime(config_lang["date_format"]),
+        "direction_text": config_lang["direction_up"] if price_change_pct > 0 else config_lang["direction_down"],
+    }
+
 
 def analyze_news_with_openai(
     df_news: pd.DataFrame,
     signal_date: pd.Timestamp,
     price_change_pct: float,
     symbol: str,
-    lang: str = "zh"
+    lang: str = "zh",
+    on_token: Callable[[str], None] = None,
+    model_client: ModelClient = None
 ) -> Optional[str]:
     """
     Use OpenAI LLM to analyze daily news and infer reasons for stock price movements.
+
+    The request runs within the model client's latency budget (see
+    ModelClient.complete_hedged): a slow request is hedged, and when the
+    deadline passes the text received so far is returned followed by the
+    `partial_notice` of the language, or an error message if there was none.
+
+    With `on_token`, the answer is streamed: every piece of text is passed to
+    `on_token` as soon as the model generates it (placeholders, notices and
+    error messages too, so the caller can show everything it receives). The
+    return value is the full answer, or the error message if the stream
+    broke off.
+
+    `model_client` defaults to the process-wide client (see get_model_client).
     """
     config_lang = LANG_CONFIG.get(lang, LANG_CONFIG["en"])
-    
-    def extract_response_text(response) -> str:
-        try:
-            return response.output[0].content[0].text.strip()
-        except Exception as e:
-            return f"[Error extracting response text: {e}]"
-    
+    emit = on_token or (lambda piece: None)
+
     if df_news.empty:
+        emit(config_lang["no_news"])
         return config_lang["no_news"]
 
-    if not config.OPENAI_API_KEY:
+    client = model_client or get_model_client()
+    if client.requires_api_key and not config.OPENAI_API_KEY:
+        emit(config_lang["no_api_key"])
         return config_lang["no_api_key"]
 
+    received = False
+
+    def forward(piece):
+        nonlocal received
+        received = True
+        on_token(piece)
+
     try:
-        client = OpenAI(api_key=config.OPENAI_API_KEY)
-
-        # Build news summaries
-        summaries = []
-        for _, row in df_news.iterrows():
-            ts = row["time_published"]
-            summaries.append(
-                f"{config_lang['time_label']}: {ts}\n"
-                f"{config_lang['title_label']}: {row['title']}\n"
-                f"{config_lang['summary_label']}: {row['summary']}\n"
-            )
-        
-        news_text = "\n\n---\n\n".join(summaries)
+        # Build news summaries (deduplicated, ranked and packed to the token budget)
+        news_text = build_news_text(df_news, config_lang)
 
-        # Format date and direction
-        date_str = signal_date.strftime(config_lang["date_format"])
-        direction_text = config_lang[f"direction_up"] if price_change_pct > 0 else config_lang["direction_down"]
-        
         # Format prompts
         user_prompt = config_lang["user_prompt"].format(
             symbol=symbol,
-            date_str=date_str,
-            direction_text=direction_text,
             price_change=abs(price_change_pct),
-            news_text=news_text
+            news_text=news_text,
+            **_signal_context(signal_date, price_change_pct, config_lang)
         )
 
-        response = client.responses.create(
-            model=config.OPENAI_MODEL,
-            instructions=config_lang['system_instruction'],
-            input=user_prompt,
+        response = client.complete_hedged(
+            config_lang['system_instruction'],
+            user_prompt,
+            on_piece=forward if on_token is not None else None
         )
-
-        return extract_response_text(response)
+        text = response.text.strip()
+        if not response.partial:
+            return text
+        if not text:
+            raise TimeoutError(config_lang["deadline_exceeded"].format(seconds=client.deadline))
+        emit(f"\n\n{config_lang['partial_notice']}")
+        return f"{text}\n\n{config_lang['partial_notice']}"
 
     except Exception as err:
         err_msg = f"{config_lang['error_prefix']}: {err}"
-        st.error(err_msg)
-        return err_msg
\ No newline at end of file
+        logger.error(err_msg)
+        # Keep what was already shown, the error goes below it
+        emit(f"\n\n{err_msg}" if received else err_msg)
+        return err_msg
+
+
+def _build_signal_block(
+    df_news: pd.DataFrame,
+    signal_date: pd.Timestamp,
+    price_change_pct: float,
+    symbol: str,
+    config_lang: Dict[str, Any]
+) -> str:
+    """
+    Render one signal date (header line plus its news) for a batched prompt.
+    """
+    header = config_lang["signal_header"].format(
+        date_key=signal_date.strftime('%Y-%m-%d'),
+        symbol=symbol,
+        price_change=abs(price_change_pct),
+        **_signal_context(signal_date, price_change_pct, config_lang)
+    )
+    return f"{header}\n\n{build_news_text(df_news, config_lang)}"
+
+
+def plan_batches(
+    blocks: List[str],
+    batch_size: int,
+    max_tokens: int
+) -> List[List[int]]:
+    """
+    Greedily group consecutive signal blocks into batches.
+
+    A batch holds at most `batch_size` blocks and about `max_tokens` prompt
+    tokens. A single block larger than `max_tokens` gets a batch of its own.
+
+    Returns:
+        List[List[int]]: Indices into `blocks`, one list per batch.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for i, block in enumerate(blocks):
+        tokens = estimate_tokens(block)
+        if current and (len(current) >= batch_size or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(i)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def analyze_news_batch_with_openai(
+    signals: List[SignalNews],
+    symbol: str,
+    lang: str = "zh",
+    batch_size: int = None,
+    max_tokens: int = None,
+    model_client: ModelClient = None
+) -> Dict[pd.Timestamp, str]:
+    """
+    Analyze several signal dates with as few LLM requests as possible.
+
+    The signals are packed into batches (see `plan_batches`), each batch is sent
+    as one request asking for a JSON object keyed by date, and the response is
+    split back into one analysis per signal date. Dates the model left out of
+    its answer fall back to `analyze_news_with_openai`.
+
+    Each request runs within the model client's latency budget like a single
+    analysis (see ModelClient.complete_hedged); a batch that misses the
+    deadline gets an error message for all of its dates.
+
+    Args:
+        signals: List of (df_news, signal_date, price_change_pct).
+        symbol: Stock ticker symbol.
+        lang: Language code for prompts and messages.
+        batch_size: Max signals per request (defaults to config.LLM_BATCH_SIZE).
+        max_tokens: Max estimated prompt tokens per request
+                    (defaults to config.LLM_BATCH_MAX_TOKENS).
+        model_client: Client of the requests (defaults to get_model_client()).
+
+    Returns:
+        Dict[pd.Timestamp, str]: LLM analysis text per signal date.
+    """
+    config_lang = LANG_CONFIG.get(lang, LANG_CONFIG["en"])
+    batch_size = batch_size or config.LLM_BATCH_SIZE
+    max_tokens = max_tokens or config.LLM_BATCH_MAX_TOKENS
+
+    client = model_client or get_model_client()
+    results: Dict[pd.Timestamp, str] = {}
+    pending = []
+    for df_news, signal_date, price_change_pct in signals:
+        if df_news.empty:
+            results[signal_date] = config_lang["no_news"]
+        elif client.requires_api_key and not config.OPENAI_API_KEY:
+            results[signal_date] = config_lang["no_api_key"]
+        else:
+            pending.append((df_news, signal_date, price_change_pct))
+
+    if not pending:
+        return results
+
+    blocks = [
+        _build_signal_block(df_news, signal_date, price_change_pct, symbol, config_lang)
+        for df_news, signal_date, price_change_pct in pending
+    ]
+
+    for batch in plan_batches(blocks, batch_size, max_tokens):
+        if len(batch) == 1:
+            df_news, signal_date, price_change_pct = pending[batch[0]]
+            results[signal_date] = analyze_news_with_openai(
+                df_news, signal_date, price_change_pct, symbol, lang, model_client=client
+            )
+            continue
+
+        date_keys = {pending[i][1].strftime('%Y-%m-%d'): pending[i][1] for i in batch}
+        user_prompt = config_lang["batch_user_prompt"].format(
+            symbol=symbol,
+            signals_text="\n\n".join(blocks[i] for i in batch),
+            date_keys=", ".join(date_keys)
+        )
+
+        try:
+            response = client.complete_hedged(
+                config_lang['system_instruction'],
+                user_prompt,
+                text={"format": {"type": "json_object"}},
+            )
+            # A JSON answer cut off by the deadline cannot be split by date
+            if response.partial:
+                raise TimeoutError(config_lang["deadline_exceeded"].format(seconds=client.deadline))
+            answers = json.loads(response.text)
+        except Exception as err:
+            err_msg = f"{config_lang['error_prefix']}: {err}"
+            logger.error(err_msg)
+            for signal_date in date_keys.values():
+                results[signal_date] = err_msg
+            continue
+
+        for i in batch:
+            df_news, signal_date, price_change_pct = pending[i]
+            answer = answers.get(signal_date.strftime('%Y-%m-%d')) if isinstance(answers, dict) else None
+            if isinstance(answer, str) and answer.strip():
+                results[signal_date] = answer.strip()
+            else:
+                results[signal_date] = analyze_news_with_openai(
+                    df_news, signal_date, price_change_pct, symbol, lang, model_client=client
+                )
+
+    return results
@@ -0,0 +1,159 @@
+import re
+import zlib
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+import config
+
+# Mersenne prime 2^31 - 1; the MinHash permutations are (a * h + b) mod PRIME
+_PRIME = np.uint64((1 << 31) - 1)
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+ARTICLE_SEPARATOR = "\n\n---\n\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token estimate of a prompt (~4 characters per token).
+    """
+    return len(text) // 4 + 1
+
+
+def _permutations(num_perm: int, seed: int = 1):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+    return a, b
+
+
+def minhash_signatures(texts: Sequence[str], num_perm: int = 64, shingle: int = 3) -> np.ndarray:
+    """
+    MinHash sketch of every text over its lower-cased word `shingle`-grams.
+
+    The share of equal positions between two rows estimates the Jaccard
+    similarity of the two texts. Hashes are CRC32, so sketches are the same
+    across processes.
+
+    Returns:
+        np.ndarray: uint64 array of shape (len(texts), num_perm).
+    """
+    a, b = _permutations(num_perm)
+    signatures = np.full((len(texts), num_perm), _PRIME, dtype=np.uint64)
+    for i, text in enumerate(texts):
+        words = _WORD.findall(str(text).lower())
+        if not words:
+            continue
+        n = min(shingle, len(words))
+        grams = {' '.join(words[j:j + n]) for j in range(len(words) - n + 1)}
+        hashes = np.fromiter((zlib.crc32(g.encode('utf-8')) for g in grams), dtype=np.uint64, count=len(grams))
+        # Keep the products below 2^64: the hashes are reduced mod PRIME first
+        hashes %= _PRIME
+        signatures[i] = ((np.outer(hashes, a) + b) % _PRIME).min(axis=0)
+    return signatures
+
+
+def collapse_near_duplicates(
+    texts: Sequence[str],
+    threshold: float = 0.6,
+    num_perm: int = 64,
+    bands: int = 16
+) -> np.ndarray:
+    """
+    Keep the first text of every group of near-duplicates (estimated Jaccard
+    similarity >= `threshold`), so order the texts by priority beforehand.
+
+    Candidate pairs come from locality-sensitive hashing on `bands` bands of
+    the MinHash signatures; only those pairs are compared.
+
+    Returns:
+        np.ndarray: Boolean mask of the texts to keep.
+    """
+    keep = np.ones(len(texts), dtype=bool)
+    if len(texts) < 2:
+        return keep
+
+    signatures = minhash_signatures(texts, num_perm)
+    rows = num_perm // bands
+    buckets: Dict[tuple, List[int]] = {}
+    for i, signature in enumerate(signatures):
+        candidates = set()
+        keys = [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(bands)]
+        for key in keys:
+            candidates.update(buckets.get(key, ()))
+        if any((signatures[j] == signature).mean() >= threshold for j in candidates):
+            keep[i] = False
+            continue
+        # Only kept texts are representatives the later ones are compared with
+        for key in keys:
+            buckets.setdefault(key, []).append(i)
+    return keep
+
+
+def rank_articles(df_news: pd.DataFrame, half_life_hours: float = None) -> pd.DataFrame:
+    """
+    Sort articles by priority: relevance (1.0 when the provider has none)
+    decayed by age relative to the latest article, with a `half_life_hours`
+    half-life.
+    """
+    half_life_hours = half_life_hours or config.PROMPT_RECENCY_HALF_LIFE_HOURS
+    if 'relevance_score' in df_news.columns:
+        relevance = pd.to_numeric(df_news['relevance_score'], errors='coerce').fillna(1.0).to_numpy(dtype=float)
+    else:
+        relevance = np.ones(len(df_news))
+
+    published = pd.to_datetime(df_news['time_published'], utc=True, errors='coerce')
+    age_hours = ((published.max() - published).dt.total_seconds() / 3600).fillna(24 * 365).to_numpy()
+    score = relevance * np.power(0.5, age_hours / half_life_hours)
+    return df_news.iloc[np.argsort(-score, kind='stable')]
+
+
+def select_articles(
+    df_news: pd.DataFrame,
+    max_tokens: int = None,
+    similarity_threshold: float = None
+) -> pd.DataFrame:
+    """
+    The articles worth sending to the LLM: near-duplicate headlines and
+    summaries collapsed, the rest ranked (see `rank_articles`) and packed
+    until `max_tokens` prompt tokens. At least one article is always kept.
+
+    Returns:
+        pd.DataFrame: Selected rows in publication order.
+    """
+    max_tokens = max_tokens or config.PROMPT_NEWS_MAX_TOKENS
+    similarity_threshold = similarity_threshold or config.PROMPT_DUPLICATE_SIMILARITY
+    if df_news.empty:
+        return df_news
+
+    ranked = rank_articles(df_news)
+    texts = (ranked['title'].fillna('').astype(str) + ' ' + ranked['summary'].fillna('').astype(str)).tolist()
+    ranked = ranked[collapse_near_duplicates(texts, similarity_threshold)]
+
+    tokens = (ranked['title'].fillna('').astype(str).str.len()
+              + ranked['summary'].fillna('').astype(str).str.len()) // 4 + 1
+    fits = (tokens.cumsum() <= max_tokens).to_numpy()
+    fits[0] = True
+    return ranked[fits].sort_values('time_published', kind='stable')
+
+
+def format_articles(df_news: pd.DataFrame, config_lang: Dict[str, Any]) -> str:
+    """
+    Join the news rows into the text block sent to the LLM.
+    """
+    if df_news.empty:
+        return ""
+    entries = (
+        config_lang['time_label'] + ": " + df_news['time_published'].astype(str) + "\n"
+        + config_lang['title_label'] + ": " + df_news['title'].astype(str) + "\n"
+        + config_lang['summary_label'] + ": " + df_news['summary'].astype(str) + "\n"
+    )
+    return ARTICLE_SEPARATOR.join(entries.tolist())
+
+
+def build_news_text(df_news: pd.DataFrame, config_lang: Dict[str, Any], max_tokens: int = None) -> str:
+    """
+    News block of a prompt: `select_articles` then `format_articles`.
+    """
+    return format_articles(select_articles(df_news, max_tokens), config_lang)
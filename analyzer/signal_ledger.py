@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+import time
+import pandas as pd
+from typing import List, Optional, Tuple
+
+import config
+
+
+class SignalLedger:
+    """
+    Persistent record of the signals the watch mode has already seen.
+
+    A signal (symbol, date) is recorded when it is first detected and marked
+    analyzed once its analysis was delivered, so a restart neither analyzes a
+    signal twice nor loses one that was detected but not yet analyzed. Per
+    symbol it also keeps the cursor: the last bar whose move is final, after
+    which the next poll looks for moves. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or config.WATCH_STATE_PATH
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signals ("
+            " symbol TEXT NOT NULL,"
+            " signal_date TEXT NOT NULL,"
+            " pct_change REAL NOT NULL,"
+            " first_seen REAL NOT NULL,"
+            " analyzed_at REAL,"
+            " PRIMARY KEY (symbol, signal_date))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            " symbol TEXT PRIMARY KEY,"
+            " last_bar TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _date(signal_date: pd.Timestamp) -> str:
+        return pd.Timestamp(signal_date).isoformat()
+
+    def add(self, symbol: str, signal_date: pd.Timestamp, pct_change: float) -> bool:
+        """
+        Record a detected signal; True if it was not known before.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO signals (symbol, signal_date, pct_change, first_seen)"
+                " VALUES (?, ?, ?, ?)",
+                (symbol, self._date(signal_date), float(pct_change), time.time())
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def mark_analyzed(self, symbol: str, signal_date: pd.Timestamp) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE signals SET analyzed_at = ? WHERE symbol = ? AND signal_date = ?",
+                (time.time(), symbol, self._date(signal_date))
+            )
+            self._conn.commit()
+
+    def pending(self, symbol: str) -> List[Tuple[pd.Timestamp, float]]:
+        """
+        (date, pct_change) of the recorded signals of `symbol` not analyzed yet.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT signal_date, pct_change FROM signals"
+                " WHERE symbol = ? AND analyzed_at IS NULL ORDER BY signal_date",
+                (symbol,)
+            ).fetchall()
+        return [(pd.Timestamp(date), pct) for date, pct in rows]
+
+    def is_analyzed(self, symbol: str, signal_date: pd.Timestamp) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analyzed_at FROM signals WHERE symbol = ? AND signal_date = ?",
+                (symbol, self._date(signal_date))
+            ).fetchone()
+        return row is not None and row[0] is not None
+
+    def last_bar(self, symbol: str) -> Optional[pd.Timestamp]:
+        """
+        The cursor of `symbol`, or None before its first poll.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_bar FROM cursors WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        return None if row is None else pd.Timestamp(row[0])
+
+    def set_last_bar(self, symbol: str, last_bar: pd.Timestamp) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cursors (symbol, last_bar) VALUES (?, ?)",
+                (symbol, self._date(last_bar))
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
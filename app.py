@@ -1,15 +1,185 @@
 import config
 
 from fetcher.base import Fetcher
-from tests.mock import DummySession
+from fetcher.rate_limit import PRIORITY_INTERACTIVE, request_priority
 from parser.base import Parser
-from analyzer.moves import detect_significant_moves
-from analyzer.openai import analyze_news_with_openai
-from ui.streamlit_renderer import StreamlitRenderer
+from analyzer.moves import detect_significant_moves, detect_significant_moves_panel
+from analyzer.openai import analyze_news_with_openai, analyze_news_batch_with_openai, is_final_analysis
+from analyzer.cache import AnalysisCache
+from analyzer.news_index import NewsIndex
+from model import ModelClient, get_model_client
+from ui.base import Renderer
 
+import contextvars
 import logging
+import math
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from typing import Callable, Dict, Iterator, List
 
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class TokenStream:
+    """
+    Text pieces of one streamed analysis, handed from the worker thread that
+    runs it to the thread rendering it (Streamlit only renders from the script
+    thread). Iteration ends once the worker has closed the stream.
+    """
+    _DONE = object()
+
+    def __init__(self):
+        self._queue = queue.Queue()
+
+    def put(self, piece: str) -> None:
+        self._queue.put(piece)
+
+    def close(self) -> None:
+        self._queue.put(self._DONE)
+
+    def __iter__(self) -> Iterator[str]:
+        while True:
+            piece = self._queue.get()
+            if piece is self._DONE:
+                return
+            yield piece
+
+
+def _model_id(model_client: ModelClient = None) -> str:
+    return model_client.model_id if model_client is not None else None
+
+
+def load_signal_news(
+    company_name: str,
+    signal_date: pd.Timestamp,
+    news_fetcher: Fetcher,
+    news_parser: Parser,
+    news_index: NewsIndex = None
+) -> pd.DataFrame:
+    """
+    Parsed news of one signal date, read from `news_index` when a range fetch
+    already covered it, otherwise fetched for that date alone. A date the
+    range fetch returned nothing for is fetched alone too: its results are
+    ranked over the whole window, so a quiet day may be crowded out.
+
+    When the fetcher can stream its items and the parser can parse them as
+    they arrive (Alpha Vantage), the feed is filtered while it downloads
+    instead of being held in memory as a whole.
+    """
+    if news_index is not None:
+        df_news = news_index.for_date(signal_date)
+        if not df_news.empty:
+            return df_news
+    if news_fetcher.SUPPORTS_STREAM and hasattr(news_parser, 'parse_stream'):
+        return news_parser.parse(news_fetcher.fetch_stream(company_name, signal_date, signal_date))
+    raw_news = news_fetcher.fetch(company_name, signal_date, signal_date)
+    return news_parser.parse(raw_news)
+
+
+def analyze_signal(
+    symbol: str,
+    company_name: str,
+    signal_date: pd.Timestamp,
+    pct_change: float,
+    lang: str,
+    news_fetcher: Fetcher,
+    news_parser: Parser,
+    analysis_cache: AnalysisCache = None,
+    news_index: NewsIndex = None,
+    on_token: Callable[[str], None] = None,
+    model_client: ModelClient = None
+):
+    """
+    Fetch, parse and analyze the news of a single signal date.
+
+    With `on_token` the analysis is streamed to it (a cached analysis is
+    passed in one piece). `model_client` defaults to get_model_client().
+
+    Returns:
+        Tuple[pd.DataFrame, str]: The parsed news and the LLM analysis text.
+    """
+    df_news = load_signal_news(company_name, signal_date, news_fetcher, news_parser, news_index)
+
+    cache_key = None
+    if analysis_cache is not None:
+        cache_key = analysis_cache.make_key(symbol, signal_date, df_news, lang, model=_model_id(model_client))
+        llm_analysis = analysis_cache.get(cache_key)
+        if llm_analysis is not None:
+            if on_token is not None:
+                on_token(llm_analysis)
+            return df_news, llm_analysis
+
+    llm_analysis = analyze_news_with_openai(
+        df_news, signal_date, pct_change, symbol, lang, on_token=on_token, model_client=model_client
+    )
+    if cache_key is not None and is_final_analysis(llm_analysis, lang):
+        analysis_cache.set(cache_key, llm_analysis)
+    return df_news, llm_analysis
+
+
+def analyze_signal_batch(
+    symbol: str,
+    company_name: str,
+    signal_dates: List[pd.Timestamp],
+    pct_changes: Dict[pd.Timestamp, float],
+    lang: str,
+    news_fetcher: Fetcher,
+    news_parser: Parser,
+    batch_size: int,
+    analysis_cache: AnalysisCache = None,
+    news_index: NewsIndex = None,
+    model_client: ModelClient = None
+):
+    """
+    Fetch and parse the news of several signal dates, then analyze them with
+    batched LLM requests.
+
+    Returns:
+        Dict[pd.Timestamp, Tuple[pd.DataFrame, str]]: News and analysis per date.
+    """
+    news = {
+        signal_date: load_signal_news(company_name, signal_date, news_fetcher, news_parser, news_index)
+        for signal_date in signal_dates
+    }
+
+    analyses = {}
+    cache_keys = {}
+    if analysis_cache is not None:
+        for signal_date in signal_dates:
+            cache_keys[signal_date] = analysis_cache.make_key(
+                symbol, signal_date, news[signal_date], lang, model=_model_id(model_client)
+            )
+            llm_analysis = analysis_cache.get(cache_keys[signal_date])
+            if llm_analysis is not None:
+                analyses[signal_date] = llm_analysis
+
+    misses = [d for d in signal_dates if d not in analyses]
+    if misses:
+        fresh = analyze_news_batch_with_openai(
+            [(news[d], d, pct_changes[d]) for d in misses],
+            symbol, lang, batch_size=batch_size, model_client=model_client
+        )
+        for signal_date, llm_analysis in fresh.items():
+            if signal_date in cache_keys and is_final_analysis(llm_analysis, lang):
+                analysis_cache.set(cache_keys[signal_date], llm_analysis)
+        analyses.update(fresh)
+
+    return {d: (news[d], analyses[d]) for d in signal_dates}
+
+
+def estimate_analysis_seconds(total_signals: int, max_workers: int, model_client: ModelClient = None) -> float:
+    """
+    Expected duration of the analyses from the model client's average latency
+    so far, None before its first request.
+    """
+    stats = (model_client or get_model_client()).stats()
+    if not stats['requests']:
+        return None
+    return stats['latency_avg'] * math.ceil(total_signals / max(1, max_workers))
+
 
 def run(
     symbol: str,
@@ -20,10 +190,41 @@ def run(
     price_fetcher: Fetcher,
     news_parser: Parser,
     price_parser: Parser,
-    render: StreamlitRenderer
+    render: Renderer,
+    max_workers: int = None,
+    batch_size: int = None,
+    analysis_cache: AnalysisCache = None,
+    range_fetch: bool = None,
+    stream: bool = None,
+    model_client: ModelClient = None
 ):
     """
     Core logic with all dependencies injected.
+
+    The news fetch and LLM analysis of the signal dates run on a bounded thread
+    pool of `max_workers` threads (defaults to config.MAX_CONCURRENT_SIGNALS).
+    Results are still rendered in signal-date order, each one as soon as it and
+    all earlier ones are ready.
+
+    With `batch_size` > 1 (defaults to config.LLM_BATCH_SIZE) consecutive signal
+    dates are grouped and each group is analyzed with batched LLM requests.
+
+    When `analysis_cache` is given, analyses already cached for the same news
+    are reused and new ones are stored, skipping the OpenAI call on a hit.
+
+    With `range_fetch` (defaults to config.NEWS_RANGE_FETCH) and a news fetcher
+    that supports it, the news of the whole signal window is fetched and parsed
+    once, then looked up per signal date. Dates it returned nothing for, or
+    that a page limit cut from it, are fetched per date instead.
+
+    With `stream` (defaults to config.LLM_STREAM), one request per signal and
+    a renderer that has `render_llm_analysis_stream`, every analysis is shown
+    while the model is still generating it instead of once it is complete.
+
+    `model_client` answers the analyses (defaults to get_model_client()).
+
+    Returns:
+        Dict[pd.Timestamp, Dict]: News and LLM analysis per signal date.
     """
     # 1. Fetch the price data
     company_name, raw_prices = price_fetcher.fetch(symbol, period_days)
@@ -34,35 +235,149 @@ def run(
     
     # 2.2 Render the price chart (with built-in signal validation)
     if not render.render_price_chart(df_prices, signal_dates, lang):
-        return  # No signals found, exit early
+        return {}  # No signals found, exit early
     
     # 3. Find associate news and get llm results with progress indication
     # First render the analysis header
     render.render_analysis_header(lang)
     
+    if max_workers is None:
+        max_workers = config.MAX_CONCURRENT_SIGNALS
+    if batch_size is None:
+        batch_size = config.LLM_BATCH_SIZE
+    if range_fetch is None:
+        range_fetch = config.NEWS_RANGE_FETCH
+    if stream is None:
+        stream = config.LLM_STREAM
+    stream = stream and batch_size <= 1 and hasattr(render, 'render_llm_analysis_stream')
+
     # Show progress information
     total_signals = len(signal_dates)
-    render.show_analysis_progress_info(total_signals, lang)
-    
+    render.show_analysis_progress_info(
+        total_signals, lang, estimated_seconds=estimate_analysis_seconds(total_signals, max_workers, model_client)
+    )
+    pct_changes = {
+        signal_date: df_prices.loc[signal_date]['pct_change']
+        for signal_date in signal_dates
+    }
+
+    news_index = None
+    if range_fetch and news_fetcher.SUPPORTS_RANGE and total_signals > 1:
+        raw_news = news_fetcher.fetch_range(company_name, min(signal_dates), max(signal_dates))
+        if getattr(raw_news, 'complete', True):
+            news_index = NewsIndex(news_parser.parse(raw_news))
+        elif getattr(raw_news, 'covered_from', None) is not None:
+            # Cut short by a page or plan limit: only the dates it may lack news of are fetched per date
+            logger.info(f'News range fetch was truncated, fetching the news before {raw_news.covered_from} per signal date')
+            news_index = NewsIndex(news_parser.parse(raw_news), covered_from=raw_news.covered_from)
+        else:
+            logger.info('News range fetch was truncated, fetching the news per signal date')
+
+    token_streams = {signal_date: TokenStream() for signal_date in signal_dates} if stream else {}
+
+    def analyze_group(group):
+        if batch_size > 1:
+            return analyze_signal_batch(
+                symbol, company_name, group, pct_changes,
+                lang, news_fetcher, news_parser, batch_size, analysis_cache, news_index,
+                model_client=model_client
+            )
+        signal_date = group[0]
+        token_stream = token_streams.get(signal_date)
+        try:
+            return {signal_date: analyze_signal(
+                symbol, company_name, signal_date, pct_changes[signal_date],
+                lang, news_fetcher, news_parser, analysis_cache, news_index,
+                on_token=token_stream.put if token_stream is not None else None,
+                model_client=model_client
+            )}
+        finally:
+            if token_stream is not None:
+                token_stream.close()
+
     association = {}
-    for signal_date in signal_dates:
-        raw_news = news_fetcher.fetch(company_name, signal_date, signal_date)
-        df_news = news_parser.parse(raw_news)
-        pct_change = df_prices.loc[signal_date]['pct_change']
-        llm_analysis = analyze_news_with_openai(df_news, signal_date, pct_change, symbol, lang)
-        
-        # Render this analysis result
-        render.render_single_llm_analysis(signal_date, llm_analysis, pct_change, lang)
-        
-        association[signal_date] = {
-            'news': df_news,
-            'llm_analysis': llm_analysis
-        }
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        step = max(1, batch_size)
+        groups = [signal_dates[i:i + step] for i in range(0, total_signals, step)]
+        # Workers run in a copy of the caller's context, so their requests keep its priority
+        futures = [pool.submit(contextvars.copy_context().run, analyze_group, group) for group in groups]
+
+        # Wait in signal-date order, so each result is rendered as soon as
+        # it is ready and every earlier date has already been rendered
+        for group, future in zip(groups, futures):
+            # Streamed analyses are rendered piece by piece while they run
+            for signal_date in group:
+                if signal_date in token_streams:
+                    render.render_llm_analysis_stream(
+                        signal_date, token_streams[signal_date], pct_changes[signal_date], lang
+                    )
+
+            results = future.result()
+            for signal_date in group:
+                df_news, llm_analysis = results[signal_date]
+                pct_change = pct_changes[signal_date]
+
+                # Render this analysis result
+                if signal_date not in token_streams:
+                    render.render_single_llm_analysis(signal_date, llm_analysis, pct_change, lang, df_news=df_news)
+
+                association[signal_date] = {
+                    'news': df_news,
+                    'llm_analysis': llm_analysis
+                }
+    finally:
+        # Drop the signals still queued if one of them failed
+        pool.shutdown(wait=True, cancel_futures=True)
 
     # 4. Add separator after all analyses
     render.add_separator()
 
+    return association
+
+def scan_watchlist(
+    symbols: List[str],
+    period_days: int,
+    threshold: float,
+    bulk_price_fetcher: Fetcher,
+    panel_parser: Parser,
+    method: str = 'pct'
+) -> Dict[str, List[pd.Timestamp]]:
+    """
+    Detect significant moves across a whole watchlist.
+
+    Prices of all symbols are downloaded as one panel and parsed into
+    per-symbol frames in one pass, then the aligned close (and high/low)
+    panels go through detect_significant_moves_panel.
+
+    Args:
+        method: 'pct' (threshold in %), 'zscore' or 'atr', see
+                detect_significant_moves_panel.
+
+    Returns:
+        Dict[str, List[pd.Timestamp]]: Signal dates of every symbol that has any.
+    """
+    panel = bulk_price_fetcher.fetch(symbols, period_days)
+    frames = panel_parser.parse(panel)
+
+    def field_panel(field):
+        if not all(field in df.columns for df in frames.values()):
+            return None
+        return pd.DataFrame({symbol: df[field] for symbol, df in frames.items()})
+
+    signals = {}
+    for signal in detect_significant_moves_panel(
+        field_panel('close'), threshold, method=method,
+        high=field_panel('high'), low=field_panel('low')
+    ):
+        signals.setdefault(signal.symbol, []).append(signal.date)
+    return signals
+
+
 def main():
+    # Streamlit is only imported by the UI entry point, not by headless callers of run()
+    from ui import streamlit_cache
+
     # Create renderer instance first
     render = config.RENDERERS[config.DEFAULT_RENDERER]()
     
@@ -75,24 +390,31 @@ def main():
     # Render the main title with selected language
     render.render_title(lang)
     
-    news_fetcher = config.NEWS_FETCHERS[config.DEFAULT_NEWS_FETCHER](api_key=config.NEWSAPI_API_KEY)
-    price_fetcher = config.PRICE_FETCHERS[config.DEFAULT_PRICE_FETCHER]()
-    
-    news_parser = config.NEWS_PARSERS[config.DEFAULT_NEWS_PARSER]()
-    price_parser = config.PRICE_PARSERS[config.DEFAULT_PRICE_PARSER]()
-
-    # Run core application with language parameter
-    run(
-        symbol,
-        period_days,
-        threshold,
-        lang,
-        news_fetcher,
-        price_fetcher,
-        news_parser,
-        price_parser,
-        render
-    )
+    # Instances live for the whole process and their results are memoized,
+    # so a rerun only recomputes the stages whose inputs changed
+    news_fetcher = streamlit_cache.get_news_fetcher(config.DEFAULT_NEWS_FETCHER, config.NEWSAPI_API_KEY)
+    price_fetcher = streamlit_cache.get_price_fetcher(config.DEFAULT_PRICE_FETCHER)
+
+    news_parser = streamlit_cache.get_news_parser(config.DEFAULT_NEWS_PARSER)
+    price_parser = streamlit_cache.get_price_parser(config.DEFAULT_PRICE_PARSER)
+
+    analysis_cache = streamlit_cache.get_analysis_cache(config.ANALYSIS_CACHE_PATH, config.ANALYSIS_CACHE_MAX_ENTRIES)
+
+    # Run core application with language parameter; someone is waiting on
+    # this page, so its requests go before watch mode and other background work
+    with request_priority(PRIORITY_INTERACTIVE):
+        run(
+            symbol,
+            period_days,
+            threshold,
+            lang,
+            news_fetcher,
+            price_fetcher,
+            news_parser,
+            price_parser,
+            render,
+            analysis_cache=analysis_cache
+        )
 
 
 if __name__ == '__main__':
@@ -0,0 +1,57 @@
+"""
+Compare two benchmark result files written by `benchmarks.run`.
+
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--tolerance 0.10]
+
+Exits with status 1 when a benchmark's median got slower by more than
+`tolerance` (a fraction of the baseline median).
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], tolerance: float = 0.10) -> List[Tuple]:
+    """
+    Returns:
+        List[Tuple]: (name, baseline median, candidate median, ratio, regressed)
+        for every benchmark present in both reports. Reports of different
+        data sources (synthetic vs recorded) are not comparable.
+    """
+    if baseline.get('data', 'synthetic') != candidate.get('data', 'synthetic'):
+        raise ValueError(
+            f"cannot compare {baseline.get('data', 'synthetic')} data with {candidate.get('data', 'synthetic')} data"
+        )
+    rows = []
+    for name, base in baseline['results'].items():
+        new = candidate['results'].get(name)
+        if new is None or new['params'] != base['params']:
+            continue
+        ratio = new['median'] / base['median'] if base['median'] else float('inf')
+        rows.append((name, base['median'], new['median'], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark result files')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    rows = compare(baseline, candidate, args.tolerance)
+    print(f"{'benchmark':<28} {baseline['commit']:>12} {candidate['commit']:>12}   ratio")
+    for name, base, new, ratio, regressed in rows:
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<28} {base * 1000:10.2f}ms {new * 1000:10.2f}ms   {ratio:5.2f}x{flag}')
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
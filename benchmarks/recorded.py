@@ -0,0 +1,80 @@
+"""
+Recorded provider responses (the fixtures under tests/) replayed in the
+shapes the benchmarks use, with the same functions as `synthetic`.
+
+The recordings are finite: 3771 TSLA daily bars from Alpha Vantage and 685
+NEWS_SENTIMENT items (2025-05-28 to 2025-06-26). A benchmark asking for more
+gets the whole recording, and reports the size it actually used. NewsAPI
+articles are the recorded news items in NewsAPI's fields. Data without a
+recording (the watchlist panel, minute bars) is not provided here and stays
+synthetic.
+"""
+import functools
+import json
+import os
+import pandas as pd
+from typing import Any, Dict, List
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests')
+DAILY_FILE = 'TSLA_daily.json'
+NEWS_FILE = 'TSLA_news_3months.json'
+SERIES_KEY = 'Time Series (Daily)'
+
+
+@functools.lru_cache(maxsize=None)
+def _load(name: str) -> Any:
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+def make_alpha_vantage_daily(n_bars: int) -> Dict[str, Any]:
+    """The last `n_bars` recorded TIME_SERIES_DAILY bars, newest date first like the real API."""
+    payload = _load(DAILY_FILE)
+    dates = sorted(payload[SERIES_KEY], reverse=True)[:n_bars]
+    return {
+        'Meta Data': payload['Meta Data'],
+        SERIES_KEY: {day: payload[SERIES_KEY][day] for day in dates},
+    }
+
+
+def make_yfinance_history(n_bars: int) -> pd.DataFrame:
+    """The last `n_bars` recorded bars as the frame yf.Ticker(symbol).history() returns."""
+    series = make_alpha_vantage_daily(n_bars)[SERIES_KEY]
+    index = pd.DatetimeIndex(list(series), name='Date').tz_localize('America/New_York')
+    bars = pd.DataFrame({
+        'Open': [float(bar['1. open']) for bar in series.values()],
+        'High': [float(bar['2. high']) for bar in series.values()],
+        'Low': [float(bar['3. low']) for bar in series.values()],
+        'Close': [float(bar['4. close']) for bar in series.values()],
+        'Volume': [int(bar['5. volume']) for bar in series.values()],
+    }, index=index)
+    return bars.sort_index()
+
+
+def make_alpha_vantage_feed(n: int) -> List[Dict[str, Any]]:
+    """The `n` newest recorded NEWS_SENTIMENT `feed` items."""
+    return _load(NEWS_FILE)[:n]
+
+
+def make_newsapi_articles(n: int, days: int = 30) -> List[Dict[str, Any]]:
+    """
+    The `n` newest recorded news items of the last `days` days of the
+    recording, as a NewsAPI `articles` list.
+    """
+    feed = _load(NEWS_FILE)
+    newest = pd.Timestamp(feed[0]['time_published'], tz='UTC')
+    articles = []
+    for item in feed:
+        published = pd.Timestamp(item['time_published'], tz='UTC')
+        if len(articles) == n or newest - published > pd.Timedelta(days=days):
+            break
+        articles.append({
+            'source': {'id': None, 'name': item.get('source')},
+            'author': ', '.join(item.get('authors') or []) or None,
+            'title': item['title'],
+            'description': item.get('summary'),
+            'url': item['url'],
+            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': item.get('summary'),
+        })
+    return articles
@@ -0,0 +1,312 @@
+"""
+Time each pipeline stage on its own, on synthetic or recorded data.
+
+    python -m benchmarks.run [--scale small|medium|large] [--data synthetic|recorded]
+                             [--repeat 5] [--only parse.] [--output PATH]
+
+With `--data recorded` the stages that read provider data (parsers, single
+symbol detection, prompt building, rendering, pipeline) replay the responses
+recorded under tests/ instead (see benchmarks/recorded.py); the watchlist
+panel and intraday feed have no recording and stay synthetic. The import.*
+benchmarks time cold imports of the entry points in a fresh interpreter
+(not affected by --scale or --data).
+
+Results are written as JSON (default: benchmarks/results/<scale>-<commit>.json,
+<scale>-recorded-<commit>.json for recorded data) and can be compared between
+commits with `python -m benchmarks.compare`.
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, NamedTuple, Tuple
+
+import pandas as pd
+
+from benchmarks import recorded, synthetic
+
+SCALES = {
+    # bars: one symbol's daily history (252 per year)
+    # symbols x panel_bars: watchlist panel for detect_significant_moves_panel
+    # articles: one news feed; prompt_articles: news of a single signal date
+    'small': {'bars': 252 * 2, 'symbols': 50, 'panel_bars': 252, 'articles': 500, 'prompt_articles': 20},
+    'medium': {'bars': 252 * 10, 'symbols': 500, 'panel_bars': 252 * 2, 'articles': 2000, 'prompt_articles': 100},
+    'large': {'bars': 252 * 30, 'symbols': 3000, 'panel_bars': 252 * 5, 'articles': 10000, 'prompt_articles': 500},
+}
+
+
+class Case(NamedTuple):
+    # Builds fresh arguments before every timed call (not timed itself)
+    setup: Callable[[], Tuple]
+    func: Callable
+    params: Dict[str, Any]
+
+
+# Source of the provider data: a module with the make_* functions of `synthetic`
+DATA_SOURCES = {'synthetic': synthetic, 'recorded': recorded}
+
+# Factories take the scale and the data source
+BENCHMARKS: Dict[str, Callable[[Dict[str, int], Any], Case]] = {}
+
+
+def benchmark(name: str):
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+    return register
+
+
+def _parsed_prices(data, n_bars: int) -> pd.DataFrame:
+    from parser.yfinance_price_parser import YFinanceParser
+    return YFinanceParser().parse(data.make_yfinance_history(n_bars))
+
+
+@benchmark('parse.yfinance_price')
+def bench_parse_yfinance_price(scale, data):
+    from parser.yfinance_price_parser import YFinanceParser
+    raw = data.make_yfinance_history(scale['bars'])
+    # The parser renames in place, so every run gets its own copy
+    return Case(lambda: (raw.copy(),), YFinanceParser().parse, {'bars': len(raw)})
+
+
+@benchmark('parse.alpha_vantage_price')
+def bench_parse_alpha_vantage_price(scale, data):
+    from parser.alpha_vantage_price_parser import AlphaVantagePriceParser
+    raw = data.make_alpha_vantage_daily(scale['bars'])
+    return Case(lambda: (raw,), AlphaVantagePriceParser().parse, {'bars': len(raw['Time Series (Daily)'])})
+
+
+@benchmark('parse.newsapi_news')
+def bench_parse_newsapi_news(scale, data):
+    from parser.newsapi_news_parser import NewsAPIParser
+    raw = data.make_newsapi_articles(scale['articles'])
+    return Case(lambda: (raw,), NewsAPIParser().parse, {'articles': len(raw)})
+
+
+@benchmark('parse.alpha_vantage_news')
+def bench_parse_alpha_vantage_news(scale, data):
+    from parser.alpha_vantage_news_parser import AlphaVantageNewsParser
+    raw = data.make_alpha_vantage_feed(scale['articles'])
+    return Case(lambda: (raw,), AlphaVantageNewsParser(target_ticker='TSLA').parse, {'articles': len(raw)})
+
+
+@benchmark('detect.single')
+def bench_detect_single(scale, data):
+    from analyzer.moves import detect_significant_moves
+    prices = _parsed_prices(data, scale['bars'])
+    return Case(lambda: (prices.copy(), 5.0), detect_significant_moves, {'bars': len(prices)})
+
+
+@benchmark('detect.panel')
+def bench_detect_panel(scale, data):
+    from analyzer.moves import detect_significant_moves_panel
+    close = synthetic.make_close_panel(scale['symbols'], scale['panel_bars'])
+    return Case(
+        lambda: (close, 5.0), detect_significant_moves_panel,
+        {'symbols': scale['symbols'], 'bars': scale['panel_bars']}
+    )
+
+
+@benchmark('detect.intraday')
+def bench_detect_intraday(scale, data):
+    # One session of minute bars of every watchlist symbol, fed bar by bar
+    from analyzer.intraday import IntradayMoveDetector
+    bars = synthetic.make_minute_bars(scale['symbols'])
+    return Case(
+        lambda: (bars,), lambda feed: IntradayMoveDetector().update_many(feed),
+        {'symbols': scale['symbols'], 'bars': len(bars)}
+    )
+
+
+@benchmark('analyze.prompt')
+def bench_analyze_prompt(scale, data):
+    # The offline local client answers instantly, so this times prompt building
+    from analyzer.openai import analyze_news_with_openai
+    from parser.newsapi_news_parser import NewsAPIParser
+    df_news = NewsAPIParser().parse(data.make_newsapi_articles(scale['prompt_articles'], days=1))
+    signal_date = pd.Timestamp('2025-06-27')
+    return Case(
+        lambda: (df_news, signal_date, 7.5, 'TSLA', 'en'), analyze_news_with_openai,
+        {'articles': len(df_news)}
+    )
+
+
+@benchmark('render.price_figure')
+def bench_render_price_figure(scale, data):
+    from analyzer.moves import detect_significant_moves
+    from ui.streamlit_renderer import build_price_figure
+    prices = _parsed_prices(data, scale['bars'])
+    signal_dates = detect_significant_moves(prices, 5.0)
+    return Case(
+        lambda: (prices, signal_dates, 'en'), build_price_figure,
+        {'bars': len(prices), 'signals': len(signal_dates)}
+    )
+
+
+@benchmark('pipeline.run')
+def bench_pipeline_run(scale, data):
+    # app.run end to end with the mock fetchers reading provider files
+    import app
+    from fetcher.rate_limit import PRIORITY_BACKGROUND, request_priority
+    from parser.alpha_vantage_news_parser import AlphaVantageNewsParser
+    from parser.alpha_vantage_price_parser import AlphaVantagePriceParser
+    from tests.mock import DummySession, MockNewsFetcher, MockPriceFetcher
+    from ui.json_renderer import JSONRenderer
+
+    tmp = tempfile.mkdtemp(prefix='stockai-bench-')
+    price_file = os.path.join(tmp, 'daily.json')
+    news_file = os.path.join(tmp, 'news.json')
+    daily = data.make_alpha_vantage_daily(scale['bars'])
+    feed = data.make_alpha_vantage_feed(scale['articles'])
+    with open(price_file, 'w') as f:
+        json.dump(daily, f)
+    with open(news_file, 'w') as f:
+        json.dump(feed, f)
+    with contextlib.redirect_stdout(io.StringIO()):
+        session = DummySession(price_file, news_file)
+
+    components = dict(
+        news_fetcher=MockNewsFetcher(session),
+        price_fetcher=MockPriceFetcher(session),
+        news_parser=AlphaVantageNewsParser(target_ticker='TSLA'),
+        price_parser=AlphaVantagePriceParser(),
+    )
+
+    def pipeline():
+        events = []
+        with contextlib.redirect_stdout(io.StringIO()), request_priority(PRIORITY_BACKGROUND):
+            app.run('TSLA', 30, 3.0, 'en', render=JSONRenderer(events.append), **components)
+        return events
+
+    return Case(lambda: (), pipeline, {'bars': len(daily['Time Series (Daily)']), 'articles': len(feed)})
+
+
+def _cold_import(module: str) -> Callable[[], None]:
+    # A fresh interpreter per run, so nothing is already in sys.modules
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def run_import():
+        subprocess.run([sys.executable, '-c', f'import {module}'], cwd=root, check=True)
+    return run_import
+
+
+@benchmark('import.python')
+def bench_import_python(scale, data):
+    # Interpreter start-up alone, the baseline of the other import.* timings
+    return Case(lambda: (), _cold_import('sys'), {'module': 'sys'})
+
+
+@benchmark('import.config')
+def bench_import_config(scale, data):
+    return Case(lambda: (), _cold_import('config'), {'module': 'config'})
+
+
+@benchmark('import.server')
+def bench_import_server(scale, data):
+    # Headless entry point: app.run with the JSON renderer, no Streamlit
+    return Case(lambda: (), _cold_import('server'), {'module': 'server'})
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def time_case(case: Case, repeat: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeat):
+        args = case.setup()
+        start = time.perf_counter()
+        case.func(*args)
+        timings.append(time.perf_counter() - start)
+    return {
+        'params': case.params,
+        'runs': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+    }
+
+
+def run_suite(
+    scale_name: str = 'small',
+    repeat: int = 5,
+    only: str = None,
+    data: str = 'synthetic'
+) -> Dict[str, Any]:
+    """
+    Run the benchmarks whose name starts with `only` (all by default) on the
+    provider data of DATA_SOURCES[`data`].
+
+    Returns:
+        Dict[str, Any]: Run metadata plus min/median/mean seconds per benchmark.
+    """
+    import config
+
+    scale = SCALES[scale_name]
+    source = DATA_SOURCES[data]
+    model_client = config.DEFAULT_MODEL_CLIENT
+    config.DEFAULT_MODEL_CLIENT = 'local'
+    results = {}
+    try:
+        for name, factory in BENCHMARKS.items():
+            if only and not name.startswith(only):
+                continue
+            case = factory(scale, source)
+            # Untimed warm-up: imports, lazy singletons, first-call caches
+            case.func(*case.setup())
+            results[name] = time_case(case, repeat)
+    finally:
+        config.DEFAULT_MODEL_CLIENT = model_client
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale_name,
+        'data': data,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='StockAI stage benchmarks')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--data', choices=sorted(DATA_SOURCES), default='synthetic',
+                        help='provider data: generated, or the responses recorded under tests/')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', help='run only benchmarks whose name starts with this prefix')
+    parser.add_argument('--output', help='result file (default: benchmarks/results/<scale>-<commit>.json)')
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.scale, args.repeat, args.only, args.data)
+    variant = args.scale if args.data == 'synthetic' else f'{args.scale}-{args.data}'
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), 'results', f"{variant}-{report['commit']}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in report['results'].items():
+        params = ', '.join(f'{k}={v}' for k, v in result['params'].items())
+        print(f"{name:<28} median {result['median'] * 1000:10.2f} ms   min {result['min'] * 1000:10.2f} ms   ({params})")
+    print(f'Results written to {output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Synthetic data in the shapes returned by the real providers, at any scale.
+
+Every generator is seeded, so the same arguments always give the same data
+and benchmark runs on different commits see identical inputs.
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple
+
+WORDS = (
+    'shares rally slump earnings guidance deliveries recall upgrade downgrade '
+    'analyst revenue margin outlook lawsuit merger buyback dividend factory '
+    'demand supply chip battery launch contract regulator probe forecast'
+).split()
+
+SOURCES = ['Reuters', 'Bloomberg', 'CNBC', 'MarketWatch', 'Benzinga', 'Motley Fool']
+
+
+def _random_walk(rng: np.random.Generator, n_bars: int, start: float = 100.0) -> np.ndarray:
+    # Daily log-returns around 2%, with occasional large moves to trigger signals
+    returns = rng.normal(0, 0.02, n_bars)
+    jumps = rng.random(n_bars) < 0.02
+    returns[jumps] += rng.normal(0, 0.08, jumps.sum())
+    return start * np.exp(np.cumsum(returns))
+
+
+def make_ohlcv(n_bars: int, seed: int = 0, end: str = '2025-06-27') -> pd.DataFrame:
+    """
+    Business-day OHLCV bars ending at `end`, columns named like yfinance.
+    """
+    rng = np.random.default_rng(seed)
+    close = _random_walk(rng, n_bars)
+    spread = np.abs(rng.normal(0, 0.01, n_bars)) * close
+    index = pd.bdate_range(end=end, periods=n_bars, tz='America/New_York', name='Date')
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.005, n_bars) * close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 100_000_000, n_bars),
+    }, index=index)
+
+
+def make_minute_bars(n_symbols: int, n_minutes: int = 390, seed: int = 0) -> List[Tuple[str, float, float]]:
+    """
+    (symbol, epoch seconds, price) minute bars of one session, interleaved
+    across symbols in time order, as an intraday feed delivers them.
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.001, (n_minutes, n_symbols))
+    jumps = rng.random((n_minutes, n_symbols)) < 0.001
+    returns[jumps] += rng.normal(0, 0.03, jumps.sum())
+    prices = 100.0 * np.exp(np.cumsum(returns, axis=0))
+    open_time = pd.Timestamp('2025-06-27 13:30', tz='UTC').timestamp()
+    symbols = [f'SYM{i:04d}' for i in range(n_symbols)]
+    return [
+        (symbol, open_time + 60 * minute, price)
+        for minute, row in enumerate(prices.tolist())
+        for symbol, price in zip(symbols, row)
+    ]
+
+
+def make_yfinance_history(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Raw frame as returned by yf.Ticker(symbol).history()."""
+    return make_ohlcv(n_bars, seed)
+
+
+def make_alpha_vantage_daily(n_bars: int, symbol: str = 'TSLA', seed: int = 0) -> Dict[str, Any]:
+    """Raw TIME_SERIES_DAILY payload, newest date first like the real API."""
+    bars = make_ohlcv(n_bars, seed)
+    series = {}
+    for day, row in zip(bars.index[::-1], bars.iloc[::-1].itertuples(index=False)):
+        series[day.strftime('%Y-%m-%d')] = {
+            '1. open': f'{row.Open:.4f}',
+            '2. high': f'{row.High:.4f}',
+            '3. low': f'{row.Low:.4f}',
+            '4. close': f'{row.Close:.4f}',
+            '5. volume': str(row.Volume),
+        }
+    return {
+        'Meta Data': {'2. Symbol': symbol, '3. Last Refreshed': bars.index[-1].strftime('%Y-%m-%d')},
+        'Time Series (Daily)': series,
+    }
+
+
+def make_close_panel(n_symbols: int, n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Aligned close prices, one column per symbol, as fed to detect_significant_moves_panel."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end='2025-06-27', periods=n_bars, name='Date')
+    returns = rng.normal(0, 0.02, (n_bars, n_symbols))
+    jumps = rng.random((n_bars, n_symbols)) < 0.02
+    returns[jumps] += rng.normal(0, 0.08, jumps.sum())
+    close = 100.0 * np.exp(np.cumsum(returns, axis=0))
+    return pd.DataFrame(close, index=index, columns=[f'SYM{i:05d}' for i in range(n_symbols)])
+
+
+def _sentence(rng: np.random.Generator, n_words: int) -> str:
+    return ' '.join(rng.choice(WORDS, n_words)).capitalize()
+
+
+def _publish_times(rng: np.random.Generator, n: int, days: int, end: str) -> pd.DatetimeIndex:
+    end_ts = pd.Timestamp(end, tz='UTC')
+    offsets = rng.integers(0, days * 24 * 3600, n)
+    return (end_ts - pd.to_timedelta(np.sort(offsets)[::-1], unit='s'))
+
+
+def make_newsapi_articles(n: int, days: int = 30, seed: int = 0, end: str = '2025-06-27') -> List[Dict[str, Any]]:
+    """Raw NewsAPI `articles` list."""
+    rng = np.random.default_rng(seed)
+    times = _publish_times(rng, n, days, end)
+    return [
+        {
+            'source': {'id': None, 'name': SOURCES[i % len(SOURCES)]},
+            'author': None,
+            'title': _sentence(rng, 8),
+            'description': _sentence(rng, 40),
+            'url': f'https://news.example.com/{seed}/{i}',
+            'publishedAt': ts.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': _sentence(rng, 60),
+        }
+        for i, ts in enumerate(times)
+    ]
+
+
+def make_alpha_vantage_feed(
+    n: int,
+    ticker: str = 'TSLA',
+    days: int = 30,
+    seed: int = 0,
+    end: str = '2025-06-27'
+) -> List[Dict[str, Any]]:
+    """Raw NEWS_SENTIMENT `feed` list; about a third of the items mention other tickers only."""
+    rng = np.random.default_rng(seed)
+    times = _publish_times(rng, n, days, end)
+    labels = ['Bearish', 'Somewhat-Bearish', 'Neutral', 'Somewhat-Bullish', 'Bullish']
+    feed = []
+    for i, ts in enumerate(times):
+        tickers = [ticker, 'AAPL'] if i % 3 else ['AAPL', 'MSFT']
+        feed.append({
+            'title': _sentence(rng, 8),
+            'url': f'https://news.example.com/{seed}/{i}',
+            'time_published': ts.strftime('%Y%m%dT%H%M%S'),
+            'summary': _sentence(rng, 40),
+            'source': SOURCES[i % len(SOURCES)],
+            'overall_sentiment_score': round(float(rng.normal(0, 0.2)), 6),
+            'ticker_sentiment': [
+                {
+                    'ticker': t,
+                    'relevance_score': f'{rng.random():.6f}',
+                    'ticker_sentiment_score': f'{rng.normal(0, 0.3):.6f}',
+                    'ticker_sentiment_label': labels[int(rng.integers(0, len(labels)))],
+                }
+                for t in tickers
+            ],
+        })
+    return feed
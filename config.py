@@ -13,70 +13,176 @@ ALPHA_VANTAGE_API_KEY = os.getenv('ALPHA_VANTAGE_API_KEY')
 NEWSAPI_API_KEY=os.getenv('NEWSAPI_API_KEY')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# --- Provider Quotas ---
+# Request rate (per second, with burst size) and daily quota of each data
+# provider; the daily counts are persisted in QUOTA_STATE_PATH
+PROVIDER_QUOTAS = {
+    'alpha_vantage': {'per_second': 5 / 60, 'burst': 1, 'per_day': 25},
+    'newsapi': {'per_second': 1.0, 'burst': 5, 'per_day': 100},
+}
+QUOTA_STATE_PATH = 'quota_state.sqlite'
+
+# --- HTTP Cache ---
+# Shared response cache of all HTTP fetchers: 'sqlite' (one WAL-mode file) or
+# 'filesystem' (one compressed file per response under HTTP_CACHE_DIR)
+HTTP_CACHE_BACKEND = 'sqlite'
+HTTP_CACHE_PATH = 'http_cache.sqlite'
+HTTP_CACHE_DIR = 'http_cache'
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Streamed responses (e.g. the Alpha Vantage news feed) larger than this are
+# passed through without being held in memory or cached
+HTTP_CACHE_MAX_STREAM_BYTES = 8 * 1024 * 1024
+# TTL in seconds of responses covering today, matched against the URL or the
+# Alpha Vantage `function`. Responses for closed past dates never expire.
+HTTP_CACHE_ENDPOINT_TTLS = {
+    'TIME_SERIES_DAILY': 3600,
+    'NEWS_SENTIMENT': 600,
+    'newsapi.org': 600,
+}
+HTTP_CACHE_DEFAULT_TTL = 600
+
+# --- Symbol Metadata Cache ---
+# Company name, exchange and currency per symbol (fetcher/symbol_metadata.py)
+SYMBOL_METADATA_PATH = 'symbol_metadata.sqlite'
+
 # --- OpenAI Configuration ---
 OPENAI_MODEL = 'gpt-4.1'
+# Bump whenever the prompt templates in config_lang.py change, so cached
+# analyses built from the old prompts are no longer used
+PROMPT_TEMPLATE_VERSION = 2
+
+# --- Prompt News Selection ---
+# News of one signal date sent to the LLM (analyzer/prompt.py): near-duplicate
+# articles (estimated Jaccard similarity of title + summary at least
+# PROMPT_DUPLICATE_SIMILARITY) are collapsed, the rest ranked by relevance
+# decayed with a PROMPT_RECENCY_HALF_LIFE_HOURS half-life and packed up to
+# PROMPT_NEWS_MAX_TOKENS estimated tokens
+PROMPT_NEWS_MAX_TOKENS = 3000
+PROMPT_DUPLICATE_SIMILARITY = 0.6
+PROMPT_RECENCY_HALF_LIFE_HOURS = 12
+
+# --- LLM Analysis Cache ---
+ANALYSIS_CACHE_PATH = 'analysis_cache.sqlite'
+ANALYSIS_CACHE_MAX_ENTRIES = 5000
+
+# --- Streamlit Memoization ---
+# Fetched and parsed data is kept across reruns and sessions for
+# STREAMLIT_CACHE_TTL seconds, at most STREAMLIT_CACHE_MAX_ENTRIES per stage
+STREAMLIT_CACHE_TTL = 600
+STREAMLIT_CACHE_MAX_ENTRIES = 256
+
+# --- Analysis Concurrency ---
+# Maximum number of signal dates whose news fetch and LLM analysis are in flight
+# at the same time. Set to 1 to process the signals one after another.
+MAX_CONCURRENT_SIGNALS = 4
+
+# --- API Server ---
+# server.py: listening port and number of pipeline runs executed at once
+API_SERVER_PORT = 8888
+API_SERVER_WORKERS = 4
+
+# --- News Range Fetch ---
+# Fetch the news of the whole signal window in one (paginated) query and look
+# it up per signal date, when the news fetcher supports it
+NEWS_RANGE_FETCH = True
+
+# --- Watch Mode ---
+# watch.py: seconds between polls, days checked on the first poll of a symbol,
+# and the file recording the signals already seen and analyzed
+WATCH_INTERVAL_SECONDS = 300
+WATCH_LOOKBACK_DAYS = 7
+WATCH_STATE_PATH = 'watch_state.sqlite'
+
+# --- Intraday Move Detection ---
+# Thresholds in percent of analyzer.intraday.IntradayMoveDetector: move over
+# the last 5 and 30 minutes, and since the session open
+INTRADAY_THRESHOLDS = {'5m': 2.0, '30m': 4.0, 'open': 6.0}
+
+# --- Streamed LLM Analysis ---
+# Show each analysis while the model is still generating it (one request per
+# signal only, i.e. LLM_BATCH_SIZE = 1, and renderers that support it)
+LLM_STREAM = True
+
+# --- Batched LLM Analysis ---
+# Number of signal dates packed into one LLM request. 1 keeps one request per
+# signal; larger values enable the batched analyzer.
+LLM_BATCH_SIZE = 1
+# Upper bound on the estimated prompt tokens of one batched request
+LLM_BATCH_MAX_TOKENS = 12000
+
+# --- Provider Registries ---
+# Providers are given as dotted paths and imported on first lookup, so only
+# the chosen ones load their dependencies (yfinance, openai, streamlit, ...).
+# Packages can add providers through the entry point group of each registry.
+from registry import LazyRegistry
 
 # --- Fetcher Registry ---
-from fetcher.alpha_vantage_news_fetcher import AlphaVantageNewsFetcher
-from fetcher.alpha_vantage_price_fetcher import AlphaVantagePriceFetcher
-from fetcher.newsapi_news_fetcher import NewsAPIFetcher
-from fetcher.yfinance_price_fetcher import YfinanceFetcher
-
-NEWS_FETCHERS = {
-    'alpha_vantage': AlphaVantageNewsFetcher,
-    'newsapi': NewsAPIFetcher,
-    # 'finnhub': FinnhubNewsFetcher,  # Example for future extension
-}
+NEWS_FETCHERS = LazyRegistry({
+    'alpha_vantage': 'fetcher.alpha_vantage_news_fetcher:AlphaVantageNewsFetcher',
+    'newsapi': 'fetcher.newsapi_news_fetcher:NewsAPIFetcher',
+    # 'finnhub': 'fetcher.finnhub_news_fetcher:FinnhubNewsFetcher',  # Example for future extension
+}, group='stockai.news_fetchers')
 DEFAULT_NEWS_FETCHER = 'newsapi'
 
-PRICE_FETCHERS = {
-    'alpha_vantage': AlphaVantagePriceFetcher,
-    'yfinance': YfinanceFetcher
-}
-DEFAULT_PRICE_FETCHER = 'yfinance'
+PRICE_FETCHERS = LazyRegistry({
+    'alpha_vantage': 'fetcher.alpha_vantage_price_fetcher:AlphaVantagePriceFetcher',
+    'yfinance': 'fetcher.yfinance_price_fetcher:YfinanceFetcher',
+    'yfinance_stored': 'fetcher.stored_price_fetcher:StoredPriceFetcher',  # yfinance + local incremental price store
+}, group='stockai.price_fetchers')
+DEFAULT_PRICE_FETCHER = 'yfinance_stored'
+
+# Fetchers returning one (field, symbol) panel for a whole watchlist
+BULK_PRICE_FETCHERS = LazyRegistry({
+    'yfinance': 'fetcher.yfinance_bulk_price_fetcher:YfinanceBulkFetcher'
+}, group='stockai.bulk_price_fetchers')
+DEFAULT_BULK_PRICE_FETCHER = 'yfinance'
 
 # --- Parser Registry ---
-from parser.alpha_vantage_news_parser import AlphaVantageNewsParser
-from parser.newsapi_news_parser import NewsAPIParser
-from parser.base import Parser as NewsParserBase  # for type hints
-from parser.base import Parser
-
-NEWS_PARSERS = {
-    'alpha_vantage': AlphaVantageNewsParser,
-    'newsapi': NewsAPIParser
-    # 'finnhub': FinnhubNewsParser,
-}
+NEWS_PARSERS = LazyRegistry({
+    'alpha_vantage': 'parser.alpha_vantage_news_parser:AlphaVantageNewsParser',
+    'newsapi': 'parser.newsapi_news_parser:NewsAPIParser'
+    # 'finnhub': 'parser.finnhub_news_parser:FinnhubNewsParser',
+}, group='stockai.news_parsers')
 DEFAULT_NEWS_PARSER = 'newsapi'
 
-from parser.base import Parser as PriceParserBase
-from parser.alpha_vantage_price_parser import AlphaVantagePriceParser
-from parser.yfinance_price_parser import YFinanceParser
-
-PRICE_PARSERS = {
-    'alpha_vantage': AlphaVantagePriceParser,
-    'yfinance': YFinanceParser
-}
+PRICE_PARSERS = LazyRegistry({
+    'alpha_vantage': 'parser.alpha_vantage_price_parser:AlphaVantagePriceParser',
+    'yfinance': 'parser.yfinance_price_parser:YFinanceParser'
+}, group='stockai.price_parsers')
 DEFAULT_PRICE_PARSER = 'yfinance'
 
-# --- Model Client Registry ---
-# import your model clients here when available
-# from model.openai_client import OpenAIClient
-# from model.local_llm_client import LocalLLMClient
+PANEL_PRICE_PARSERS = LazyRegistry({
+    'yfinance': 'parser.yfinance_panel_parser:YFinancePanelParser'
+}, group='stockai.panel_price_parsers')
+DEFAULT_PANEL_PRICE_PARSER = 'yfinance'
 
-MODEL_CLIENTS = {
-    # 'openai': OpenAIClient,
-    # 'local': LocalLLMClient,
-}
-DEFAULT_MODEL_CLIENT = 'openai'
+# --- Model Client Registry ---
+MODEL_CLIENTS = LazyRegistry({
+    'openai': 'model.openai_client:OpenAIClient',
+    'local': 'model.local_llm_client:LocalLLMClient',  # offline stub, no API key or network needed
+}, group='stockai.model_clients')
+DEFAULT_MODEL_CLIENT = os.getenv('MODEL_CLIENT', 'openai')
+
+# Per-request timeout (seconds), retries with jittered exponential backoff,
+# and size of the keep-alive connection pool shared by all requests
+MODEL_TIMEOUT = 60
+MODEL_MAX_RETRIES = 2
+MODEL_BACKOFF_BASE = 0.5
+MODEL_MAX_CONNECTIONS = 10
+
+# Latency budget (seconds) of one analysis: an answer not started after the
+# p95 of the recent request latencies gets a hedged duplicate request
+# (LLM_HEDGE_DELAY_SECONDS until enough latencies are known), the first answer
+# wins, and at the deadline the text received so far is shown as partial
+# (a batched request that misses it fails for all of its dates)
+LLM_DEADLINE_SECONDS = 90
+LLM_HEDGE_DELAY_SECONDS = 20
 
 # --- Renderer Registry ---
-from ui.streamlit_renderer import StreamlitRenderer
-# from visualizer.flask_renderer import FlaskRenderer
-
-RENDERERS = {
-    'streamlit': StreamlitRenderer,
-    # 'flask': FlaskRenderer,
-}
+RENDERERS = LazyRegistry({
+    'streamlit': 'ui.streamlit_renderer:StreamlitRenderer',
+    # 'flask': 'visualizer.flask_renderer:FlaskRenderer',
+}, group='stockai.renderers')
 DEFAULT_RENDERER = 'streamlit'
 
 DEFAULT_RELEVANCE_THRESHOLD = 0.3
@@ -66,7 +66,25 @@ LANG_CONFIG = {
 - 如果新闻内容与股价变动方向不符或关联性较弱，请如实指出
 
 请用简洁明了的中文回答，重点解释为什么股票在当天{direction_text}了 {price_change:.2f}%。如果无法确定原因，请直接说明。""",
-        "error_prefix": "LLM 分析失败"
+        "error_prefix": "LLM 分析失败",
+        "partial_notice": "[分析未完成：模型未在时限内给出完整回答，以上为已收到的部分]",
+        "deadline_exceeded": "模型未在 {seconds:.0f} 秒内给出回答",
+        "signal_header": "### {date_key}：股票 {symbol} 在 {date_str} {direction_text}了 {price_change:.2f}%",
+        "batch_user_prompt": """请分别分析股票 {symbol} 在以下每个异动日期的新闻信息。每个日期以 "### 日期键" 开头，随后是当天的股价变动和新闻。
+
+{signals_text}
+
+对每个日期，请基于该日期下的新闻信息和股价实际变动情况，分析并总结：
+1. 可能影响股价的关键事件或消息
+2. 这些事件如何解释当天的股价变动
+3. 影响程度的评估
+
+**重要提醒**：
+- 每个日期只基于该日期下提供的新闻信息进行分析，不要添加未提及的信息
+- 如果新闻信息不足以解释股价异动，请诚实说明"根据提供的新闻信息无法确定股价异动的具体原因"
+- 不要强行编造或推测未在新闻中明确提及的原因
+
+请以 JSON 对象格式回答，键为日期键（{date_keys}），值为该日期的简洁中文分析（可使用 Markdown）。"""
     },
     "en": {
         # Frontend UI text
@@ -134,7 +152,25 @@ Based on the above news information and the actual stock price movement, please
 - If the news content does not align with or has weak correlation to the stock price direction, please point this out honestly
 
 Please provide a concise and clear response in English, focusing on explaining why the stock {direction_text} {price_change:.2f}% on that day. If the cause cannot be determined, please state so directly.""",
-        "error_prefix": "LLM analysis failed"
+        "error_prefix": "LLM analysis failed",
+        "partial_notice": "[Partial analysis: the model did not finish within the time limit, the text above is what was received]",
+        "deadline_exceeded": "no answer from the model within {seconds:.0f} seconds",
+        "signal_header": "### {date_key}: Stock {symbol} {direction_text} {price_change:.2f}% on {date_str}",
+        "batch_user_prompt": """Please analyze the news information about stock {symbol} for each of the following significant move dates separately. Each date starts with "### date key", followed by that day's price move and news.
+
+{signals_text}
+
+For each date, based only on the news listed under that date and the actual stock price movement, please analyze and summarize:
+1. Key events or messages that may have affected the stock price
+2. How these events explain the day's stock price movement
+3. Assessment of the impact magnitude
+
+**Important Guidelines**:
+- Only base each analysis on the news provided under that date, do not add information not mentioned
+- If the news is insufficient to explain the movement, please honestly state "The provided news information is insufficient to determine the specific cause of the stock price movement"
+- Do not fabricate or speculate on reasons not explicitly mentioned in the news
+
+Respond with a JSON object whose keys are the date keys ({date_keys}) and whose values are concise analyses in English for that date (Markdown allowed)."""
     }
 }
 
@@ -46,6 +46,12 @@ DEFAULT_COMPANY = 'RKLB'
 DEFAULT_PERIOD = '1_month'
 DEFAULT_PRICE_MOVE_THRESHOLD = 5.0
 
+# --- Price Chart ---
+# Longer price series are drawn with WebGL (Scattergl) and downsampled with
+# LTTB to at most CHART_MAX_POINTS points; signal dates are always kept
+CHART_WEBGL_MIN_POINTS = 1000
+CHART_MAX_POINTS = 2000
+
 # --- Helper Functions ---
 def get_period_options_for_lang(lang: str):
     """Get period options for a specific language."""
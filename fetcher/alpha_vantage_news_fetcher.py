@@ -1,23 +1,26 @@
-import requests_cache
-from typing import List, Dict
+import json
+from typing import Any, Dict, Iterator, List
 from .base import Fetcher
+from .http_cache import CachedSession, get_shared_session
+from .json_stream import iter_array_items
+from .rate_limit import install_quota, quota_note_validator
 
 
 class AlphaVantageNewsFetcher(Fetcher):
     """
     Fetcher implementation for Alpha Vantage NEWS_SENTIMENT API.
     """
-    def __init__(self, api_key: str, session: requests_cache.CachedSession = None):
+    SUPPORTS_STREAM = True
+
+    def _init(self, api_key: str, session: CachedSession = None):
         self.api_key = api_key
-        # Create a cached session: responses are stored in SQLite and expire after 300s
-        self._session = session or requests_cache.CachedSession(
-            cache_name='av_cache',
-            backend='sqlite',
-            expire_after=600  # seconds
-        )
+        self._session = session or get_shared_session()
         self.endpoint = "https://www.alphavantage.co/query"
+        scheduler = install_quota(self._session, 'alpha_vantage', self.endpoint)
+        # Error and quota notes come with HTTP 200: only cache real data, pause on quota notes
+        self._validate = quota_note_validator("feed", scheduler)
 
-    def fetch(
+    def _fetch(
         self,
         symbol: str,
         time_from: str,
@@ -38,17 +41,56 @@ class AlphaVantageNewsFetcher(Fetcher):
         Returns:
             List[Dict]: Raw news feed items as returned by the API.
         """
-        params = {
+        params = self._params(symbol, time_from, time_to, sortBy, limit)
+        resp = self._session.get(self.endpoint, params=params, timeout=15, validate=self._validate)
+        resp.raise_for_status()
+        payload = resp.json()
+        if "feed" not in payload:
+            raise RuntimeError(f"Unexpected API response: {payload}")
+        return payload["feed"]
+
+    def _fetch_stream(
+        self,
+        symbol: str,
+        time_from: str,
+        time_to: str,
+        sortBy: str = "LATEST",
+        limit: int = 1000,
+        chunk_size: int = 65536,
+    ) -> Iterator[Dict]:
+        """
+        Same request as `fetch`, but return an iterator yielding the feed items
+        one by one while the response body is still downloading, instead of
+        the full list. The request itself is sent before returning.
+
+        Raises:
+            RuntimeError: The response has no `feed` (e.g. an API error or
+                rate-limit note), raised when iteration reaches that point.
+                The body is checked like a fetched one first, so a quota
+                note still pauses the scheduler.
+        """
+        params = self._params(symbol, time_from, time_to, sortBy, limit)
+        resp = self._session.get(self.endpoint, params=params, timeout=15, stream=True, validate=self._validate)
+        resp.raise_for_status()
+        items, others = iter_array_items(resp.iter_content(chunk_size), 'feed')
+
+        def feed():
+            try:
+                yield from items
+            except KeyError:
+                # The stream stopped before the session could validate the body;
+                # without the key `others` holds the whole (small) object
+                self._validate(json.dumps(others).encode('utf-8'))
+                raise RuntimeError(f"Unexpected API response: {others}")
+        return feed()
+
+    def _params(self, symbol, time_from, time_to, sortBy, limit) -> Dict[str, Any]:
+        return {
             "function": "NEWS_SENTIMENT",
             "tickers": symbol,
-            "time_from": time_from.strtime('%Y%m%d') + 'T000000',
-            "time_to": time_to.strtime('%Y%m%d') + 'T235959',
+            "time_from": time_from.strftime('%Y%m%d') + 'T000000',
+            "time_to": time_to.strftime('%Y%m%d') + 'T235959',
             "limit": limit,
             "sort": sortBy,
             "apikey": self.api_key
         }
-
-        resp = self._session.get(self.endpoint, params=params, timeout=15)
-        resp.raise_for_status()
-        payload = resp.json()
-        return payload["feed"]
\ No newline at end of file
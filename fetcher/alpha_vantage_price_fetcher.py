@@ -1,23 +1,23 @@
-import requests_cache
 from typing import Dict, Any
 from .base import Fetcher
+from .http_cache import CachedSession, get_shared_session
+from .rate_limit import install_quota, quota_note_validator
 
 
 class AlphaVantagePriceFetcher(Fetcher):
     """
     Fetcher implementation for Alpha Vantage TIME_SERIES_DAILY API.
     """
-    def __init__(self, api_key: str, session: requests_cache.CachedSession = None):
+    def _init(self, api_key: str, session: CachedSession = None):
         # Inject API key and optional session for HTTP requests
         self.api_key = api_key
-        self._session = session or requests_cache.CachedSession(
-            cache_name='av_cache',
-            backend='sqlite',
-            expire_after=600  # seconds
-        )
+        self._session = session or get_shared_session()
         self.endpoint = "https://www.alphavantage.co/query"
+        scheduler = install_quota(self._session, 'alpha_vantage', self.endpoint)
+        # Error and quota notes come with HTTP 200: only cache real data, pause on quota notes
+        self._validate = quota_note_validator("Time Series (Daily)", scheduler)
 
-    def fetch(
+    def _fetch(
         self,
         symbol: str,
         outputsize: str = "compact"
@@ -39,7 +39,7 @@ class AlphaVantagePriceFetcher(Fetcher):
             "datatype": "json",
             "apikey": self.api_key
         }
-        resp = self._session.get(self.endpoint, params=params, timeout=15)
+        resp = self._session.get(self.endpoint, params=params, timeout=15, validate=self._validate)
         resp.raise_for_status()
         data = resp.json()
         if "Time Series (Daily)" not in data:
@@ -1,8 +1,30 @@
 import logging
+import time
+
+import metrics
 
 logger = logging.getLogger(__name__)
 
+class RangeResult(list):
+    """
+    Items returned by `fetch_range`. `complete` is False when a page cap or
+    the provider's plan limit cut the results short, so dates missing from
+    them may still have items. Even then every item of the dates from
+    `covered_from` on (a datetime.date, None if unknown) was returned, e.g.
+    when the pages run from the newest item backwards.
+    """
+    def __init__(self, items=(), complete: bool = True, covered_from=None):
+        super().__init__(items)
+        self.complete = complete
+        self.covered_from = covered_from
+
+
 class Fetcher:
+    # Whether the fetcher implements _fetch_range (one request for a whole date range)
+    SUPPORTS_RANGE = False
+    # Whether the fetcher implements _fetch_stream (items yielded while downloading)
+    SUPPORTS_STREAM = False
+
     def __init__(self, *args, **kwargs):
         try:
             self._init(*args, **kwargs)
@@ -11,14 +33,42 @@ class Fetcher:
             raise
 
     def fetch(self, *args, **kwargs):
+        return self._call('fetch', self._fetch, *args, **kwargs)
+
+    def fetch_range(self, *args, **kwargs):
+        return self._call('fetch_range', self._fetch_range, *args, **kwargs)
+
+    def fetch_stream(self, *args, **kwargs):
+        # 返回迭代器：只统计发起请求的耗时，迭代中的异常由调用方处理
+        return self._call('fetch_stream', self._fetch_stream, *args, **kwargs)
+
+    def _call(self, method, func, *args, **kwargs):
+        # 统一处理异常日志与指标（调用次数、错误、延迟、返回条数）
+        provider = self.__class__.__name__
+        metrics.FETCH_REQUESTS.inc(provider=provider, method=method)
+        start = time.perf_counter()
         try:
-            return self._fetch(*args, **kwargs)
+            with metrics.provider_context(provider):
+                result = func(*args, **kwargs)
         except Exception as e:
-            logger.error(f"{self.__class__.__name__}.fetch failed: {e}")
+            metrics.FETCH_ERRORS.inc(provider=provider, method=method)
+            logger.error(f"{provider}.{method} failed: {e}")
             raise
+        finally:
+            metrics.FETCH_LATENCY.observe(time.perf_counter() - start, provider=provider, method=method)
+        rows = metrics.count_rows(result)
+        if rows is not None:
+            metrics.FETCH_ROWS.inc(rows, provider=provider)
+        return result
 
     def _init(self, *args, **kwargs):
         raise NotImplementedError("子类必须实现 _init 方法")
 
     def _fetch(self, *args, **kwargs):
-        raise NotImplementedError("子类必须实现 _fetch 方法")
\ No newline at end of file
+        raise NotImplementedError("子类必须实现 _fetch 方法")
+
+    def _fetch_range(self, *args, **kwargs):
+        raise NotImplementedError("子类如支持区间拉取，需实现 _fetch_range 方法")
+
+    def _fetch_stream(self, *args, **kwargs):
+        raise NotImplementedError("子类如支持流式拉取，需实现 _fetch_stream 方法")
@@ -0,0 +1,447 @@
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+import metrics
+
+# Query parameters that carry credentials: never part of a cache key
+SECRET_PARAMS = {'apikey', 'apiKey', 'api_key', 'token'}
+
+
+class CacheEntry(NamedTuple):
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    expires_at: Optional[float]  # epoch seconds, None = never expires
+
+
+class CacheBackend(ABC):
+    """
+    通用 HTTP 缓存存储后端抽象基类。
+    Bodies are stored zlib-compressed; the total compressed size is capped at
+    `max_bytes`, evicting the least recently used entries first.
+    """
+
+    def __init__(self, max_bytes: int = 200 * 1024 * 1024, compression_level: int = 6):
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+
+    def _encode(self, entry: CacheEntry) -> bytes:
+        header = json.dumps({
+            'status_code': entry.status_code,
+            'headers': entry.headers,
+            'expires_at': entry.expires_at,
+        }).encode('utf-8')
+        return zlib.compress(len(header).to_bytes(4, 'big') + header + entry.content, self.compression_level)
+
+    @staticmethod
+    def _decode(blob: bytes) -> CacheEntry:
+        raw = zlib.decompress(blob)
+        size = int.from_bytes(raw[:4], 'big')
+        header = json.loads(raw[4:4 + size])
+        return CacheEntry(header['status_code'], header['headers'], raw[4 + size:], header['expires_at'])
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def total_bytes(self) -> int:
+        pass
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache entries in one SQLite file in WAL mode, so readers never block the
+    writer and several fetchers (or processes) can share it.
+    """
+
+    def __init__(self, path: str = 'http_cache.sqlite', **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " body BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return self._decode(row[0])
+
+    def set(self, key, entry):
+        blob = self._encode(entry)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, blob, len(blob), time.time())
+            )
+            excess = self._total_bytes() - self.max_bytes
+            if excess > 0:
+                evict = []
+                for old_key, size in self._conn.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access"
+                ):
+                    evict.append((old_key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def total_bytes(self):
+        with self._lock:
+            return self._total_bytes()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+
+class FileSystemCacheBackend(CacheBackend):
+    """
+    Cache entries as one compressed file each; the file mtime is the LRU clock.
+    """
+
+    def __init__(self, root: str = 'http_cache', **kwargs):
+        super().__init__(**kwargs)
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f'{key}.zz')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                blob = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return self._decode(blob)
+
+    def set(self, key, entry):
+        blob = self._encode(entry)
+        # A temp file of its own per write, so concurrent writers of a key never share one
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f'{key}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        with self._lock:
+            os.replace(tmp_path, self._path(key))
+            files = self._files()
+            excess = sum(size for _, _, size in files) - self.max_bytes
+            for path, _, size in sorted(files, key=lambda f: f[1]):
+                if excess <= 0:
+                    break
+                os.remove(path)
+                excess -= size
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def total_bytes(self):
+        return sum(size for _, _, size in self._files())
+
+    def _files(self):
+        files = []
+        for entry in os.scandir(self.root):
+            if entry.name.endswith('.zz'):
+                stat = entry.stat()
+                files.append((entry.path, stat.st_mtime, stat.st_size))
+        return files
+
+
+class TTLPolicy:
+    """
+    Decide how long a response may be cached, per endpoint and by date.
+
+    Requests whose date range ends before today (UTC) ask for data of closed
+    days that can never change, so they never expire. Everything else uses the
+    TTL of the first matching entry of `endpoint_ttls` (matched against the
+    URL and the Alpha Vantage `function` parameter), or `default_ttl`.
+    """
+
+    # Query parameters holding the end of the requested date range
+    END_DATE_PARAMS = ('to', 'time_to')
+
+    def __init__(self, endpoint_ttls: Dict[str, float] = None, default_ttl: float = 600):
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.default_ttl = default_ttl
+
+    def __call__(self, url: str, params: Dict[str, Any]) -> Optional[float]:
+        """
+        Returns:
+            Optional[float]: TTL in seconds, None to never expire.
+        """
+        end_date = self._end_date(params)
+        if end_date is not None and end_date < datetime.datetime.now(datetime.timezone.utc).date():
+            return None
+        target = f"{url} {params.get('function', '')}"
+        for pattern, ttl in self.endpoint_ttls.items():
+            if pattern in target:
+                return ttl
+        return self.default_ttl
+
+    def _end_date(self, params: Dict[str, Any]) -> Optional[datetime.date]:
+        for name in self.END_DATE_PARAMS:
+            value = params.get(name)
+            if not value:
+                continue
+            digits = str(value).replace('-', '')[:8]
+            try:
+                return datetime.datetime.strptime(digits, '%Y%m%d').date()
+            except ValueError:
+                return None
+        return None
+
+
+def json_validator(predicate: Callable[[Dict[str, Any]], bool]) -> Callable[[bytes], bool]:
+    """
+    Response validator for `CachedSession.get`: the body must be a JSON
+    object accepted by `predicate`.
+    """
+    def validate(content: bytes) -> bool:
+        try:
+            payload = json.loads(content)
+        except ValueError:
+            return False
+        return isinstance(payload, dict) and bool(predicate(payload))
+    return validate
+
+
+class CachedResponse:
+    """
+    Minimal requests.Response stand-in served by CachedSession.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes, from_cache: bool):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error for url: {self.url}', response=self)
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+
+class StreamedResponse(CachedResponse):
+    """
+    Response of a cache miss requested with `stream=True`: the body is read
+    from the network chunk by chunk via `iter_content`, and handed to
+    `on_complete` (which caches it) once it has been read to the end.
+
+    Chunks are only kept for the cache while the body stays within
+    `max_bytes`; a larger body is passed through without being held in
+    memory, and is neither cached nor readable a second time.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        response: requests.Response,
+        headers: Dict[str, str],
+        on_complete: Callable[[bytes], None],
+        max_bytes: int = None
+    ):
+        super().__init__(url, response.status_code, headers, b'', from_cache=False)
+        self._response = response
+        self._on_complete = on_complete
+        self._max_bytes = max_bytes
+
+    @property
+    def content(self) -> bytes:
+        if self._response is not None:
+            self._content = b''.join(self.iter_content())
+        return self._content
+
+    @content.setter
+    def content(self, value: bytes) -> None:
+        self._content = value
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        if self._response is None:
+            if self._content is None:
+                raise RuntimeError(f'Body of {self.url} was streamed without being kept')
+            yield from super().iter_content(chunk_size)
+            return
+        response, self._response = self._response, None
+        chunks, size = [], 0
+        try:
+            for chunk in response.iter_content(chunk_size):
+                if chunks is not None:
+                    size += len(chunk)
+                    if self._max_bytes is not None and size > self._max_bytes:
+                        chunks = None
+                    else:
+                        chunks.append(chunk)
+                yield chunk
+        finally:
+            response.close()
+        if chunks is None:
+            self._content = None
+            return
+        self._content = b''.join(chunks)
+        self._on_complete(self._content)
+
+
+class CachedSession:
+    """
+    HTTP session with a pluggable response cache, shared by all fetchers.
+
+    Only successful GET responses are cached, keyed by URL and query
+    parameters without credentials. Providers that report errors with HTTP
+    200 (e.g. Alpha Vantage rate-limit notes) pass a `validate` callback, and
+    bodies it rejects are not cached either. Transport adapters (e.g. the quota
+    adapter) are mounted on the underlying requests.Session, so only cache
+    misses go through them.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend = None,
+        ttl_policy: TTLPolicy = None,
+        session: requests.Session = None,
+        max_stream_bytes: int = 8 * 1024 * 1024
+    ):
+        self.backend = backend or SQLiteCacheBackend()
+        self.ttl_policy = ttl_policy or TTLPolicy()
+        self._session = session or requests.Session()
+        self.max_stream_bytes = max_stream_bytes
+
+    def mount(self, prefix: str, adapter) -> None:
+        self._session.mount(prefix, adapter)
+
+    @staticmethod
+    def cache_key(url: str, params: Dict[str, Any] = None) -> str:
+        public = sorted((k, str(v)) for k, v in (params or {}).items() if k not in SECRET_PARAMS)
+        return hashlib.sha256(json.dumps([url, public]).encode('utf-8')).hexdigest()
+
+    def get(
+        self,
+        url: str,
+        params: Dict[str, Any] = None,
+        timeout: float = None,
+        stream: bool = False,
+        validate: Callable[[bytes], bool] = None,
+        **kwargs
+    ) -> CachedResponse:
+        """
+        GET `url`, served from the cache when a fresh entry exists.
+
+        With `stream`, a cache miss returns a StreamedResponse whose body is
+        read incrementally through `iter_content` and cached once fully read
+        (only if it is at most `max_stream_bytes`).
+        With `validate`, a body is only cached if `validate(body)` is true.
+        """
+        params = params or {}
+        key = self.cache_key(url, params)
+
+        provider = metrics.current_provider(default=urlsplit(url).netloc)
+        entry = self.backend.get(key)
+        if entry is not None:
+            if entry.expires_at is None or entry.expires_at > time.time():
+                metrics.HTTP_REQUESTS.inc(provider=provider, cache='hit')
+                metrics.HTTP_BYTES.inc(len(entry.content), provider=provider, cache='hit')
+                return CachedResponse(url, entry.status_code, entry.headers, entry.content, from_cache=True)
+            self.backend.delete(key)
+
+        resp = self._session.get(url, params=params, timeout=timeout, stream=stream, **kwargs)
+        metrics.HTTP_REQUESTS.inc(provider=provider, cache='miss')
+        headers = {'Content-Type': resp.headers.get('Content-Type', '')}
+
+        def store(content: bytes) -> None:
+            metrics.HTTP_BYTES.inc(len(content), provider=provider, cache='miss')
+            if resp.status_code == 200 and (validate is None or validate(content)):
+                ttl = self.ttl_policy(url, params)
+                if ttl is None or ttl > 0:
+                    expires_at = None if ttl is None else time.time() + ttl
+                    self.backend.set(key, CacheEntry(resp.status_code, headers, content, expires_at))
+
+        if stream:
+            return StreamedResponse(url, resp, headers, on_complete=store, max_bytes=self.max_stream_bytes)
+        store(resp.content)
+        return CachedResponse(url, resp.status_code, headers, resp.content, from_cache=False)
+
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> CachedSession:
+    """
+    Process-wide CachedSession configured from config.HTTP_CACHE_*.
+    """
+    global _shared_session
+    import config
+
+    with _shared_session_lock:
+        if _shared_session is None:
+            if config.HTTP_CACHE_BACKEND == 'filesystem':
+                backend = FileSystemCacheBackend(config.HTTP_CACHE_DIR, max_bytes=config.HTTP_CACHE_MAX_BYTES)
+            else:
+                backend = SQLiteCacheBackend(config.HTTP_CACHE_PATH, max_bytes=config.HTTP_CACHE_MAX_BYTES)
+            _shared_session = CachedSession(
+                backend=backend,
+                ttl_policy=TTLPolicy(config.HTTP_CACHE_ENDPOINT_TTLS, config.HTTP_CACHE_DEFAULT_TTL),
+                max_stream_bytes=config.HTTP_CACHE_MAX_STREAM_BYTES,
+            )
+        return _shared_session
@@ -0,0 +1,110 @@
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """
+    Text decoded so far from a stream of byte chunks, consumed from the front.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def more(self) -> bool:
+        """Append the next chunk, False once the stream is exhausted."""
+        if self.eof:
+            return False
+        # Drop what was consumed so the buffer stays around one item in size
+        self.text = self.text[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._utf8.decode(chunk)
+                return True
+        self.text += self._utf8.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> Optional[str]:
+        """Next non-whitespace character (not consumed), None at the end of the stream."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.more():
+                return None
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char is None or char not in chars:
+            raise ValueError(f'expected one of {chars!r} at offset {self.pos}, got {char!r}')
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode one complete JSON value, reading more chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise
+                continue
+            # A number at the very end of the buffer may still be cut off
+            if end == len(self.text) and not self.eof and isinstance(value, (int, float)):
+                self.more()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Tuple[Iterator[Any], Dict[str, Any]]:
+    """
+    Incrementally decode the items of the array under the top-level `key` of a
+    JSON object, e.g. the `feed` of an Alpha Vantage NEWS_SENTIMENT response.
+
+    Each item is decoded as soon as its bytes have arrived, so only about one
+    item is held in memory at a time. The other top-level values are collected
+    into the returned dict (only those before the array are available while
+    the items are being read).
+
+    Raises:
+        KeyError: The object has no `key` (the dict holds what it had instead).
+        ValueError: The stream is not a JSON object.
+    """
+    others: Dict[str, Any] = {}
+
+    def items():
+        buf = _Buffer(chunks)
+        buf.expect('{')
+        if buf.peek() == '}':
+            raise KeyError(key)
+        while True:
+            name = buf.value()
+            buf.expect(':')
+            if name == key:
+                break
+            others[name] = buf.value()
+            if buf.expect(',}') == '}':
+                raise KeyError(key)
+
+        buf.expect('[')
+        if buf.peek() == ']':
+            return
+        while True:
+            yield buf.value()
+            if buf.expect(',]') == ']':
+                return
+
+    return items(), others
@@ -1,16 +1,28 @@
-import requests_cache
-from .base import Fetcher
+import datetime
+import logging
+import pandas as pd
+from .base import Fetcher, RangeResult
+from .http_cache import CachedSession, get_shared_session, json_validator
+from .rate_limit import install_quota
+
+logger = logging.getLogger(__name__)
+
+# Only cache answers NewsAPI marked successful
+_is_ok = json_validator(lambda payload: payload.get('status') == 'ok')
 
 class NewsAPIFetcher(Fetcher):
-    def _init(self, api_key: str, session: requests_cache.CachedSession = None):
+    SUPPORTS_RANGE = True
+
+    # NewsAPI caps pageSize at 100
+    MAX_PAGE_SIZE = 100
+
+    def _init(self, api_key: str, session: CachedSession = None, max_pages: int = 5):
         self.api_key = api_key
-        # Create a cached session: responses are stored in SQLite and expire after 300s
-        self._session = session or requests_cache.CachedSession(
-            cache_name='av_cache',
-            backend='sqlite',
-            expire_after=600  # seconds
-        )
+        self.max_pages = max_pages
+        # Shared HTTP cache: date-aware TTLs, size-capped, shared by all fetchers
+        self._session = session or get_shared_session()
         self.end_point = "https://newsapi.org/v2/everything"
+        install_quota(self._session, 'newsapi', self.end_point)
     
     def _fetch(self, company_name, time_from, time_to, sortBy='relevancy'):
         """
@@ -33,8 +45,57 @@ class NewsAPIFetcher(Fetcher):
             'sortBy': sortBy,
             'apiKey': self.api_key
         }
-        print(params)        
-        response = self._session.get(self.end_point, params=params)
+        logger.debug(f"NewsAPI query {dict(params, apiKey='***')}")
+        response = self._session.get(self.end_point, params=params, validate=_is_ok)
         response.raise_for_status()
         payload = response.json()
-        return payload['articles']
\ No newline at end of file
+        return payload['articles']
+
+    def _fetch_range(self, company_name, time_from, time_to, sortBy='publishedAt'):
+        """
+        Fetch all news articles for a whole date range with as few requests as possible.
+
+        Pages through the results (up to `max_pages` requests of 100 articles)
+        instead of issuing one request per day. Group the parsed articles by
+        publication date with `analyzer.news_index.NewsIndex`.
+
+        Sorted by publication time (newest first) by default, so results cut
+        short by a limit still hold every article of their later dates; only
+        the dates before `covered_from` of the result need their own query.
+
+        :param company_name: The company name to search news for.
+        :param time_from: First date of the range.
+        :param time_to: Last date of the range (inclusive).
+        :param sortBy: Sorting criteria ('relevancy', 'popularity', or 'publishedAt').
+        :return: A RangeResult of news articles, not `complete` when the page
+                 cap or the plan's result limit was reached.
+        """
+        params = {
+            'language': 'en',
+            'q': company_name,
+            'from': time_from.strftime('%Y-%m-%d') + 'T00:00:00',
+            'to': time_to.strftime('%Y-%m-%d') + 'T23:59:59',
+            'sortBy': sortBy,
+            'pageSize': self.MAX_PAGE_SIZE,
+            'apiKey': self.api_key
+        }
+
+        articles = RangeResult(complete=False)
+        for page in range(1, self.max_pages + 1):
+            response = self._session.get(self.end_point, params={**params, 'page': page}, validate=_is_ok)
+            # 426: the plan's result limit was reached, keep what we have
+            if page > 1 and getattr(response, 'status_code', 200) == 426:
+                break
+            response.raise_for_status()
+            payload = response.json()
+            batch = payload.get('articles', [])
+            articles.extend(batch)
+            if len(batch) < self.MAX_PAGE_SIZE or len(articles) >= payload.get('totalResults', 0):
+                articles.complete = True
+                break
+        if not articles.complete and articles and sortBy == 'publishedAt':
+            # The oldest date reached may be partial, the later ones are whole
+            published = pd.to_datetime([a.get('publishedAt') for a in articles], utc=True, errors='coerce')
+            if not published.isna().all():
+                articles.covered_from = published.min().date() + datetime.timedelta(days=1)
+        return articles
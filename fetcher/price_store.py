@@ -0,0 +1,144 @@
+import os
+import tempfile
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from typing import Any, Dict, Optional
+
+# Name of the date index column inside the stored files
+INDEX_NAME = 'Date'
+_META_PREFIX = b'stockai.'
+
+
+class PriceStore:
+    """
+    Local on-disk store of daily bars, one uncompressed Feather (Arrow IPC)
+    file per symbol.
+
+    Files are memory-mapped on read, so loading a long history does not parse
+    JSON or copy the whole file up front, and reading only the date column
+    (e.g. for `last_date`) touches just that column. Small key/value metadata
+    (such as when a symbol was last refreshed) is kept in the file schema.
+
+    Appends to one symbol are serialized within the process; each write goes
+    to its own temporary file, so concurrent writers never share one.
+    """
+
+    def __init__(self, root: str = 'price_store'):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(symbol.upper(), threading.Lock())
+
+    def path(self, symbol: str) -> str:
+        return os.path.join(self.root, f'{symbol.upper()}.feather')
+
+    def has(self, symbol: str) -> bool:
+        return os.path.exists(self.path(symbol))
+
+    def load(
+        self,
+        symbol: str,
+        start: pd.Timestamp = None,
+        end: pd.Timestamp = None
+    ) -> pd.DataFrame:
+        """
+        Stored bars of `symbol` between `start` and `end` (both inclusive).
+        Returns an empty frame for an unknown symbol.
+        """
+        if not self.has(symbol):
+            return pd.DataFrame()
+        df = feather.read_table(self.path(symbol), memory_map=True).to_pandas()
+        if start is not None:
+            df = df[df.index >= self._align(start, df.index)]
+        if end is not None:
+            df = df[df.index <= self._align(end, df.index)]
+        return df
+
+    def last_date(self, symbol: str) -> Optional[pd.Timestamp]:
+        """
+        Date of the last stored bar, or None if nothing is stored.
+        """
+        if not self.has(symbol):
+            return None
+        dates = feather.read_table(self.path(symbol), columns=[INDEX_NAME], memory_map=True)
+        if dates.num_rows == 0:
+            return None
+        return dates.column(INDEX_NAME).to_pandas().max()
+
+    def metadata(self, symbol: str) -> Dict[str, str]:
+        """
+        Key/value metadata stored with `symbol`, read from the file schema only.
+        """
+        if not self.has(symbol):
+            return {}
+        with pa.memory_map(self.path(symbol)) as source:
+            schema = pa.ipc.open_file(source).schema
+        return {
+            k[len(_META_PREFIX):].decode(): v.decode()
+            for k, v in (schema.metadata or {}).items()
+            if k.startswith(_META_PREFIX)
+        }
+
+    def fetched_at(self, symbol: str) -> Optional[float]:
+        """
+        Epoch seconds of the last `append` for `symbol`.
+        """
+        value = self.metadata(symbol).get('fetched_at')
+        return float(value) if value else None
+
+    def append(self, symbol: str, df_new: pd.DataFrame, **metadata) -> pd.DataFrame:
+        """
+        Merge new bars into the stored history of `symbol`.
+
+        Bars for dates already stored are replaced by the new ones, so the last
+        (possibly partial) bar can be refreshed. The file is rewritten atomically.
+
+        Returns:
+            pd.DataFrame: The full stored history after the merge.
+        """
+        with self._lock(symbol):
+            return self._append(symbol, df_new, metadata)
+
+    def _append(self, symbol: str, df_new: pd.DataFrame, metadata: Dict[str, Any]) -> pd.DataFrame:
+        stored = self.load(symbol)
+        if not df_new.empty:
+            df_new = df_new.copy()
+            df_new.index = pd.to_datetime(df_new.index)
+        merged = pd.concat([stored, df_new]) if not stored.empty else df_new
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        merged.index.name = INDEX_NAME
+
+        table = pa.Table.from_pandas(merged, preserve_index=True)
+        meta = dict(table.schema.metadata or {})
+        meta.update({
+            _META_PREFIX + k.encode(): str(v).encode()
+            for k, v in {**self.metadata(symbol), **metadata, 'fetched_at': time.time()}.items()
+        })
+        table = table.replace_schema_metadata(meta)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=f'{symbol.upper()}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, self.path(symbol))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return merged
+
+    @staticmethod
+    def _align(ts, index: pd.DatetimeIndex) -> pd.Timestamp:
+        """Give `ts` the timezone of `index` so they can be compared."""
+        ts = pd.Timestamp(ts)
+        if index.tz is not None and ts.tz is None:
+            return ts.tz_localize(index.tz)
+        if index.tz is None and ts.tz is not None:
+            return ts.tz_convert(None)
+        return ts
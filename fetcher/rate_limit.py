@@ -0,0 +1,287 @@
+import contextlib
+import contextvars
+import datetime
+import heapq
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# Request priorities, lower runs first: people waiting on the UI or the API go
+# before background callers such as watch mode and the benchmarks
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 10
+PRIORITY_BACKGROUND = 20
+
+# Priority of the requests issued in the current context
+_request_priority = contextvars.ContextVar('request_priority', default=PRIORITY_DEFAULT)
+
+
+class QuotaExceededError(RuntimeError):
+    """The provider's daily request quota is used up."""
+
+
+@contextlib.contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    Run the requests issued inside the block with `priority` (lower runs first).
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+class RequestScheduler:
+    """
+    Rate limiter and daily quota tracker of one API provider.
+
+    Requests take a token from a bucket refilled at `per_second` (holding at
+    most `burst` tokens), which spreads them out instead of firing them back to
+    back. Waiting requests are served by priority, then in arrival order.
+    The daily count lives in SQLite, so it survives restarts and is shared
+    between processes; once `per_day` is reached `acquire` raises
+    QuotaExceededError instead of letting the provider answer 429.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        per_second: float,
+        burst: int = 1,
+        per_day: int = None,
+        state_path: str = 'quota_state.sqlite'
+    ):
+        self.provider = provider
+        self.per_second = per_second
+        self.burst = burst
+        self.per_day = per_day
+
+        self._cond = threading.Condition()
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._waiting = []
+        self._seq = itertools.count()
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(state_path, check_same_thread=False, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS quota ("
+            " provider TEXT PRIMARY KEY,"
+            " day TEXT NOT NULL,"
+            " used INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        self._publish()
+
+    @staticmethod
+    def _today() -> str:
+        # Providers reset their daily quotas at midnight UTC
+        return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d')
+
+    def used_today(self) -> int:
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT day, used FROM quota WHERE provider = ?", (self.provider,)
+            ).fetchone()
+        if row is None or row[0] != self._today():
+            return 0
+        return row[1]
+
+    def remaining(self) -> Dict[str, float]:
+        """
+        Remaining budget: requests left today (None if unlimited) and tokens in the bucket.
+        """
+        with self._cond:
+            self._refill()
+            tokens = self._tokens
+            waiting = len(self._waiting)
+        daily = None if self.per_day is None else max(0, self.per_day - self.used_today())
+        return {'daily_remaining': daily, 'tokens': tokens, 'waiting': waiting}
+
+    def _publish(self) -> None:
+        """Export the requests left today as the stockai_quota_daily_remaining gauge."""
+        if self.per_day is not None:
+            metrics.QUOTA_DAILY_REMAINING.set(
+                max(0, self.per_day - self.used_today()), provider=self.provider
+            )
+
+    def acquire(self, priority: int = None, timeout: float = None) -> None:
+        """
+        Block until the request may be sent, then count it against the daily quota.
+
+        Raises:
+            QuotaExceededError: The daily quota is used up.
+            TimeoutError: No token became available within `timeout` seconds.
+        """
+        if self.per_day is not None and self.used_today() >= self.per_day:
+            raise QuotaExceededError(f'{self.provider}: daily quota of {self.per_day} requests used up')
+        if priority is None:
+            priority = _request_priority.get()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        entry = (priority, next(self._seq))
+
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    self._refill()
+                    if self._waiting[0] == entry and self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    wait = (1 - self._tokens) / self.per_second if self._tokens < 1 else None
+                    if deadline is not None:
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            raise TimeoutError(f'{self.provider}: no request slot within {timeout}s')
+                        wait = left if wait is None else min(wait, left)
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+
+        counted = self._count_request()
+        self._publish()
+        if not counted:
+            raise QuotaExceededError(f'{self.provider}: daily quota of {self.per_day} requests used up')
+
+    def exhaust(self) -> None:
+        """
+        Mark today's quota as used up, e.g. after the provider answered 429.
+        """
+        if self.per_day is None:
+            return
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO quota (provider, day, used) VALUES (?, ?, ?)",
+                (self.provider, self._today(), self.per_day)
+            )
+            self._conn.commit()
+        self._publish()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.per_second)
+        self._refilled_at = now
+
+    def _count_request(self) -> bool:
+        """Atomically count one request, False if the daily quota is used up."""
+        today = self._today()
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT INTO quota (provider, day, used) VALUES (?, ?, 0)"
+                " ON CONFLICT(provider) DO UPDATE SET day = excluded.day, used = 0"
+                " WHERE quota.day != excluded.day",
+                (self.provider, today)
+            )
+            if self.per_day is None:
+                cursor = self._conn.execute(
+                    "UPDATE quota SET used = used + 1 WHERE provider = ?", (self.provider,)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "UPDATE quota SET used = used + 1 WHERE provider = ? AND used < ?",
+                    (self.provider, self.per_day)
+                )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+
+class QuotaAdapter(HTTPAdapter):
+    """
+    Transport adapter that passes every outgoing request through a scheduler.
+
+    Mounted below the session, so responses served from the HTTP cache
+    (fetcher.http_cache) never reach it and cost no quota.
+    """
+
+    def __init__(self, scheduler: RequestScheduler, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler
+
+    def send(self, request, **kwargs):
+        self.scheduler.acquire()
+        response = super().send(request, **kwargs)
+        if response.status_code == 429:
+            logger.warning(f'{self.scheduler.provider} answered 429, pausing until the quota resets')
+            self.scheduler.exhaust()
+        return response
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(provider: str) -> RequestScheduler:
+    """
+    Process-wide scheduler of `provider`, configured from config.PROVIDER_QUOTAS.
+    """
+    import config
+
+    with _schedulers_lock:
+        scheduler = _schedulers.get(provider)
+        if scheduler is None:
+            scheduler = RequestScheduler(
+                provider, state_path=config.QUOTA_STATE_PATH, **config.PROVIDER_QUOTAS[provider]
+            )
+            _schedulers[provider] = scheduler
+        return scheduler
+
+
+def install_quota(session, provider: str, url_prefix: str) -> Optional[RequestScheduler]:
+    """
+    Route the requests of `session` to `url_prefix` through the scheduler of
+    `provider`. Sessions without transport adapters (test doubles) are left as is.
+
+    Returns:
+        Optional[RequestScheduler]: The scheduler installed, None if none was.
+    """
+    if not hasattr(session, 'mount'):
+        return None
+    scheduler = get_scheduler(provider)
+    session.mount(url_prefix, QuotaAdapter(scheduler))
+    return scheduler
+
+
+# Alpha Vantage answers a used-up quota with HTTP 200 and a note under one of
+# these keys instead of a 429
+QUOTA_NOTE_KEYS = ('Note', 'Information')
+QUOTA_NOTE_MARKERS = ('rate limit', 'call frequency')
+
+
+def quota_note_validator(
+    required_key: str,
+    scheduler: Optional[RequestScheduler]
+) -> Callable[[bytes], bool]:
+    """
+    Response validator (see fetcher.http_cache.CachedSession.get) for Alpha
+    Vantage: a body is cacheable only if it holds `required_key`. A quota
+    note instead marks the quota of `scheduler` as used up, so later
+    requests wait for the reset rather than spend calls on more notes.
+    """
+    def validate(content: bytes) -> bool:
+        try:
+            payload = json.loads(content)
+        except ValueError:
+            return False
+        if not isinstance(payload, dict):
+            return False
+        if required_key in payload:
+            return True
+        note = ' '.join(str(payload.get(key, '')) for key in QUOTA_NOTE_KEYS).lower()
+        if scheduler is not None and any(marker in note for marker in QUOTA_NOTE_MARKERS):
+            logger.warning(f'{scheduler.provider} reported its quota used up, pausing until the reset')
+            scheduler.exhaust()
+        return False
+    return validate
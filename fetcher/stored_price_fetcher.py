@@ -0,0 +1,74 @@
+import time
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from fetcher.base import Fetcher
+from fetcher.price_store import PriceStore
+from fetcher.yfinance_price_fetcher import YfinanceFetcher
+
+# How much history a period covers, same windows as YfinanceFetcher
+PERIOD_OFFSETS = {30: pd.DateOffset(months=1), 7: pd.DateOffset(months=1)}
+
+
+class StoredPriceFetcher(Fetcher):
+    """
+    Price fetcher backed by a local PriceStore.
+
+    Only the bars missing since the last stored one are downloaded (the last
+    stored bar is fetched again, since it may have been partial) and appended
+    to the store; the requested period is then served from disk. Within
+    `refresh_seconds` of the previous refresh no network call is made at all.
+    The company name comes from the inner fetcher's metadata cache and is
+    resolved alongside the price update.
+
+    Returns the same (company_name, raw bars) pair as YfinanceFetcher, so it
+    works with YFinanceParser.
+    """
+    def _init(
+        self,
+        inner: YfinanceFetcher = None,
+        store: PriceStore = None,
+        refresh_seconds: int = 3600,
+        bootstrap_days: int = 365
+    ):
+        self.inner = inner or YfinanceFetcher()
+        self.store = store or PriceStore()
+        self.refresh_seconds = refresh_seconds
+        self.bootstrap_days = bootstrap_days
+
+    def _fetch(self, symbol, period):
+        if period not in PERIOD_OFFSETS:
+            raise NotImplementedError('only support period 30 days and 7 days')
+
+        symbol = symbol.upper()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            name_future = pool.submit(self.inner.fetch_company_name, symbol)
+            self.update(symbol)
+
+            start = pd.Timestamp.now().normalize() - PERIOD_OFFSETS[period]
+            hist_data = self.store.load(symbol, start=start)
+            if period == 7:
+                hist_data = hist_data.tail(7)
+
+            company_name = name_future.result()
+        return company_name, hist_data
+
+    def update(self, symbol: str) -> pd.DataFrame:
+        """
+        Bring the stored history of `symbol` up to date.
+
+        Returns:
+            pd.DataFrame: Bars downloaded by this call (empty if none).
+        """
+        fetched_at = self.store.fetched_at(symbol)
+        if fetched_at is not None and time.time() - fetched_at < self.refresh_seconds:
+            return pd.DataFrame()
+
+        last = self.store.last_date(symbol)
+        if last is None:
+            start = pd.Timestamp.now().normalize() - pd.Timedelta(days=self.bootstrap_days)
+        else:
+            start = last.tz_localize(None).normalize() if last.tz is not None else last.normalize()
+
+        new_bars = self.inner.fetch_history(symbol, start=start.strftime('%Y-%m-%d'))
+        self.store.append(symbol, new_bars)
+        return new_bars
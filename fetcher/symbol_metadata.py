@@ -0,0 +1,130 @@
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolMetadata(NamedTuple):
+    symbol: str
+    name: str
+    exchange: Optional[str] = None
+    currency: Optional[str] = None
+    fetched_at: float = 0.0
+
+
+class SymbolMetadataCache:
+    """
+    Disk-backed cache of symbol metadata (company name, exchange, currency).
+
+    These values almost never change, so entries live for `ttl_seconds`
+    (30 days by default). Cold or expired symbols are resolved with `lookup`,
+    several at a time when many are requested together. Stored in `path`
+    (config.SYMBOL_METADATA_PATH by default). Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[[str], SymbolMetadata],
+        path: str = None,
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_workers: int = 8
+    ):
+        import config
+
+        self.lookup = lookup
+        self.path = path or config.SYMBOL_METADATA_PATH
+        self.ttl_seconds = ttl_seconds
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS symbol_metadata ("
+            " symbol TEXT PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " exchange TEXT,"
+            " currency TEXT,"
+            " fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def cached(self, symbol: str, allow_expired: bool = False) -> Optional[SymbolMetadata]:
+        """
+        Stored metadata of `symbol` without any lookup, or None if missing or expired.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT symbol, name, exchange, currency, fetched_at FROM symbol_metadata WHERE symbol = ?",
+                (symbol.upper(),)
+            ).fetchone()
+        if row is None:
+            return None
+        metadata = SymbolMetadata(*row)
+        if not allow_expired and time.time() - metadata.fetched_at > self.ttl_seconds:
+            return None
+        return metadata
+
+    def get(self, symbol: str) -> SymbolMetadata:
+        """
+        Metadata of `symbol`, looked up only when not cached or expired.
+        """
+        return self.get_many([symbol])[symbol.upper()]
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, SymbolMetadata]:
+        """
+        Metadata of many symbols; the cold ones are looked up concurrently.
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        result = {}
+        missing = []
+        for symbol in symbols:
+            metadata = self.cached(symbol)
+            if metadata is None:
+                missing.append(symbol)
+            else:
+                result[symbol] = metadata
+        if missing:
+            result.update(self.refresh(missing))
+        return {symbol: result[symbol] for symbol in symbols}
+
+    def refresh(self, symbols: Iterable[str]) -> Dict[str, SymbolMetadata]:
+        """
+        Look up `symbols` again regardless of their age and store the results.
+
+        A failed lookup keeps the previous (expired) entry if there is one,
+        otherwise falls back to the bare symbol without storing it.
+        """
+        symbols = [s.upper() for s in symbols]
+        workers = max(1, min(self.max_workers, len(symbols)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            looked_up = list(pool.map(self._safe_lookup, symbols))
+
+        result = {}
+        fresh = []
+        for symbol, metadata in zip(symbols, looked_up):
+            if metadata is None:
+                metadata = self.cached(symbol, allow_expired=True) or SymbolMetadata(symbol, symbol)
+            else:
+                metadata = metadata._replace(symbol=symbol, fetched_at=time.time())
+                fresh.append(metadata)
+            result[symbol] = metadata
+
+        if fresh:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO symbol_metadata (symbol, name, exchange, currency, fetched_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    fresh
+                )
+                self._conn.commit()
+        return result
+
+    def _safe_lookup(self, symbol: str) -> Optional[SymbolMetadata]:
+        try:
+            return self.lookup(symbol)
+        except Exception as e:
+            logger.error(f"Metadata lookup for {symbol} failed: {e}")
+            return None
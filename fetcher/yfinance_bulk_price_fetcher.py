@@ -0,0 +1,57 @@
+import pandas as pd
+from typing import Iterable
+from fetcher.base import Fetcher
+from fetcher.yfinance_price_fetcher import CHUNK_SPANS, resolve_period, resolve_range, split_range
+
+
+class YfinanceBulkFetcher(Fetcher):
+    """
+    Fetch the bars of many symbols with batched yf.download calls.
+
+    Returns one wide panel (dates x (field, symbol)) instead of a frame per
+    symbol, and skips the per-symbol `.info` lookup, so scanning a whole
+    watchlist costs a handful of requests instead of two per symbol.
+
+    Periods and ranges work as in YfinanceFetcher: `fetch(symbols, period)`
+    returns the bars of the last `period` calendar days (a period shorter
+    than BAR_PERIOD_DAYS counts bars), `fetch(symbols, start=..., end=...,
+    interval=...)` those of an explicit range, downloaded in windows of the
+    interval's chunk span (see CHUNK_SPANS).
+    """
+    def _init(self, threads: bool = True, timeout: int = 30):
+        self.threads = threads
+        self.timeout = timeout
+
+    def _fetch(self, symbols: Iterable[str], period: int = None, start=None, end=None,
+               interval: str = '1d') -> pd.DataFrame:
+        if interval not in CHUNK_SPANS:
+            raise ValueError(f'unsupported interval {interval!r}, expected one of {sorted(CHUNK_SPANS)}')
+        start, bar_count = resolve_period(period, start)
+        start, end = resolve_range(start, end)
+        import yfinance as yf  # slow to import, loaded on first use
+
+        symbols = sorted({s.upper().strip() for s in symbols if s and s.strip()})
+        frames = []
+        for window_start, window_end in split_range(start, end, CHUNK_SPANS[interval]):
+            frame = yf.download(
+                symbols,
+                start=window_start,
+                end=window_end,
+                interval=interval,
+                group_by='column',
+                auto_adjust=True,
+                threads=self.threads,
+                progress=False,
+                timeout=self.timeout,
+                multi_level_index=True,
+            )
+            if frame is not None and not frame.empty:
+                frames.append(frame)
+        if not frames:
+            raise RuntimeError(f'No price data returned for {len(symbols)} symbols')
+
+        panel = pd.concat(frames) if len(frames) > 1 else frames[0]
+        panel = panel[~panel.index.duplicated(keep='last')].sort_index()
+        if bar_count is not None:
+            panel = panel.tail(bar_count)
+        return panel
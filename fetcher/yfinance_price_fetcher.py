@@ -1,24 +1,159 @@
-import yfinance as yf
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 from fetcher.base import Fetcher
+from fetcher.symbol_metadata import SymbolMetadata, SymbolMetadataCache
+
+
+def lookup_yfinance_metadata(symbol):
+    """
+    Company name, exchange and currency of `symbol` from Yahoo's `.info`.
+    """
+    import yfinance as yf  # slow to import, loaded on first use
+
+    info = yf.Ticker(symbol).info
+    name = (info.get('displayName') or
+            info.get('longName') or
+            info.get('shortName') or
+            symbol)
+    return SymbolMetadata(
+        symbol=symbol,
+        name=name,
+        exchange=info.get('fullExchangeName') or info.get('exchange'),
+        currency=info.get('currency'),
+    )
+
+
+# Longest range of one history request per interval. Intraday data is only
+# served in limited windows per request (e.g. 7 days of 1m bars), daily data
+# is split so multi-year ranges download in parallel.
+CHUNK_SPANS = {
+    '1m': pd.Timedelta(days=7),
+    '2m': pd.Timedelta(days=30),
+    '5m': pd.Timedelta(days=30),
+    '15m': pd.Timedelta(days=30),
+    '30m': pd.Timedelta(days=30),
+    '60m': pd.Timedelta(days=180),
+    '90m': pd.Timedelta(days=30),
+    '1h': pd.Timedelta(days=180),
+    '1d': pd.Timedelta(days=365 * 2),
+    '5d': pd.Timedelta(days=365 * 10),
+    '1wk': pd.Timedelta(days=365 * 10),
+    '1mo': pd.Timedelta(days=365 * 20),
+    '3mo': pd.Timedelta(days=365 * 20),
+}
+
+
+def split_range(start: pd.Timestamp, end: pd.Timestamp, span: pd.Timedelta) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """
+    Consecutive [start, end) windows of at most `span` covering [start, end).
+    """
+    edges = list(pd.date_range(start, end, freq=span))
+    if not edges or edges[-1] < end:
+        edges.append(end)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+# Periods shorter than this are a number of bars, taken from the bars of
+# this many calendar days (the '1mo' download the fetcher always made)
+BAR_PERIOD_DAYS = 30
+
+
+def resolve_period(period: int = None, start=None) -> Tuple[pd.Timestamp, Optional[int]]:
+    """
+    Start of the bars to download for `period` calendar days (or an explicit
+    `start`), and the number of bars to keep if the period counts bars.
+    """
+    bar_count = None
+    if period is not None:
+        if start is not None:
+            raise ValueError('pass either period or start, not both')
+        if period < BAR_PERIOD_DAYS:
+            bar_count = period
+        start = pd.Timestamp.now().normalize() - pd.Timedelta(days=max(period, BAR_PERIOD_DAYS))
+    if start is None:
+        raise ValueError('period or start is required')
+    return start, bar_count
+
+
+def resolve_range(start, end=None) -> Tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    `start` and `end` (defaults to now) as timestamps; a naive bound is read
+    in the timezone of the other one.
+    """
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().ceil('D')
+    if start.tz is not None and end.tz is None:
+        end = end.tz_localize(start.tz)
+    elif end.tz is not None and start.tz is None:
+        start = start.tz_localize(end.tz)
+    return start, end
+
 
 class YfinanceFetcher(Fetcher):
-    def _init(self, *args, **kwargs):
-        pass
-    
-    def _fetch(self, symbol, period):
+    """
+    Price history of one symbol from Yahoo Finance.
+
+    `fetch(symbol, period)` returns the bars of the last `period` calendar
+    days, except that a period shorter than BAR_PERIOD_DAYS counts bars (the
+    last 7 trading days for period 7, as before ranges were supported);
+    `fetch(symbol, start=..., end=..., interval=...)` those of an
+    explicit range at any interval in CHUNK_SPANS (daily, hourly, minute).
+    Ranges longer than the interval's chunk span are split and the chunks
+    downloaded in parallel on up to `max_workers` threads.
+    """
+    def _init(self, metadata_cache: SymbolMetadataCache = None, max_workers: int = 4):
+        self.metadata_cache = metadata_cache or SymbolMetadataCache(lookup=lookup_yfinance_metadata)
+        self.max_workers = max_workers
+
+    def _fetch(self, symbol, period=None, start=None, end=None, interval='1d'):
+        start, bar_count = resolve_period(period, start)
+
+        # A cached name is read right away, a cold one is looked up on a
+        # separate thread while the price history downloads
+        metadata = self.metadata_cache.cached(symbol)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            name_future = None if metadata else pool.submit(self.metadata_cache.get, symbol)
+
+            hist_data = self.fetch_history(symbol, start, end, interval=interval)
+            if bar_count is not None:
+                hist_data = hist_data.tail(bar_count)
+
+            if name_future is not None:
+                metadata = name_future.result()
+
+        return metadata.name, hist_data
+
+    def fetch_history(self, symbol, start, end=None, interval='1d'):
+        """
+        Bars from `start` (inclusive) up to `end` (exclusive, defaults to now)
+        at `interval`, downloaded in parallel chunks (see CHUNK_SPANS).
+        """
+        if interval not in CHUNK_SPANS:
+            raise ValueError(f'unsupported interval {interval!r}, expected one of {sorted(CHUNK_SPANS)}')
+        import yfinance as yf  # slow to import, loaded on first use
+
+        start, end = resolve_range(start, end)
+        if end <= start:
+            return pd.DataFrame()
+
         ticker = yf.Ticker(symbol)
+        chunks = split_range(start, end, CHUNK_SPANS[interval])
+
+        def download(window):
+            return ticker.history(start=window[0], end=window[1], interval=interval)
+
+        if len(chunks) == 1:
+            return download(chunks[0])
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            frames = [frame for frame in pool.map(download, chunks) if frame is not None and not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        hist_data = pd.concat(frames)
+        return hist_data[~hist_data.index.duplicated(keep='last')].sort_index()
 
-        if period == 30:
-            hist_data = ticker.history(period='1mo')
-        elif period == 7:
-            hist_data = ticker.history(period='1mo').tail(7)
-        else:
-            raise NotImplementedError('only support period 30 days and 7 days')
-
-        info = ticker.info
-        company_name = (info.get('displayName') or 
-                        info.get('longName') or 
-                        info.get('shortName') or 
-                        symbol)
-                
-        return company_name, hist_data
+    def fetch_company_name(self, symbol):
+        """
+        Display name of `symbol` from the metadata cache, falling back to the symbol itself.
+        """
+        return self.metadata_cache.get(symbol).name
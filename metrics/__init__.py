@@ -0,0 +1,92 @@
+from typing import Any, Dict
+
+from .registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    current_provider,
+    provider_context,
+)
+
+REGISTRY = MetricsRegistry()
+
+# --- Fetchers (fetcher.base.Fetcher) ---
+FETCH_REQUESTS = REGISTRY.counter(
+    'stockai_fetch_requests_total', 'Fetcher calls.', ('provider', 'method'))
+FETCH_ERRORS = REGISTRY.counter(
+    'stockai_fetch_errors_total', 'Fetcher calls that raised.', ('provider', 'method'))
+FETCH_LATENCY = REGISTRY.histogram(
+    'stockai_fetch_latency_seconds', 'Fetcher call latency.', ('provider', 'method'))
+FETCH_ROWS = REGISTRY.counter(
+    'stockai_fetch_rows_total', 'Records (articles, bars) returned by fetchers.', ('provider',))
+
+# --- HTTP (fetcher.http_cache.CachedSession) ---
+HTTP_REQUESTS = REGISTRY.counter(
+    'stockai_http_requests_total', 'HTTP GETs by outcome (cache hit or miss).', ('provider', 'cache'))
+HTTP_BYTES = REGISTRY.counter(
+    'stockai_http_bytes_total', 'Response body bytes by outcome (cache hit or miss).', ('provider', 'cache'))
+
+# --- Provider quotas (fetcher.rate_limit.RequestScheduler) ---
+QUOTA_DAILY_REMAINING = REGISTRY.gauge(
+    'stockai_quota_daily_remaining', 'Requests left in the daily quota of a provider.', ('provider',))
+
+# --- Parsers (parser.base.Parser) ---
+PARSE_CALLS = REGISTRY.counter(
+    'stockai_parse_calls_total', 'Parser calls.', ('parser',))
+PARSE_ERRORS = REGISTRY.counter(
+    'stockai_parse_errors_total', 'Parser calls that raised.', ('parser',))
+PARSE_LATENCY = REGISTRY.histogram(
+    'stockai_parse_latency_seconds', 'Parser call latency.', ('parser',))
+PARSE_ROWS = REGISTRY.counter(
+    'stockai_parse_rows_total', 'Rows produced by parsers.', ('parser',))
+
+# --- LLM (model.base.ModelClient) ---
+LLM_REQUESTS = REGISTRY.counter(
+    'stockai_llm_requests_total', 'Successful model requests.', ('client', 'model'))
+LLM_ERRORS = REGISTRY.counter(
+    'stockai_llm_errors_total', 'Failed model request attempts.', ('client', 'model'))
+LLM_RETRIES = REGISTRY.counter(
+    'stockai_llm_retries_total', 'Retried model request attempts.', ('client', 'model'))
+LLM_TOKENS = REGISTRY.counter(
+    'stockai_llm_tokens_total', 'Tokens used by model requests.', ('client', 'model', 'direction'))
+LLM_LATENCY = REGISTRY.histogram(
+    'stockai_llm_latency_seconds', 'Latency of successful model requests.', ('client', 'model'))
+LLM_HEDGES = REGISTRY.counter(
+    'stockai_llm_hedges_total', 'Duplicate requests sent for slow model requests.', ('client', 'model'))
+LLM_DEADLINE_EXCEEDED = REGISTRY.counter(
+    'stockai_llm_deadline_exceeded_total', 'Model requests cut off by their deadline.', ('client', 'model'))
+
+
+def count_rows(result: Any) -> int:
+    """
+    Number of records in a fetcher/parser result: the length of a DataFrame or
+    list (for a (name, data) pair, of the data), None for anything else.
+    """
+    if isinstance(result, tuple) and result:
+        result = result[-1]
+    if isinstance(result, list):
+        return len(result)
+    if hasattr(result, 'shape') and hasattr(result, 'columns'):
+        return len(result)
+    return None
+
+
+def export_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    return REGISTRY.export_prometheus()
+
+
+def snapshot() -> Dict[str, Any]:
+    """
+    All metrics as a JSON-serializable dict, plus the HTTP cache hit ratio per provider.
+    """
+    result = REGISTRY.snapshot()
+    by_provider: Dict[str, Dict[str, float]] = {}
+    for sample in result['stockai_http_requests_total']['samples']:
+        by_provider.setdefault(sample['provider'], {})[sample['cache']] = sample['value']
+    result['cache_hit_ratio'] = {
+        provider: counts.get('hit', 0.0) / sum(counts.values())
+        for provider, counts in by_provider.items() if sum(counts.values())
+    }
+    return result
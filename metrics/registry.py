@@ -0,0 +1,216 @@
+import bisect
+import contextlib
+import contextvars
+import math
+import threading
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+# Latency buckets in seconds, from in-memory parsing to slow LLM answers
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Name of the fetcher whose call is running, so HTTP-level metrics (bytes,
+# cache hits) can be attributed to it
+_current_provider = contextvars.ContextVar('current_provider', default=None)
+
+
+@contextlib.contextmanager
+def provider_context(provider: str) -> Iterator[None]:
+    """
+    Attribute the HTTP requests issued inside the block to `provider`.
+    """
+    token = _current_provider.set(provider)
+    try:
+        yield
+    finally:
+        _current_provider.reset(token)
+
+
+def current_provider(default: str = None) -> str:
+    return _current_provider.get() or default
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Metric:
+    """
+    One metric family: a name, help text and a fixed set of label names.
+    """
+    kind = None
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            return sorted(self._values.items())
+
+    def prometheus(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.label_names, key)} {value:g}' for key, value in self.samples()]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        return [{**dict(zip(self.label_names, key)), 'value': value} for key, value in self.samples()]
+
+
+class Gauge(Counter):
+    """
+    A value that goes up and down; `set` replaces it instead of adding to it.
+    """
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts plus an overflow slot, sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], Tuple[List[int], float, int]]]:
+        with self._lock:
+            return sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+
+    def quantile(self, q: float, **labels) -> float:
+        """
+        Upper bound of the bucket holding the `q` quantile (0.0 if nothing was observed).
+        """
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            if state is None:
+                return 0.0
+            counts, _, count = state[0][:], state[1], state[2]
+        rank = q * count
+        seen = 0
+        for bound, n in zip(self.buckets + (math.inf,), counts):
+            seen += n
+            if seen >= rank and n:
+                return bound
+        return math.inf
+
+    def prometheus(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self.samples():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (math.inf,), counts):
+                cumulative += n
+                le = 'le="+Inf"' if bound == math.inf else f'le="{bound:g}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.label_names, key)} {total:g}')
+            lines.append(f'{self.name}_count{_format_labels(self.label_names, key)} {count}')
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        result = []
+        for key, (counts, total, count) in self.samples():
+            labels = dict(zip(self.label_names, key))
+            result.append({
+                **labels,
+                'count': count,
+                'sum': total,
+                'avg': total / count if count else 0.0,
+                'p50': self.quantile(0.5, **labels),
+                'p95': self.quantile(0.95, **labels),
+                'buckets': {
+                    ('+Inf' if bound == math.inf else f'{bound:g}'): n
+                    for bound, n in zip(self.buckets + (math.inf,), counts)
+                },
+            })
+        return result
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metric families, exportable as Prometheus text
+    or as a JSON-serializable snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get_or_create(self, cls, name, help_text, label_names, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, label_names, **kwargs)
+            elif not isinstance(metric, cls) or metric.label_names != tuple(label_names):
+                raise ValueError(f'metric {name} is already registered with another type or labels')
+            return metric
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, label_names)
+
+    def gauge(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, label_names, buckets=buckets)
+
+    def get(self, name: str) -> Metric:
+        return self._metrics[name]
+
+    def clear(self) -> None:
+        """Reset every value, keeping the registered families (e.g. between tests)."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+    def export_prometheus(self) -> str:
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f'# HELP {name} {metric.help_text}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric.prometheus())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            name: {'type': metric.kind, 'help': metric.help_text, 'samples': metric.snapshot()}
+            for name, metric in sorted(self._metrics.items())
+        }
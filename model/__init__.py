@@ -0,0 +1,31 @@
+import threading
+
+from .base import ModelClient, ModelResponse
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_model_client(name: str = None) -> ModelClient:
+    """
+    Return the process-wide client registered as `name` in config.MODEL_CLIENTS
+    (defaults to config.DEFAULT_MODEL_CLIENT), creating it on first use.
+    """
+    import config
+
+    name = name or config.DEFAULT_MODEL_CLIENT
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = config.MODEL_CLIENTS[name](
+                api_key=config.OPENAI_API_KEY,
+                model=config.OPENAI_MODEL,
+                timeout=config.MODEL_TIMEOUT,
+                max_retries=config.MODEL_MAX_RETRIES,
+                backoff_base=config.MODEL_BACKOFF_BASE,
+                max_connections=config.MODEL_MAX_CONNECTIONS,
+                deadline=config.LLM_DEADLINE_SECONDS,
+                hedge_delay=config.LLM_HEDGE_DELAY_SECONDS,
+            )
+            _clients[name] = client
+        return client
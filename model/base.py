@@ -0,0 +1,428 @@
+import logging
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ModelResponse(NamedTuple):
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+    partial: bool = False  # cut off by the deadline of complete_hedged()
+
+
+class ModelClient(ABC):
+    """
+    通用模型客户端抽象基类。
+    统一处理超时、带抖动退避的重试以及延迟/token 统计，
+    子类只需实现 _complete() 方法发起一次请求。
+    """
+
+    # Whether the backend needs config.OPENAI_API_KEY (or another secret)
+    requires_api_key = False
+
+    # Number of recent request latencies kept for percentile estimates
+    LATENCY_WINDOW = 200
+    # Latencies needed before the hedge delay follows their p95
+    HEDGE_MIN_SAMPLES = 20
+
+    def __init__(
+        self,
+        model: str = None,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        deadline: float = 90.0,
+        hedge_delay: float = 20.0,
+        **kwargs
+    ):
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.default_hedge_delay = hedge_delay
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self._counters = {
+            'requests': 0,
+            'errors': 0,
+            'retries': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'latency_total': 0.0,
+            'hedges': 0,
+            'hedge_wins': 0,
+            'deadline_exceeded': 0,
+        }
+
+    @property
+    def model_id(self) -> str:
+        """Identifier of the backend and model, e.g. for cache keys."""
+        return self.model or self.__class__.__name__
+
+    def complete(self, instructions: str, prompt: str, timeout: float = None, **options) -> ModelResponse:
+        """
+        Send one prompt to the model, retrying transient failures.
+
+        Args:
+            instructions: System instruction for the model.
+            prompt: User input.
+            timeout: Per-request timeout in seconds (defaults to self.timeout).
+            **options: Backend-specific request options.
+
+        Returns:
+            ModelResponse: Answer text, token usage and latency of the successful attempt.
+        """
+        timeout = timeout or self.timeout
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self._complete(instructions, prompt, timeout=timeout, **options)
+            except Exception as e:
+                with self._lock:
+                    self._counters['errors'] += 1
+                metrics.LLM_ERRORS.inc(**self._metric_labels())
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    logger.error(f"{self.__class__.__name__}.complete failed: {e}")
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"{self.__class__.__name__}.complete attempt {attempt + 1} failed: {e}, "
+                    f"retrying in {delay:.2f}s"
+                )
+                with self._lock:
+                    self._counters['retries'] += 1
+                metrics.LLM_RETRIES.inc(**self._metric_labels())
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            latency = time.perf_counter() - start
+            self._record(response, latency)
+            return response._replace(latency=latency)
+
+    def stream(self, instructions: str, prompt: str, timeout: float = None, **options) -> Iterator[str]:
+        """
+        Send one prompt to the model and yield the answer text piece by piece
+        as it is generated.
+
+        Attempts failing before the first piece are retried like `complete`;
+        once text has been yielded a failure is raised to the caller. Usage and
+        latency (of the whole stream) are recorded when it ends.
+
+        Args:
+            instructions: System instruction for the model.
+            prompt: User input.
+            timeout: Per-request timeout in seconds (defaults to self.timeout).
+            **options: Backend-specific request options.
+
+        Yields:
+            str: Consecutive pieces of the answer text.
+        """
+        timeout = timeout or self.timeout
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            pieces = self._stream(instructions, prompt, timeout=timeout, **options)
+            started = False
+            try:
+                while True:
+                    try:
+                        piece = next(pieces)
+                    except StopIteration as stop:
+                        response = stop.value
+                        break
+                    started = True
+                    yield piece
+            except Exception as e:
+                with self._lock:
+                    self._counters['errors'] += 1
+                metrics.LLM_ERRORS.inc(**self._metric_labels())
+                if started or attempt >= self.max_retries or not self._is_retryable(e):
+                    logger.error(f"{self.__class__.__name__}.stream failed: {e}")
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"{self.__class__.__name__}.stream attempt {attempt + 1} failed: {e}, "
+                    f"retrying in {delay:.2f}s"
+                )
+                with self._lock:
+                    self._counters['retries'] += 1
+                metrics.LLM_RETRIES.inc(**self._metric_labels())
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            self._record(response or ModelResponse(text=''), time.perf_counter() - start)
+            return
+
+    def complete_hedged(
+        self,
+        instructions: str,
+        prompt: str,
+        deadline: float = None,
+        hedge_delay: float = None,
+        on_piece: Callable[[str], None] = None,
+        **options
+    ) -> ModelResponse:
+        """
+        Send one prompt within a latency budget, hedging slow requests.
+
+        The request runs on a worker thread. If it has produced no text after
+        `hedge_delay` seconds, one duplicate is sent and whichever answers
+        first wins; the other one is cancelled (its stream is closed, which
+        aborts the HTTP request of streaming backends). An attempt failing
+        with a retryable error is replaced after a backoff, within the same
+        budget.
+
+        When `deadline` seconds have passed, every attempt is cancelled and the
+        text received so far is returned with `partial=True` (possibly empty).
+
+        With `on_piece`, the answer is streamed to it: the first attempt to
+        produce text becomes the leader and the others are cancelled, so the
+        pieces passed on always belong to one answer. A leader failing after
+        its first piece is raised, as in `stream`.
+
+        Args:
+            instructions: System instruction for the model.
+            prompt: User input.
+            deadline: Budget in seconds (defaults to self.deadline).
+            hedge_delay: Seconds before the hedge (defaults to `hedge_delay()`).
+            on_piece: Optional callback receiving the answer piece by piece.
+            **options: Backend-specific request options.
+
+        Returns:
+            ModelResponse: Answer of the winning attempt (latency measured from
+            the call), or the partial answer when the deadline passed.
+        """
+        deadline = deadline or self.deadline
+        hedge_delay = self.hedge_delay() if hedge_delay is None else hedge_delay
+        max_attempts = 2 + self.max_retries
+        start = time.perf_counter()
+        events = queue.Queue()
+        cancels: List[threading.Event] = []
+        pieces: List[List[str]] = []
+        running = set()
+        leader = None
+        hedge = None  # index of the hedged duplicate once sent
+
+        def launch():
+            cancel = threading.Event()
+            cancels.append(cancel)
+            pieces.append([])
+            running.add(len(cancels) - 1)
+            timeout = min(self.timeout, max(0.0, deadline - (time.perf_counter() - start)))
+            threading.Thread(
+                target=self._run_attempt,
+                args=(len(cancels) - 1, cancel, events, instructions, prompt, timeout, options),
+                daemon=True
+            ).start()
+
+        def cancel_others(keep):
+            for i, cancel in enumerate(cancels):
+                if i != keep:
+                    cancel.set()
+                    running.discard(i)
+
+        launch()
+        try:
+            while True:
+                elapsed = time.perf_counter() - start
+                if elapsed >= deadline:
+                    break
+                # An attempt already producing text is alive, only a silent one is hedged
+                can_hedge = hedge is None and not any(pieces) and len(cancels) < max_attempts
+                wait = deadline - elapsed
+                if can_hedge:
+                    wait = min(wait, max(0.0, hedge_delay - elapsed))
+                try:
+                    i, kind, value = events.get(timeout=wait)
+                except queue.Empty:
+                    if can_hedge and time.perf_counter() - start >= hedge_delay:
+                        hedge = len(cancels)
+                        with self._lock:
+                            self._counters['hedges'] += 1
+                        metrics.LLM_HEDGES.inc(**self._metric_labels())
+                        logger.info(f"{self.__class__.__name__}: no answer after {hedge_delay:.2f}s, hedging")
+                        launch()
+                    continue
+                if i not in running:
+                    continue  # cancelled attempt, its events no longer count
+
+                if kind == 'piece':
+                    pieces[i].append(value)
+                    if on_piece is not None:
+                        if leader is None:
+                            leader = i
+                            cancel_others(i)
+                        on_piece(value)
+                    continue
+
+                running.discard(i)
+                if kind == 'done':
+                    response, latency = value
+                    cancel_others(i)
+                    self._record(response, latency)
+                    if i == hedge:
+                        with self._lock:
+                            self._counters['hedge_wins'] += 1
+                    if on_piece is not None and leader is None:
+                        for piece in pieces[i]:
+                            on_piece(piece)
+                    return response._replace(latency=time.perf_counter() - start)
+
+                # kind == 'error'
+                with self._lock:
+                    self._counters['errors'] += 1
+                metrics.LLM_ERRORS.inc(**self._metric_labels())
+                if i == leader or not self._is_retryable(value):
+                    logger.error(f"{self.__class__.__name__}.complete_hedged failed: {value}")
+                    raise value
+                if not running:
+                    if len(cancels) >= max_attempts:
+                        logger.error(f"{self.__class__.__name__}.complete_hedged failed: {value}")
+                        raise value
+                    delay = min(self._backoff(len(cancels) - 1), max(0.0, deadline - (time.perf_counter() - start)))
+                    logger.warning(
+                        f"{self.__class__.__name__}.complete_hedged attempt {len(cancels)} failed: {value}, "
+                        f"retrying in {delay:.2f}s"
+                    )
+                    with self._lock:
+                        self._counters['retries'] += 1
+                    metrics.LLM_RETRIES.inc(**self._metric_labels())
+                    time.sleep(delay)
+                    launch()
+        finally:
+            for cancel in cancels:
+                cancel.set()
+
+        with self._lock:
+            self._counters['deadline_exceeded'] += 1
+        metrics.LLM_DEADLINE_EXCEEDED.inc(**self._metric_labels())
+        text = ''.join(pieces[leader] if leader is not None else max(pieces, key=len))
+        logger.warning(
+            f"{self.__class__.__name__}: deadline of {deadline:.1f}s exceeded, "
+            f"returning {len(text)} characters"
+        )
+        return ModelResponse(text=text, latency=time.perf_counter() - start, partial=True)
+
+    def _run_attempt(
+        self,
+        index: int,
+        cancel: threading.Event,
+        events: queue.Queue,
+        instructions: str,
+        prompt: str,
+        timeout: float,
+        options: Dict[str, Any]
+    ) -> None:
+        """
+        One attempt of complete_hedged(), run on its own thread: puts
+        (index, 'piece' | 'done' | 'error', value) on `events` until done or
+        cancelled.
+        """
+        start = time.perf_counter()
+        received = []
+        pieces = None
+        try:
+            pieces = self._stream(instructions, prompt, timeout=timeout, **options)
+            while not cancel.is_set():
+                try:
+                    piece = next(pieces)
+                except StopIteration as stop:
+                    response = stop.value or ModelResponse(text=''.join(received))
+                    events.put((index, 'done', (response, time.perf_counter() - start)))
+                    return
+                received.append(piece)
+                events.put((index, 'piece', piece))
+        except Exception as e:
+            events.put((index, 'error', e))
+        finally:
+            if pieces is not None:
+                pieces.close()
+
+    def hedge_delay(self) -> float:
+        """
+        Seconds before complete_hedged() sends a duplicate request: the p95 of
+        the recent latencies, or the configured delay until there are
+        HEDGE_MIN_SAMPLES of them.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < self.HEDGE_MIN_SAMPLES:
+            return self.default_hedge_delay
+        return self._percentile(latencies, 0.95)
+
+    @staticmethod
+    def _percentile(latencies: List[float], q: float) -> float:
+        return latencies[int(q * (len(latencies) - 1))] if latencies else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Snapshot of the request, error, retry, hedge, latency and token counters.
+        """
+        with self._lock:
+            snapshot = dict(self._counters)
+            latencies = sorted(self._latencies)
+        snapshot['latency_avg'] = (
+            snapshot['latency_total'] / snapshot['requests'] if snapshot['requests'] else 0.0
+        )
+        snapshot['latency_p95'] = self._percentile(latencies, 0.95)
+        return snapshot
+
+    def _record(self, response: ModelResponse, latency: float) -> None:
+        with self._lock:
+            self._counters['requests'] += 1
+            self._counters['latency_total'] += latency
+            self._counters['input_tokens'] += response.input_tokens
+            self._counters['output_tokens'] += response.output_tokens
+            self._latencies.append(latency)
+        labels = self._metric_labels()
+        metrics.LLM_REQUESTS.inc(**labels)
+        metrics.LLM_LATENCY.observe(latency, **labels)
+        metrics.LLM_TOKENS.inc(response.input_tokens, direction='input', **labels)
+        metrics.LLM_TOKENS.inc(response.output_tokens, direction='output', **labels)
+
+    def _metric_labels(self) -> Dict[str, str]:
+        return {'client': self.__class__.__name__, 'model': self.model_id}
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _is_retryable(self, error: Exception) -> bool:
+        """Whether a failed attempt is worth retrying. Subclasses narrow this down."""
+        return isinstance(error, (TimeoutError, ConnectionError))
+
+    @abstractmethod
+    def _complete(self, instructions: str, prompt: str, timeout: float, **options) -> ModelResponse:
+        """
+        子类实现的单次请求逻辑，不需要处理重试和统计
+
+        Returns:
+            ModelResponse: Answer text and token usage (latency is filled in by complete()).
+        """
+        pass
+
+    def _stream(self, instructions: str, prompt: str, timeout: float, **options) -> Iterator[str]:
+        """
+        单次流式请求：逐段 yield 文本，最后 return ModelResponse（含 token 用量）。
+        默认退化为一次 _complete()，整段文本一次性返回；支持流式的子类覆盖此方法。
+        """
+        response = self._complete(instructions, prompt, timeout=timeout, **options)
+        yield response.text
+        return response
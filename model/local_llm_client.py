@@ -0,0 +1,46 @@
+import json
+import re
+from typing import Iterator
+from .base import ModelClient, ModelResponse
+
+# Date keys of a batched prompt, see config_lang "signal_header"
+_DATE_KEY = re.compile(r'^### (\d{4}-\d{2}-\d{2})', re.MULTILINE)
+
+
+class LocalLLMClient(ModelClient):
+    """
+    Offline stub backend: answers instantly without any network access.
+
+    The answer only reports what was received, which is enough to run the whole
+    pipeline and UI without an API key. JSON-mode requests (batched analysis)
+    get one entry per date key found in the prompt. Streamed answers are
+    yielded word by word.
+    """
+
+    def __init__(self, api_key: str = None, **kwargs):
+        super().__init__(**kwargs)
+
+    @property
+    def model_id(self) -> str:
+        return 'local-stub'
+
+    def _complete(self, instructions: str, prompt: str, timeout: float, **options) -> ModelResponse:
+        fmt = options.get('text', {}).get('format', {}).get('type')
+        if fmt == 'json_object':
+            text = json.dumps({
+                key: f"[local stub] analysis for {key}"
+                for key in _DATE_KEY.findall(prompt)
+            })
+        else:
+            text = f"[local stub] received a prompt of {len(prompt)} characters"
+        return ModelResponse(
+            text=text,
+            input_tokens=len(prompt) // 4 + 1,
+            output_tokens=len(text) // 4 + 1,
+        )
+
+    def _stream(self, instructions: str, prompt: str, timeout: float, **options) -> Iterator[str]:
+        response = self._complete(instructions, prompt, timeout=timeout, **options)
+        for word in re.findall(r'\S+\s*', response.text):
+            yield word
+        return response
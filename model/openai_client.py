@@ -0,0 +1,98 @@
+from typing import Iterator
+
+import httpx
+import openai
+from openai import OpenAI
+from .base import ModelClient, ModelResponse
+
+
+class OpenAIClient(ModelClient):
+    """
+    Model client for the OpenAI Responses API.
+
+    One instance owns one `OpenAI` client whose httpx connection pool keeps
+    connections alive across requests, so only the first call pays for
+    connection setup and TLS. Retries are handled by ModelClient, the SDK's
+    own retries are disabled. Closing a streamed response closes its
+    connection, which is how complete_hedged() cancels the losing request.
+    """
+    requires_api_key = True
+
+    RETRYABLE_ERRORS = (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+
+    def __init__(self, api_key: str, max_connections: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self._client = None
+
+    @property
+    def client(self) -> OpenAI:
+        """The pooled OpenAI client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                    timeout=self.timeout,
+                )
+                self._client = OpenAI(
+                    api_key=self.api_key,
+                    http_client=http_client,
+                    timeout=self.timeout,
+                    max_retries=0,
+                )
+            return self._client
+
+    def _complete(self, instructions: str, prompt: str, timeout: float, **options) -> ModelResponse:
+        response = self.client.responses.create(
+            model=self.model,
+            instructions=instructions,
+            input=prompt,
+            timeout=timeout,
+            **options
+        )
+        usage = getattr(response, 'usage', None)
+        return ModelResponse(
+            text=response.output[0].content[0].text.strip(),
+            input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+        )
+
+    def _stream(self, instructions: str, prompt: str, timeout: float, **options) -> Iterator[str]:
+        events = self.client.responses.create(
+            model=self.model,
+            instructions=instructions,
+            input=prompt,
+            timeout=timeout,
+            stream=True,
+            **options
+        )
+        pieces = []
+        usage = None
+        try:
+            for event in events:
+                if event.type == 'response.output_text.delta':
+                    pieces.append(event.delta)
+                    yield event.delta
+                elif event.type == 'response.completed':
+                    usage = getattr(event.response, 'usage', None)
+                elif event.type in ('response.failed', 'error'):
+                    raise RuntimeError(f'response stream {event.type}: {getattr(event, "message", None) or event}')
+        finally:
+            events.close()
+        return ModelResponse(
+            text=''.join(pieces).strip(),
+            input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+        )
+
+    def _is_retryable(self, error: Exception) -> bool:
+        return isinstance(error, self.RETRYABLE_ERRORS) or super()._is_retryable(error)
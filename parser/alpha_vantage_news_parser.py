@@ -1,67 +1,161 @@
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, List, Union
 from .base import Parser
 
+# Alpha Vantage sentiment labels, from most bearish to most bullish
+SENTIMENT_LABELS = pd.CategoricalDtype(
+    ['Bearish', 'Somewhat-Bearish', 'Neutral', 'Somewhat-Bullish', 'Bullish'], ordered=True
+)
+
+ARTICLE_FIELDS = ['time_published', 'title', 'summary', 'url', 'source', 'ticker_sentiment']
+
+
 class AlphaVantageNewsParser(Parser):
     """
     Parse raw Alpha Vantage NEWS_SENTIMENT feed into standardized records.
+
+    The whole feed is normalized column by column: timestamps are parsed in one
+    vectorized call and the target ticker's sentiment is picked from the
+    exploded `ticker_sentiment` lists. Articles without a valid timestamp or
+    without the target ticker are dropped.
+
+    Returns a frame sorted by publication time with float32 scores and an
+    ordered categorical `ticker_sentiment_label` (unknown or missing labels
+    become 'Neutral').
+
+    Articles whose relevance to the target ticker is below `min_relevance`
+    (config.DEFAULT_RELEVANCE_THRESHOLD unless given) are dropped as well.
+    `parse_stream` does the same filtering article by article on an iterator
+    (e.g. AlphaVantageNewsFetcher.fetch_stream) and yields typed frames in
+    batches, without holding the whole feed.
     """
-    def __init__(self, target_ticker: str):
+    def __init__(self, target_ticker: str, min_relevance: float = None):
+        if min_relevance is None:
+            import config
+            min_relevance = config.DEFAULT_RELEVANCE_THRESHOLD
         self.target_ticker = target_ticker
+        self.min_relevance = min_relevance
 
-    def _parse(self, raw_feed: List[Dict[str, Any]]) -> pd.DataFrame:
-        # 只专注核心业务逻辑
-        print(raw_feed['totalResults'])
-        records: List[Dict[str, Any]] = []
-        
-        for entry in raw_feed:
-            # Parse publication time
-            time_str = entry.get('time_published')
-            if not time_str:
-                continue
-            dt = pd.to_datetime(time_str, format='%Y%m%dT%H%M%S', errors='coerce')
-            if pd.isna(dt):
+    @staticmethod
+    def empty_frame() -> pd.DataFrame:
+        return pd.DataFrame({
+            'time_published': pd.Series(dtype='datetime64[ns]'),
+            'title': pd.Series(dtype=object),
+            'summary': pd.Series(dtype=object),
+            'url': pd.Series(dtype=object),
+            'source': pd.Series(dtype='category'),
+            'relevance_score': pd.Series(dtype=np.float32),
+            'ticker_sentiment_score': pd.Series(dtype=np.float32),
+            'ticker_sentiment_label': pd.Series(dtype=SENTIMENT_LABELS),
+        })
+
+    def parse_stream(self, items: Iterable[Dict[str, Any]], batch_size: int = 100) -> Iterator[pd.DataFrame]:
+        """
+        Parse feed items as they arrive, yielding a frame every `batch_size`
+        kept articles (each batch sorted by time, not the stream as a whole).
+
+        Only the fields of the output columns are kept for the articles that
+        match, so memory is bounded by the batch size, not the feed size.
+        """
+        batch = []
+        for item in items:
+            entry = self._entry(item)
+            if entry is None:
                 continue
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                yield self._frame(batch)
+                batch = []
+        if batch:
+            yield self._frame(batch)
 
-            # Extract nested sentiment
-            ticker_list = entry.get('ticker_sentiment', []) or []
-            if ticker_list:
-                matching = [ts for ts in ticker_list if ts.get('ticker') == self.target_ticker]
-                if matching:
-                    ts0 = matching[0]
-                    rel_score = ts0.get('relevance_score')
-                    sentiment_score = ts0.get('ticker_sentiment_score')
-                    sentiment_label = ts0.get('ticker_sentiment_label')
-                else:
-                    continue
-            else:
+    def _entry(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Slim record of one article for the target ticker, None if it is filtered out.
+        """
+        for sentiment in item.get('ticker_sentiment') or ():
+            if not isinstance(sentiment, dict) or sentiment.get('ticker') != self.target_ticker:
                 continue
-                
-            # Normalize numeric values
             try:
-                relevance_score = float(rel_score)
+                relevance = float(sentiment.get('relevance_score'))
             except (TypeError, ValueError):
-                relevance_score = 1.0
-            try:
-                ticker_sentiment_score = float(sentiment_score) if sentiment_score is not None else 0.0
-            except (TypeError, ValueError):
-                ticker_sentiment_score = 0.0
-            if sentiment_label is None:
-                sentiment_label = "Neutral"
-
-            # Build standardized record
-            record: Dict[str, Any] = {
-                'time_published': dt,
-                'title': entry.get('title'),
-                'summary': entry.get('summary'),
-                'url': entry.get('url'),
-                'source': entry.get('source'),
-                'relevance_score': relevance_score,
-                'ticker_sentiment_score': ticker_sentiment_score,
-                'ticker_sentiment_label': sentiment_label
+                relevance = 1.0
+            if relevance < self.min_relevance:
+                return None
+            return {
+                'time_published': item.get('time_published'),
+                'title': item.get('title'),
+                'summary': item.get('summary'),
+                'url': item.get('url'),
+                'source': item.get('source'),
+                'relevance_score': relevance,
+                'ticker_sentiment_score': sentiment.get('ticker_sentiment_score'),
+                'ticker_sentiment_label': sentiment.get('ticker_sentiment_label'),
             }
-            records.append(record)
-            
+        return None
+
+    def _frame(self, entries: List[Dict[str, Any]]) -> pd.DataFrame:
+        df = pd.DataFrame.from_records(entries, columns=list(self.empty_frame().columns))
+        df['time_published'] = pd.to_datetime(df['time_published'], format='%Y%m%dT%H%M%S', errors='coerce')
+        df = df[df['time_published'].notna()]
+        if df.empty:
+            return self.empty_frame()
+        df = df.astype({
+            'source': 'category',
+            'relevance_score': np.float32,
+        })
+        df['ticker_sentiment_score'] = pd.to_numeric(df['ticker_sentiment_score'], errors='coerce').fillna(0.0).astype(np.float32)
+        df['ticker_sentiment_label'] = df['ticker_sentiment_label'].astype(SENTIMENT_LABELS).fillna('Neutral')
+        return df.sort_values('time_published', kind='stable').reset_index(drop=True)
+
+    def _parse(self, raw_feed: Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]) -> pd.DataFrame:
+        # 只专注核心业务逻辑
+        if not isinstance(raw_feed, list):
+            # Streamed feed: filter on the fly, then one sort over the kept batches
+            frames = list(self.parse_stream(raw_feed))
+            if not frames:
+                return self.empty_frame()
+            df = pd.concat(frames, ignore_index=True)
+            df['source'] = df['source'].astype('category')
+            return df.sort_values('time_published', kind='stable').reset_index(drop=True)
+
+        if not raw_feed:
+            return self.empty_frame()
+
+        articles = pd.DataFrame.from_records(raw_feed, columns=ARTICLE_FIELDS)
+        published = pd.to_datetime(articles['time_published'], format='%Y%m%dT%H%M%S', errors='coerce')
+
+        # One row per (article, ticker) pair, keep the first entry of the target ticker
+        sentiment = articles['ticker_sentiment'].explode().dropna()
+        if sentiment.empty:
+            return self.empty_frame()
+        sentiment = sentiment[sentiment.str.get('ticker') == self.target_ticker]
+        sentiment = sentiment[~sentiment.index.duplicated()]
+        sentiment = sentiment[published.loc[sentiment.index].notna().to_numpy()]
+        if sentiment.empty:
+            return self.empty_frame()
+
+        relevance = pd.to_numeric(sentiment.str.get('relevance_score'), errors='coerce').fillna(1.0)
+        if self.min_relevance > 0:
+            keep = (relevance >= self.min_relevance).to_numpy()
+            sentiment, relevance = sentiment[keep], relevance[keep]
+            if sentiment.empty:
+                return self.empty_frame()
+        idx = sentiment.index
+        score = pd.to_numeric(sentiment.str.get('ticker_sentiment_score'), errors='coerce').fillna(0.0)
+        label = sentiment.str.get('ticker_sentiment_label').astype(SENTIMENT_LABELS).fillna('Neutral')
+
+        df = pd.DataFrame({
+            'time_published': published.loc[idx],
+            'title': articles['title'].loc[idx],
+            'summary': articles['summary'].loc[idx],
+            'url': articles['url'].loc[idx],
+            'source': articles['source'].loc[idx].astype('category'),
+            'relevance_score': relevance.astype(np.float32),
+            'ticker_sentiment_score': score.astype(np.float32),
+            'ticker_sentiment_label': label,
+        })
+
         # Sort by time
-        records.sort(key=lambda r: r['time_published'])
-        return pd.DataFrame(records)
\ No newline at end of file
+        return df.sort_values('time_published', kind='stable').reset_index(drop=True)
@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import Any
 import logging
+import time
+
+import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +15,7 @@ class Parser(ABC):
     
     def parse(self, raw_data: Any) -> Any:
         """
-        解析原始数据，统一异常处理
+        解析原始数据，统一异常处理与指标（调用次数、错误、延迟、输出行数）
         
         Args:
             raw_data: 由 Fetcher 拉取到的原始数据
@@ -20,11 +23,21 @@ class Parser(ABC):
         Returns:
             解析后的结构化结果
         """
+        name = self.__class__.__name__
+        metrics.PARSE_CALLS.inc(parser=name)
+        start = time.perf_counter()
         try:
-            return self._parse(raw_data)
+            result = self._parse(raw_data)
         except Exception as e:
-            logger.error(f"{self.__class__.__name__} parse failed: {e}")
+            metrics.PARSE_ERRORS.inc(parser=name)
+            logger.error(f"{name} parse failed: {e}")
             raise
+        finally:
+            metrics.PARSE_LATENCY.observe(time.perf_counter() - start, parser=name)
+        rows = metrics.count_rows(result)
+        if rows is not None:
+            metrics.PARSE_ROWS.inc(rows, parser=name)
+        return result
     
     @abstractmethod
     def _parse(self, raw_data: Any) -> Any:
@@ -1,17 +1,37 @@
 from parser.base import Parser
 import pandas as pd
 
+ARTICLE_FIELDS = ['title', 'description', 'url', 'publishedAt', 'source']
+
+
 class NewsAPIParser(Parser):
-    def _parse(self, raw_news):
-        news_list = []
-        for entry in raw_news:
+    """
+    Parse NewsAPI `articles` into the standard news frame.
 
-            news = {
-                'title':entry.get('title'),
-                'summary':entry.get('description'),
-                'url':entry.get('url'),
-                'time_published':entry.get('publishedAt'),
-            }
+    The articles are normalized column by column and `publishedAt` is parsed
+    in one vectorized call into tz-aware UTC timestamps (unparseable ones
+    become NaT). The source name is categorical.
+    """
+    @staticmethod
+    def empty_frame() -> pd.DataFrame:
+        return pd.DataFrame({
+            'title': pd.Series(dtype=object),
+            'summary': pd.Series(dtype=object),
+            'url': pd.Series(dtype=object),
+            'time_published': pd.Series(dtype='datetime64[ns, UTC]'),
+            'source': pd.Series(dtype='category'),
+        })
+
+    def _parse(self, raw_news):
+        if not raw_news:
+            return self.empty_frame()
 
-            news_list.append(news)
-        return pd.DataFrame(news_list)
\ No newline at end of file
+        articles = pd.DataFrame.from_records(raw_news, columns=ARTICLE_FIELDS)
+        sources = [s.get('name') if isinstance(s, dict) else None for s in articles['source']]
+        return pd.DataFrame({
+            'title': articles['title'],
+            'summary': articles['description'],
+            'url': articles['url'],
+            'time_published': pd.to_datetime(articles['publishedAt'], utc=True, errors='coerce', format='ISO8601'),
+            'source': pd.Series(sources, dtype='category'),
+        })
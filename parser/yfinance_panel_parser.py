@@ -0,0 +1,28 @@
+from typing import Dict
+import pandas as pd
+from .base import Parser
+
+
+class YFinancePanelParser(Parser):
+    """
+    专用于解析 yf.download 返回的多股票宽表（日期 x (字段, 股票)）。
+
+    Normalizes the whole panel in one pass (lower-case field names, datetime
+    index) and stacks it to one row per (date, symbol), then hands out one
+    frame per symbol in the same layout YFinanceParser produces.
+    """
+    def _parse(self, panel: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        if not isinstance(panel.columns, pd.MultiIndex):
+            raise ValueError('expected a (field, symbol) MultiIndex column panel')
+
+        fields = panel.columns.get_level_values(0).str.lower()
+        symbols = panel.columns.get_level_values(1)
+        panel = panel.set_axis(pd.MultiIndex.from_arrays([fields, symbols], names=['field', 'symbol']), axis=1)
+        panel = panel.set_axis(pd.to_datetime(panel.index), axis=0).sort_index(axis=1)
+
+        # One reshape to (date, symbol) rows, then drop the dates a symbol has
+        # no close for (not listed yet, halted, ...) across all symbols at once
+        rows = panel.stack('symbol', future_stack=True)
+        rows = rows[rows['close'].notna()]
+        rows.columns.name = None
+        return {symbol: frame.droplevel('symbol') for symbol, frame in rows.groupby(level='symbol')}
@@ -0,0 +1,80 @@
+import importlib
+import threading
+from collections.abc import MutableMapping
+from importlib.metadata import entry_points
+from typing import Any, Dict, Iterator, Union
+
+
+def import_object(path: str) -> Any:
+    """
+    Import the object named by a dotted path, 'package.module:Name' or
+    'package.module.Name'.
+    """
+    module_name, sep, attr = path.partition(':')
+    if not sep:
+        module_name, _, attr = path.rpartition('.')
+    module = importlib.import_module(module_name)
+    for part in attr.split('.'):
+        module = getattr(module, part)
+    return module
+
+
+class LazyRegistry(MutableMapping):
+    """
+    Name -> provider class mapping whose classes are imported on first lookup.
+
+    Entries are dotted paths (see `import_object`) or classes. Providers
+    installed by other packages under the entry point `group` are added
+    after the built-in ones (the built-ins win on a name clash). Only the
+    module of the provider actually looked up gets imported, so the heavy
+    dependencies of the others (yfinance, openai, streamlit, ...) are not.
+    """
+
+    def __init__(self, providers: Dict[str, Union[str, type]], group: str = None):
+        self._entries: Dict[str, Union[str, type]] = dict(providers)
+        self._group = group
+        self._discovered = group is None
+        self._lock = threading.Lock()
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        for entry_point in entry_points(group=self._group):
+            self._entries.setdefault(entry_point.name, entry_point.value)
+        self._discovered = True
+
+    def __getitem__(self, name: str) -> type:
+        with self._lock:
+            if name not in self._entries:
+                self._discover()
+            entry = self._entries[name]
+            if isinstance(entry, str):
+                entry = self._entries[name] = import_object(entry)
+            return entry
+
+    def __setitem__(self, name: str, provider: Union[str, type]) -> None:
+        with self._lock:
+            self._entries[name] = provider
+
+    def __delitem__(self, name: str) -> None:
+        with self._lock:
+            del self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._discover()
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._discover()
+            return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            if name not in self._entries:
+                self._discover()
+            return name in self._entries
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({sorted(self._entries)})'
@@ -0,0 +1,271 @@
+"""
+Headless JSON API of the analysis pipeline.
+
+    python server.py [--port 8888] [--mock]
+
+GET /api/analyze?symbol=TSLA&period=30&threshold=5&lang=en streams one JSON
+object per line (NDJSON): `prices`, `signals`, `progress`, one `analysis`
+per signal date as soon as it is ready, then `done` (or `error`).
+Identical requests arriving while one is running share that single run.
+
+GET /metrics and /metrics.json export the fetcher, parser, HTTP cache and
+LLM metrics as Prometheus text and as JSON.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Tuple
+
+import tornado.ioloop
+import tornado.web
+from tornado.iostream import StreamClosedError
+
+import app
+import config
+import config_ui
+import metrics
+from analyzer.cache import AnalysisCache
+from config_lang import LANG_CONFIG
+from fetcher.rate_limit import PRIORITY_INTERACTIVE, request_priority
+from model import ModelClient
+from ui.json_renderer import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+# (symbol, period_days, threshold, lang)
+RequestKey = Tuple[str, int, float, str]
+
+
+class PipelineRun:
+    """
+    Events of one pipeline execution, replayed to every subscriber.
+
+    Only touched from the event loop thread.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.done = False
+        self._changed = asyncio.Event()
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        self._wake()
+
+    def finish(self, event: Dict[str, Any]) -> None:
+        self.events.append(event)
+        self.done = True
+        self._wake()
+
+    def _wake(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def stream(self):
+        """
+        Yield every event from the first one, waiting for new ones until the run is done.
+        """
+        position = 0
+        while True:
+            while position < len(self.events):
+                yield self.events[position]
+                position += 1
+            if self.done:
+                return
+            await self._changed.wait()
+
+
+class PipelineCoalescer:
+    """
+    Run the pipeline on a thread pool, at most once per request key at a time.
+
+    `execute(key, emit)` runs the pipeline and calls `emit` (from its worker
+    thread) for each event; it returns the number of analyzed signals.
+    """
+
+    def __init__(self, execute: Callable[[RequestKey, Callable], int], executor: ThreadPoolExecutor):
+        self.execute = execute
+        self.executor = executor
+        self._runs: Dict[RequestKey, PipelineRun] = {}
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def subscribe(self, key: RequestKey) -> PipelineRun:
+        run = self._runs.get(key)
+        if run is not None:
+            return run
+
+        run = PipelineRun()
+        self._runs[key] = run
+        loop = asyncio.get_running_loop()
+
+        def emit(event):
+            loop.call_soon_threadsafe(run.publish, event)
+
+        # Completion is scheduled after every event emitted by the worker
+        future = loop.run_in_executor(self.executor, self.execute, key, emit)
+        future.add_done_callback(lambda f: self._finish(key, run, f))
+        return run
+
+    def _finish(self, key: RequestKey, run: PipelineRun, future: asyncio.Future) -> None:
+        if self._runs.get(key) is run:
+            del self._runs[key]
+        if future.exception() is not None:
+            logger.error(f'Pipeline {key} failed: {future.exception()}')
+            run.finish({'event': 'error', 'message': str(future.exception())})
+        else:
+            run.finish({'event': 'done', 'total_signals': future.result()})
+
+
+def build_components(
+    mock: bool = False,
+    price_file: str = None,
+    news_file: str = None,
+    cache_path: str = None,
+    model_client: ModelClient = None
+) -> Callable[[str], Dict]:
+    """
+    Factory of the fetchers, parsers, analysis cache and model client used for a symbol.
+
+    With `mock`, prices and news come from local JSON files through
+    tests.mock.DummySession and the analyses from an offline local model
+    client of its own; unless `cache_path` is given they are cached in memory
+    only, so the stub answers never reach the real analysis cache.
+
+    Args:
+        cache_path: Analysis cache file (defaults to config.ANALYSIS_CACHE_PATH,
+                    in memory with `mock`).
+        model_client: Client of the analyses (defaults to get_model_client(),
+                      a new local client with `mock`).
+    """
+    if mock:
+        from tests.mock import DummySession, MockNewsFetcher, MockPriceFetcher
+
+        session = DummySession(price_file, news_file)
+        shared = {
+            'news_fetcher': MockNewsFetcher(session),
+            'price_fetcher': MockPriceFetcher(session),
+            'price_parser': config.PRICE_PARSERS['alpha_vantage'](),
+            'analysis_cache': AnalysisCache(cache_path or ':memory:'),
+            'model_client': model_client or config.MODEL_CLIENTS['local'](),
+        }
+
+        def components(symbol):
+            return {**shared, 'news_parser': config.NEWS_PARSERS['alpha_vantage'](target_ticker=symbol)}
+        return components
+
+    shared = {
+        'news_fetcher': config.NEWS_FETCHERS[config.DEFAULT_NEWS_FETCHER](api_key=config.NEWSAPI_API_KEY),
+        'price_fetcher': config.PRICE_FETCHERS[config.DEFAULT_PRICE_FETCHER](),
+        'news_parser': config.NEWS_PARSERS[config.DEFAULT_NEWS_PARSER](),
+        'price_parser': config.PRICE_PARSERS[config.DEFAULT_PRICE_PARSER](),
+        'analysis_cache': AnalysisCache(cache_path),
+        'model_client': model_client,
+    }
+    return lambda symbol: shared
+
+
+def make_executor(components: Callable[[str], Dict]) -> Callable[[RequestKey, Callable], int]:
+    def execute(key, emit):
+        symbol, period_days, threshold, lang = key
+        # A client is waiting on the response, as on the Streamlit page
+        with request_priority(PRIORITY_INTERACTIVE):
+            association = app.run(
+                symbol, period_days, threshold, lang,
+                render=JSONRenderer(emit),
+                **components(symbol)
+            )
+        return len(association)
+    return execute
+
+
+class JSONHandler(tornado.web.RequestHandler):
+    def initialize(self, coalescer: PipelineCoalescer):
+        self.coalescer = coalescer
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({'event': 'error', 'message': self._reason})
+
+
+class AnalyzeHandler(JSONHandler):
+    def parse_key(self) -> RequestKey:
+        symbol = self.get_argument('symbol').upper().strip()
+        lang = self.get_argument('lang', config_ui.DEFAULT_LANGUAGE)
+        try:
+            period_days = int(self.get_argument('period', str(config_ui.PERIOD_DAYS[config_ui.DEFAULT_PERIOD])))
+            threshold = float(self.get_argument('threshold', str(config_ui.DEFAULT_PRICE_MOVE_THRESHOLD)))
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason='period and threshold must be numbers')
+        if not symbol:
+            raise tornado.web.HTTPError(400, reason='symbol is empty')
+        if period_days not in config_ui.PERIOD_DAYS.values():
+            raise tornado.web.HTTPError(400, reason=f'period must be one of {sorted(config_ui.PERIOD_DAYS.values())}')
+        if threshold <= 0:
+            raise tornado.web.HTTPError(400, reason='threshold must be positive')
+        if lang not in LANG_CONFIG:
+            raise tornado.web.HTTPError(400, reason=f'lang must be one of {sorted(LANG_CONFIG)}')
+        return symbol, period_days, threshold, lang
+
+    async def get(self):
+        key = self.parse_key()
+        self.set_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.set_header('Cache-Control', 'no-cache')
+
+        run = self.coalescer.subscribe(key)
+        try:
+            async for event in run.stream():
+                self.write(json.dumps({'symbol': key[0], **event}, ensure_ascii=False) + '\n')
+                await self.flush()
+        except StreamClosedError:
+            # The client went away; the run goes on for the other subscribers
+            pass
+
+
+class HealthHandler(JSONHandler):
+    def get(self):
+        self.write({'status': 'ok', 'in_flight': len(self.coalescer)})
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.write(metrics.export_prometheus())
+
+
+class MetricsJSONHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header('Content-Type', 'application/json')
+        self.write(json.dumps(metrics.snapshot()))
+
+
+def make_app(execute: Callable[[RequestKey, Callable], int], max_workers: int = None) -> tornado.web.Application:
+    executor = ThreadPoolExecutor(max_workers=max_workers or config.API_SERVER_WORKERS)
+    coalescer = PipelineCoalescer(execute, executor)
+    return tornado.web.Application([
+        (r'/api/analyze', AnalyzeHandler, {'coalescer': coalescer}),
+        (r'/health', HealthHandler, {'coalescer': coalescer}),
+        (r'/metrics', MetricsHandler),
+        (r'/metrics\.json', MetricsJSONHandler),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='StockAI JSON API server')
+    parser.add_argument('--port', type=int, default=config.API_SERVER_PORT)
+    parser.add_argument('--mock', action='store_true', help='serve local sample data, no API keys needed')
+    parser.add_argument('--price-file', default='tests/TSLA_daily.json')
+    parser.add_argument('--news-file', default='tests/TSLA_news_3months.json')
+    args = parser.parse_args()
+
+    components = build_components(args.mock, args.price_file, args.news_file)
+    server_app = make_app(make_executor(components))
+    server_app.listen(args.port)
+    logger.info(f'Listening on http://localhost:{args.port}' + (' (mock mode)' if args.mock else ''))
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,11 @@
 import json
 
+import pandas as pd
+
+from fetcher.base import Fetcher
+from fetcher.alpha_vantage_news_fetcher import AlphaVantageNewsFetcher
+from fetcher.alpha_vantage_price_fetcher import AlphaVantagePriceFetcher
+
 
 class DummyResponse:
     """模拟 requests.Response 对象"""
@@ -13,6 +19,11 @@ class DummyResponse:
     def json(self):
         return self._payload
 
+    def iter_content(self, chunk_size=65536):
+        body = json.dumps(self._payload).encode('utf-8')
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
+
 
 class DummySession:
     """模拟 requests.Session，从本地JSON文件返回数据"""
@@ -38,7 +49,7 @@ class DummySession:
             print(f"❌ Error loading news data from {news_file}: {e}")
             self.news_data = {}
     
-    def get(self, url, params=None, timeout=None):
+    def get(self, url, params=None, timeout=None, **kwargs):
         """模拟 requests.get 方法"""
         # 根据参数中的 function 字段决定返回哪种数据
         if params and 'function' in params:
@@ -54,3 +65,41 @@ class DummySession:
         # 如果没有匹配的函数，返回空数据
         print(f"⚠️ Unknown function or missing params: {params}")
         return DummyResponse({})
+
+
+class MockPriceFetcher(Fetcher):
+    """
+    离线价格 Fetcher：通过 DummySession 读取本地 Alpha Vantage 日线 JSON，
+    返回与 YfinanceFetcher 相同的 (company_name, raw) 结构。
+    期间以数据中最后一个交易日为终点，而不是今天。
+    """
+    def _init(self, session: DummySession):
+        self.inner = AlphaVantagePriceFetcher(api_key='mock', session=session)
+
+    def _fetch(self, symbol, period):
+        raw = self.inner.fetch(symbol)
+        series = raw['Time Series (Daily)']
+        last = pd.Timestamp(max(series))
+        start = (last - pd.Timedelta(days=period)).strftime('%Y-%m-%d')
+        recent = {day: bar for day, bar in series.items() if day > start}
+        return symbol, {**raw, 'Time Series (Daily)': recent}
+
+
+class MockNewsFetcher(Fetcher):
+    """
+    离线新闻 Fetcher：通过 DummySession 读取本地 NEWS_SENTIMENT JSON，
+    并按发布日期筛选到请求的区间（本地文件不会按日期过滤）。
+    """
+    SUPPORTS_RANGE = True
+
+    def _init(self, session: DummySession):
+        self.inner = AlphaVantageNewsFetcher(api_key='mock', session=session)
+
+    def _fetch(self, symbol, time_from, time_to):
+        feed = self.inner.fetch(symbol, time_from, time_to)
+        first = time_from.strftime('%Y%m%d')
+        last = time_to.strftime('%Y%m%d')
+        return [item for item in feed if first <= item.get('time_published', '')[:8] <= last]
+
+    def _fetch_range(self, symbol, time_from, time_to):
+        return self._fetch(symbol, time_from, time_to)
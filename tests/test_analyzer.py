@@ -0,0 +1,271 @@
+import json
+import re
+import threading
+import pandas as pd
+
+import app
+import config
+import analyzer.openai as llm
+import analyzer.cache as cache_module
+from analyzer.cache import AnalysisCache
+from config_lang import LANG_CONFIG
+from model.base import ModelClient, ModelResponse
+from tests.test_app import FakeNewsFetcher, PassThroughParser
+
+
+class RecordingClient(ModelClient):
+    """Model client that records every request and answers with `answer_fn`."""
+    requires_api_key = True
+
+    def __init__(self, answer_fn):
+        super().__init__(model='test-model', max_retries=0)
+        self.answer_fn = answer_fn
+        self.calls = []
+
+    def _complete(self, instructions, prompt, timeout, **options):
+        kwargs = dict(instructions=instructions, input=prompt, **options)
+        self.calls.append(kwargs)
+        return ModelResponse(text=self.answer_fn(kwargs))
+
+
+def install_dummy_client(monkeypatch, answer_fn):
+    client = RecordingClient(answer_fn)
+    monkeypatch.setattr(llm, 'get_model_client', lambda: client)
+    monkeypatch.setattr(cache_module, 'get_model_client', lambda: client)
+    monkeypatch.setattr(config, 'OPENAI_API_KEY', 'test-key')
+    return client
+
+
+def make_news(title):
+    return pd.DataFrame([{
+        'title': title,
+        'summary': f'{title} summary',
+        'time_published': '2025-06-03T12:00:00Z',
+    }])
+
+
+def make_signals(n):
+    dates = pd.date_range('2025-06-02', periods=n, freq='D')
+    return [(make_news(f'Headline {i}'), d, 6.0 if i % 2 == 0 else -6.0) for i, d in enumerate(dates)]
+
+
+def answer_all_dates(kwargs):
+    keys = re.findall(r'^### (\d{4}-\d{2}-\d{2})', kwargs['input'], flags=re.M)
+    return json.dumps({k: f'analysis {k}' for k in keys})
+
+
+# Tests for plan_batches
+
+def test_plan_batches_respects_batch_size():
+    blocks = ['x' * 40] * 5
+    assert llm.plan_batches(blocks, batch_size=2, max_tokens=10_000) == [[0, 1], [2, 3], [4]]
+
+
+def test_plan_batches_respects_token_ceiling():
+    blocks = ['x' * 400, 'x' * 400, 'x' * 4000, 'x' * 40]
+    # Each 400-char block is ~101 tokens, the 4000-char block exceeds the ceiling alone
+    assert llm.plan_batches(blocks, batch_size=10, max_tokens=250) == [[0, 1], [2], [3]]
+
+
+# Tests for analyze_news_batch_with_openai
+
+def test_batch_analyzer_packs_signals_into_one_request(monkeypatch):
+    client = install_dummy_client(monkeypatch, answer_all_dates)
+    signals = make_signals(4)
+
+    results = llm.analyze_news_batch_with_openai(signals, 'TSLA', 'en', batch_size=4, max_tokens=100_000)
+
+    assert len(client.calls) == 1
+    assert client.calls[0]['text'] == {'format': {'type': 'json_object'}}
+    for _, signal_date, _ in signals:
+        assert results[signal_date] == f"analysis {signal_date.strftime('%Y-%m-%d')}"
+
+
+def test_batch_analyzer_falls_back_for_missing_dates(monkeypatch):
+    def answer(kwargs):
+        if 'text' in kwargs:
+            return json.dumps({'2025-06-02': 'batched'})
+        return 'single'
+
+    client = install_dummy_client(monkeypatch, answer)
+    signals = make_signals(2)
+
+    results = llm.analyze_news_batch_with_openai(signals, 'TSLA', 'en', batch_size=2, max_tokens=100_000)
+
+    assert results[signals[0][1]] == 'batched'
+    assert results[signals[1][1]] == 'single'
+    assert len(client.calls) == 2
+
+
+def test_batch_analyzer_skips_dates_without_news(monkeypatch):
+    client = install_dummy_client(monkeypatch, answer_all_dates)
+    signal_date = pd.Timestamp('2025-06-02')
+
+    results = llm.analyze_news_batch_with_openai([(pd.DataFrame(), signal_date, 5.0)], 'TSLA', 'en')
+
+    assert results[signal_date] == llm.LANG_CONFIG['en']['no_news']
+    assert client.calls == []
+
+
+# Tests for AnalysisCache
+
+def test_analysis_cache_round_trip(monkeypatch, tmp_path):
+    install_dummy_client(monkeypatch, lambda kwargs: '')
+    cache = AnalysisCache(path=str(tmp_path / 'cache.sqlite'), max_entries=10)
+    key = cache.make_key('TSLA', pd.Timestamp('2025-06-02'), make_news('Headline'), 'en')
+
+    assert cache.get(key) is None
+    cache.set(key, 'analysis')
+    assert cache.get(key) == 'analysis'
+
+    # Persists across instances
+    cache.close()
+    assert AnalysisCache(path=str(tmp_path / 'cache.sqlite')).get(key) == 'analysis'
+
+
+def test_analysis_cache_key_depends_on_inputs(monkeypatch):
+    install_dummy_client(monkeypatch, lambda kwargs: '')
+    date = pd.Timestamp('2025-06-02')
+    news = make_news('Headline')
+    key = AnalysisCache.make_key('TSLA', date, news, 'en')
+
+    assert key == AnalysisCache.make_key('tsla', date, news.copy(), 'en')
+    assert key != AnalysisCache.make_key('TSLA', date, make_news('Other'), 'en')
+    assert key != AnalysisCache.make_key('TSLA', date, news, 'zh')
+    assert key != AnalysisCache.make_key('TSLA', date, news, 'en', model='other-model')
+    assert key != AnalysisCache.make_key('TSLA', date, news, 'en', prompt_version=999)
+
+
+def test_analysis_cache_evicts_least_recently_used(tmp_path):
+    cache = AnalysisCache(path=str(tmp_path / 'cache.sqlite'), max_entries=2)
+    cache.set('a', '1')
+    cache.set('b', '2')
+    cache.get('a')
+    cache.set('c', '3')
+
+    assert len(cache) == 2
+    assert cache.get('a') == '1'
+    assert cache.get('b') is None
+    assert cache.get('c') == '3'
+
+
+def test_analyze_signal_uses_cache(monkeypatch, tmp_path):
+    client = install_dummy_client(monkeypatch, lambda kwargs: 'fresh analysis')
+    cache = AnalysisCache(path=str(tmp_path / 'cache.sqlite'))
+    fetcher = FakeNewsFetcher()
+    signal_date = pd.Timestamp('2025-06-02')
+
+    first = app.analyze_signal('TSLA', 'Tesla', signal_date, 6.0, 'en', fetcher, PassThroughParser(), cache)
+    second = app.analyze_signal('TSLA', 'Tesla', signal_date, 6.0, 'en', fetcher, PassThroughParser(), cache)
+
+    assert first[1] == second[1] == 'fresh analysis'
+    assert len(client.calls) == 1
+
+
+def test_error_results_are_not_cached(monkeypatch, tmp_path):
+    def fail(kwargs):
+        raise RuntimeError('boom')
+
+    install_dummy_client(monkeypatch, fail)
+    cache = AnalysisCache(path=str(tmp_path / 'cache.sqlite'))
+    signal_date = pd.Timestamp('2025-06-02')
+
+    _, analysis = app.analyze_signal('TSLA', 'Tesla', signal_date, 6.0, 'en',
+                                     FakeNewsFetcher(), PassThroughParser(), cache)
+
+    assert not llm.is_final_analysis(analysis, 'en')
+    assert len(cache) == 0
+
+
+# Tests for streamed analysis
+
+class BrokenStreamClient(RecordingClient):
+    """Streams two pieces of the answer, then fails."""
+
+    def _stream(self, instructions, prompt, timeout, **options):
+        yield 'Partial '
+        yield 'answer'
+        raise RuntimeError('connection reset')
+
+
+def test_streamed_analysis_passes_pieces_to_callback(monkeypatch):
+    install_dummy_client(monkeypatch, lambda kwargs: 'streamed analysis')
+    pieces = []
+
+    result = llm.analyze_news_with_openai(
+        make_news('Headline'), pd.Timestamp('2025-06-02'), 6.0, 'TSLA', 'en', on_token=pieces.append
+    )
+
+    assert result == ''.join(pieces) == 'streamed analysis'
+
+
+def test_broken_stream_returns_error_and_is_not_cached(monkeypatch, tmp_path):
+    client = BrokenStreamClient(lambda kwargs: '')
+    monkeypatch.setattr(llm, 'get_model_client', lambda: client)
+    monkeypatch.setattr(cache_module, 'get_model_client', lambda: client)
+    monkeypatch.setattr(config, 'OPENAI_API_KEY', 'test-key')
+    cache = AnalysisCache(path=str(tmp_path / 'cache.sqlite'))
+    pieces = []
+
+    _, analysis = app.analyze_signal('TSLA', 'Tesla', pd.Timestamp('2025-06-02'), 6.0, 'en',
+                                     FakeNewsFetcher(), PassThroughParser(), cache, on_token=pieces.append)
+
+    assert pieces[:2] == ['Partial ', 'answer']
+    assert pieces[2].strip() == analysis
+    assert not llm.is_final_analysis(analysis, 'en')
+    assert len(cache) == 0
+
+
+# Tests for the analysis deadline
+
+class StalledStreamClient(RecordingClient):
+    """Streams `sent` and then stalls past any deadline."""
+
+    def __init__(self, sent):
+        super().__init__(lambda kwargs: '')
+        self.sent = sent
+        self.deadline = 0.2
+
+    def _stream(self, instructions, prompt, timeout, **options):
+        yield from self.sent
+        threading.Event().wait(5)
+        return ModelResponse(text='never')
+
+
+def test_deadline_returns_partial_analysis_that_is_not_final(monkeypatch):
+    client = StalledStreamClient(['Partial ', 'answer'])
+    monkeypatch.setattr(llm, 'get_model_client', lambda: client)
+    monkeypatch.setattr(config, 'OPENAI_API_KEY', 'test-key')
+    pieces = []
+
+    analysis = llm.analyze_news_with_openai(
+        make_news('Headline'), pd.Timestamp('2025-06-02'), 6.0, 'TSLA', 'en', on_token=pieces.append
+    )
+
+    notice = LANG_CONFIG['en']['partial_notice']
+    assert analysis == f'Partial answer\n\n{notice}'
+    assert ''.join(pieces) == analysis
+    assert llm.is_incomplete_analysis(analysis, 'en')
+    assert not llm.is_final_analysis(analysis, 'en')
+
+
+def test_deadline_without_any_text_returns_error(monkeypatch):
+    client = StalledStreamClient([])
+    monkeypatch.setattr(llm, 'get_model_client', lambda: client)
+    monkeypatch.setattr(config, 'OPENAI_API_KEY', 'test-key')
+
+    analysis = llm.analyze_news_with_openai(make_news('Headline'), pd.Timestamp('2025-06-02'), 6.0, 'TSLA', 'en')
+
+    assert analysis.startswith(LANG_CONFIG['en']['error_prefix'])
+
+
+def test_batch_past_deadline_fails_for_every_date(monkeypatch):
+    client = StalledStreamClient(['{"2025-06-02": "cut'])
+    monkeypatch.setattr(llm, 'get_model_client', lambda: client)
+    monkeypatch.setattr(config, 'OPENAI_API_KEY', 'test-key')
+    signals = make_signals(2)
+
+    results = llm.analyze_news_batch_with_openai(signals, 'TSLA', 'en', batch_size=2, max_tokens=100_000)
+
+    assert set(results) == {d for _, d, _ in signals}
+    assert all(r.startswith(LANG_CONFIG['en']['error_prefix']) for r in results.values())
@@ -0,0 +1,320 @@
+import time
+import pandas as pd
+
+import app
+from analyzer.news_index import NewsIndex
+from fetcher.base import Fetcher, RangeResult
+from fetcher.rate_limit import PRIORITY_BACKGROUND, _request_priority, request_priority
+from parser.base import Parser
+from parser.yfinance_panel_parser import YFinancePanelParser
+
+
+class FakePriceFetcher(Fetcher):
+    def _init(self, df_prices):
+        self.df_prices = df_prices
+
+    def _fetch(self, symbol, period):
+        return symbol, self.df_prices.copy()
+
+
+class FakeNewsFetcher(Fetcher):
+    def _init(self):
+        self.calls = []
+
+    def _fetch(self, company_name, time_from, time_to):
+        self.calls.append(time_from)
+        return [{'title': f'News {time_from.date()}', 'summary': 'summary',
+                 'time_published': str(time_from)}]
+
+
+class PassThroughParser(Parser):
+    def _parse(self, raw_data):
+        return raw_data if isinstance(raw_data, pd.DataFrame) else pd.DataFrame(raw_data)
+
+
+class RecordingRenderer:
+    def __init__(self):
+        self.rendered = []
+
+    def render_price_chart(self, df_prices, signal_dates, lang):
+        return bool(signal_dates)
+
+    def render_analysis_header(self, lang):
+        pass
+
+    def show_analysis_progress_info(self, total_signals, lang, estimated_seconds=None):
+        pass
+
+    def render_single_llm_analysis(self, signal_date, llm_analysis, pct_change, lang, df_news=None):
+        self.rendered.append((signal_date, llm_analysis))
+
+    def add_separator(self):
+        pass
+
+
+def make_prices():
+    """Five closes alternating +/-10% so every date after the first is a signal."""
+    index = pd.date_range('2025-06-02', periods=5, freq='D')
+    return pd.DataFrame({'close': [100.0, 110.0, 99.0, 108.9, 98.01]}, index=index)
+
+
+def run_app(monkeypatch, delays, max_workers):
+    def fake_analyze(df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None):
+        time.sleep(delays[signal_date])
+        return f'{symbol} {signal_date.date()}'
+
+    monkeypatch.setattr(app, 'analyze_news_with_openai', fake_analyze)
+    render = RecordingRenderer()
+    app.run('TSLA', 30, 5.0, 'en', FakeNewsFetcher(), FakePriceFetcher(make_prices()),
+            PassThroughParser(), PassThroughParser(), render, max_workers=max_workers)
+    return render
+
+
+def test_run_renders_results_in_signal_date_order(monkeypatch):
+    signal_dates = make_prices().index[1:]
+    # Later dates finish first
+    delays = {d: 0.05 * (len(signal_dates) - i) for i, d in enumerate(signal_dates)}
+
+    render = run_app(monkeypatch, delays, max_workers=4)
+
+    assert [d for d, _ in render.rendered] == list(signal_dates)
+    assert render.rendered[0][1] == f'TSLA {signal_dates[0].date()}'
+
+
+def test_run_concurrent_latency_close_to_slowest_signal(monkeypatch):
+    signal_dates = make_prices().index[1:]
+    delays = {d: 0.2 for d in signal_dates}
+
+    start = time.perf_counter()
+    render = run_app(monkeypatch, delays, max_workers=4)
+    elapsed = time.perf_counter() - start
+
+    assert len(render.rendered) == 4
+    assert elapsed < 0.2 * len(signal_dates) / 2
+
+
+def test_run_sequential_with_single_worker(monkeypatch):
+    signal_dates = make_prices().index[1:]
+    delays = {d: 0.05 for d in signal_dates}
+
+    start = time.perf_counter()
+    render = run_app(monkeypatch, delays, max_workers=1)
+    elapsed = time.perf_counter() - start
+
+    assert [d for d, _ in render.rendered] == list(signal_dates)
+    assert elapsed >= 0.05 * len(signal_dates)
+
+
+def test_run_workers_keep_the_callers_request_priority(monkeypatch):
+    priorities = []
+
+    def fake_analyze(df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None):
+        priorities.append(_request_priority.get())
+        return 'analysis'
+    monkeypatch.setattr(app, 'analyze_news_with_openai', fake_analyze)
+
+    with request_priority(PRIORITY_BACKGROUND):
+        app.run('TSLA', 30, 5.0, 'en', FakeNewsFetcher(), FakePriceFetcher(make_prices()),
+                PassThroughParser(), PassThroughParser(), RecordingRenderer(), max_workers=4)
+
+    assert priorities and set(priorities) == {PRIORITY_BACKGROUND}
+
+
+class StreamingRenderer(RecordingRenderer):
+    def __init__(self):
+        super().__init__()
+        self.streamed = []
+
+    def render_llm_analysis_stream(self, signal_date, tokens, pct_change, lang):
+        pieces = list(tokens)
+        self.streamed.append((signal_date, pieces))
+        return ''.join(pieces)
+
+
+def test_run_streams_analyses_in_signal_date_order(monkeypatch):
+    signal_dates = make_prices().index[1:]
+
+    def fake_analyze(df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None):
+        # Later dates finish first
+        time.sleep(0.02 * (len(signal_dates) - list(signal_dates).index(signal_date)))
+        pieces = [symbol, ' ', str(signal_date.date())]
+        for piece in pieces:
+            on_token(piece)
+        return ''.join(pieces)
+
+    monkeypatch.setattr(app, 'analyze_news_with_openai', fake_analyze)
+    render = StreamingRenderer()
+    association = app.run('TSLA', 30, 5.0, 'en', FakeNewsFetcher(), FakePriceFetcher(make_prices()),
+                          PassThroughParser(), PassThroughParser(), render, max_workers=4, stream=True)
+
+    assert [d for d, _ in render.streamed] == list(signal_dates)
+    assert render.streamed[0][1] == ['TSLA', ' ', str(signal_dates[0].date())]
+    # Streamed results are not rendered a second time
+    assert render.rendered == []
+    assert association[signal_dates[0]]['llm_analysis'] == f'TSLA {signal_dates[0].date()}'
+
+
+def test_run_does_not_stream_batched_requests(monkeypatch):
+    monkeypatch.setattr(app, 'analyze_news_batch_with_openai',
+                        lambda signals, symbol, lang, batch_size, model_client=None: {d: 'batched' for _, d, _ in signals})
+    render = StreamingRenderer()
+
+    app.run('TSLA', 30, 5.0, 'en', FakeNewsFetcher(), FakePriceFetcher(make_prices()),
+            PassThroughParser(), PassThroughParser(), render, batch_size=2, stream=True)
+
+    assert render.streamed == []
+    assert len(render.rendered) == 4
+
+
+class FakeRangeNewsFetcher(FakeNewsFetcher):
+    SUPPORTS_RANGE = True
+
+    def _init(self):
+        super()._init()
+        self.range_calls = []
+
+    def _fetch_range(self, company_name, time_from, time_to):
+        self.range_calls.append((time_from, time_to))
+        days = pd.date_range(time_from, time_to, freq='D')
+        return [{'title': f'News {d.date()}', 'summary': 'summary',
+                 'time_published': f'{d.date()}T15:30:00Z'} for d in days]
+
+
+def test_news_index_groups_by_publication_date():
+    df_news = pd.DataFrame([
+        {'title': 'a', 'time_published': '2025-06-02T09:00:00Z'},
+        {'title': 'b', 'time_published': '2025-06-02T23:00:00Z'},
+        {'title': 'c', 'time_published': '2025-06-03T01:00:00Z'},
+    ])
+    index = NewsIndex(df_news)
+
+    assert list(index.for_date(pd.Timestamp('2025-06-02'))['title']) == ['a', 'b']
+    assert list(index.for_date(pd.Timestamp('2025-06-03 16:00', tz='America/New_York'))['title']) == ['c']
+    assert index.for_date(pd.Timestamp('2025-06-04')).empty
+
+
+def test_run_fetches_news_once_for_whole_window(monkeypatch):
+    monkeypatch.setattr(app, 'analyze_news_with_openai',
+                        lambda df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None: df_news['title'].iloc[0])
+    news_fetcher = FakeRangeNewsFetcher()
+    render = RecordingRenderer()
+
+    app.run('TSLA', 30, 5.0, 'en', news_fetcher, FakePriceFetcher(make_prices()),
+            PassThroughParser(), PassThroughParser(), render, range_fetch=True)
+
+    signal_dates = make_prices().index[1:]
+    assert news_fetcher.range_calls == [(signal_dates[0], signal_dates[-1])]
+    assert news_fetcher.calls == []
+    assert render.rendered == [(d, f'News {d.date()}') for d in signal_dates]
+
+
+class FakeBulkFetcher(Fetcher):
+    def _init(self, panel):
+        self.panel = panel
+        self.calls = []
+
+    def _fetch(self, symbols, period):
+        self.calls.append(list(symbols))
+        return self.panel
+
+
+def test_scan_watchlist_detects_moves_per_symbol():
+    index = pd.date_range('2025-06-02', periods=3, freq='D')
+    columns = pd.MultiIndex.from_product([['Close'], ['AAPL', 'TSLA']], names=['Price', 'Ticker'])
+    panel = pd.DataFrame([[100.0, 300.0], [101.0, 330.0], [102.0, 331.0]], index=index, columns=columns)
+    fetcher = FakeBulkFetcher(panel)
+
+    signals = app.scan_watchlist(['AAPL', 'TSLA'], 30, 5.0, fetcher, YFinancePanelParser())
+
+    assert fetcher.calls == [['AAPL', 'TSLA']]
+    assert signals == {'TSLA': [index[1]]}
+
+
+class SparseRangeNewsFetcher(FakeRangeNewsFetcher):
+    """Range results crowded onto the first day, optionally cut short."""
+
+    def _init(self, complete=True):
+        super()._init()
+        self.complete = complete
+
+    def _fetch_range(self, company_name, time_from, time_to):
+        self.range_calls.append((time_from, time_to))
+        return RangeResult([{'title': f'News {time_from.date()}', 'summary': 'summary',
+                             'time_published': f'{time_from.date()}T15:30:00Z'}], complete=self.complete)
+
+
+def test_run_fetches_dates_missing_from_range_result(monkeypatch):
+    monkeypatch.setattr(app, 'analyze_news_with_openai',
+                        lambda df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None: df_news['title'].iloc[0])
+    news_fetcher = SparseRangeNewsFetcher()
+    render = RecordingRenderer()
+
+    app.run('TSLA', 30, 5.0, 'en', news_fetcher, FakePriceFetcher(make_prices()),
+            PassThroughParser(), PassThroughParser(), render, range_fetch=True)
+
+    signal_dates = make_prices().index[1:]
+    assert news_fetcher.calls == list(signal_dates[1:])
+    assert render.rendered == [(d, f'News {d.date()}') for d in signal_dates]
+
+
+class TruncatedRangeNewsFetcher(FakeRangeNewsFetcher):
+    """Range results cut short by a limit, whole from the second day on."""
+
+    def _fetch_range(self, company_name, time_from, time_to):
+        articles = super()._fetch_range(company_name, time_from, time_to)
+        return RangeResult(articles, complete=False, covered_from=(time_from + pd.Timedelta(days=1)).date())
+
+
+def test_run_only_fetches_dates_a_truncated_range_result_may_lack(monkeypatch):
+    monkeypatch.setattr(app, 'analyze_news_with_openai',
+                        lambda df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None: df_news['title'].iloc[0])
+    news_fetcher = TruncatedRangeNewsFetcher()
+    render = RecordingRenderer()
+
+    app.run('TSLA', 30, 5.0, 'en', news_fetcher, FakePriceFetcher(make_prices()),
+            PassThroughParser(), PassThroughParser(), render, range_fetch=True)
+
+    signal_dates = make_prices().index[1:]
+    assert news_fetcher.calls == [signal_dates[0]]
+    assert render.rendered == [(d, f'News {d.date()}') for d in signal_dates]
+
+
+def test_run_ignores_truncated_range_result(monkeypatch):
+    monkeypatch.setattr(app, 'analyze_news_with_openai',
+                        lambda df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None: df_news['title'].iloc[0])
+    news_fetcher = SparseRangeNewsFetcher(complete=False)
+
+    app.run('TSLA', 30, 5.0, 'en', news_fetcher, FakePriceFetcher(make_prices()),
+            PassThroughParser(), PassThroughParser(), RecordingRenderer(), range_fetch=True)
+
+    assert news_fetcher.calls == list(make_prices().index[1:])
+
+
+class StreamingNewsFetcher(FakeNewsFetcher):
+    SUPPORTS_STREAM = True
+
+    def _init(self):
+        super()._init()
+        self.stream_calls = []
+
+    def _fetch_stream(self, company_name, time_from, time_to):
+        self.stream_calls.append(time_from)
+        yield {'title': f'News {time_from.date()}', 'summary': 'summary', 'time_published': str(time_from)}
+
+
+class StreamingParser(PassThroughParser):
+    def parse_stream(self, items):
+        yield self.parse(list(items))
+
+
+def test_load_signal_news_streams_when_fetcher_and_parser_can():
+    signal_date = pd.Timestamp('2025-06-03')
+    news_fetcher = StreamingNewsFetcher()
+
+    df_news = app.load_signal_news('Tesla', signal_date, news_fetcher, StreamingParser())
+    # A parser that cannot consume a stream gets the fetched list
+    app.load_signal_news('Tesla', signal_date, news_fetcher, PassThroughParser())
+
+    assert list(df_news['title']) == ['News 2025-06-03']
+    assert news_fetcher.stream_calls == [signal_date]
+    assert news_fetcher.calls == [signal_date]
@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from benchmarks import recorded
+from benchmarks import run as bench
+from benchmarks import synthetic
+from benchmarks.compare import compare
+from parser.alpha_vantage_news_parser import AlphaVantageNewsParser
+from parser.alpha_vantage_price_parser import AlphaVantagePriceParser
+
+
+def test_synthetic_data_matches_provider_shapes():
+    prices = AlphaVantagePriceParser().parse(synthetic.make_alpha_vantage_daily(30))
+    news = AlphaVantageNewsParser(target_ticker='TSLA', min_relevance=0.0).parse(synthetic.make_alpha_vantage_feed(30))
+
+    assert len(prices) == 30 and (prices['high'] >= prices['low']).all()
+    # Every third item only mentions other tickers
+    assert len(news) == 20
+    assert synthetic.make_newsapi_articles(5, seed=1) == synthetic.make_newsapi_articles(5, seed=1)
+
+
+def test_suite_reports_every_stage(monkeypatch):
+    tiny = {'bars': 60, 'symbols': 3, 'panel_bars': 40, 'articles': 50, 'prompt_articles': 3}
+    monkeypatch.setitem(bench.SCALES, 'tiny', tiny)
+
+    report = bench.run_suite('tiny', repeat=1)
+
+    assert set(report['results']) == set(bench.BENCHMARKS)
+    for result in report['results'].values():
+        assert 0 <= result['min'] <= result['median']
+
+
+def test_recorded_data_replays_test_fixtures(monkeypatch):
+    tiny = {'bars': 60, 'symbols': 3, 'panel_bars': 40, 'articles': 5000, 'prompt_articles': 3}
+    monkeypatch.setitem(bench.SCALES, 'tiny', tiny)
+
+    report = bench.run_suite('tiny', repeat=1, only='parse.', data='recorded')
+
+    assert report['data'] == 'recorded'
+    assert report['results']['parse.alpha_vantage_price']['params'] == {'bars': 60}
+    # More articles than recorded: the whole recording is used
+    assert report['results']['parse.alpha_vantage_news']['params'] == {'articles': 685}
+    prices = recorded.make_yfinance_history(60)
+    assert len(prices) == 60 and prices.index.is_monotonic_increasing
+    assert prices.index[-1] == pd.Timestamp('2025-06-25', tz='America/New_York')
+
+
+def test_compare_flags_slower_medians():
+    def report(commit, **medians):
+        return {'commit': commit, 'results': {
+            name: {'params': {}, 'median': median} for name, median in medians.items()
+        }}
+
+    rows = compare(report('a', parse=1.0, detect=1.0), report('b', parse=1.05, detect=1.5), tolerance=0.1)
+
+    assert [(name, regressed) for name, *_, regressed in rows] == [('parse', False), ('detect', True)]
+
+
+def test_compare_rejects_reports_of_different_data():
+    with pytest.raises(ValueError):
+        compare({'data': 'synthetic', 'results': {}}, {'data': 'recorded', 'results': {}})
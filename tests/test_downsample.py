@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+import config_ui
+from ui.downsample import downsample, lttb_indices
+from ui.streamlit_renderer import build_price_figure
+
+
+def make_prices(n):
+    index = pd.bdate_range('2015-01-02', periods=n)
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, n))
+    df = pd.DataFrame({'close': close}, index=index)
+    df['pct_change'] = df['close'].pct_change() * 100
+    return df
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    y = np.zeros(1000)
+    y[400], y[700] = 50.0, -50.0
+
+    kept = lttb_indices(y, 20)
+
+    assert len(kept) == 20
+    assert kept[0] == 0 and kept[-1] == 999
+    assert 400 in kept and 700 in kept
+    assert (np.diff(kept) > 0).all()
+
+
+def test_lttb_returns_everything_for_short_series():
+    assert lttb_indices(np.arange(5.0), 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_downsample_always_keeps_required_labels():
+    df = make_prices(5000)
+    signals = list(df.index[[17, 2500, 4321]])
+
+    result = downsample(df, 'close', 300, keep=signals)
+
+    assert 300 <= len(result) <= 303
+    assert all(d in result.index for d in signals)
+    assert result.index.is_monotonic_increasing
+
+
+def test_price_figure_uses_one_signal_trace():
+    df = make_prices(30)
+    signals = list(df.index[[5, 10, 20]])
+
+    fig = build_price_figure(df, signals, 'zh')
+
+    assert [trace.type for trace in fig.data] == ['scatter', 'scatter']
+    markers = fig.data[1]
+    assert len(markers.x) == 3
+    assert markers.customdata[1][0] == df.index[10].strftime('%Y年%m月%d日')
+    assert markers.customdata[1][1] == df['pct_change'].iloc[10]
+
+
+def test_long_price_figure_is_webgl_and_downsampled():
+    df = make_prices(252 * 10)
+    signals = list(df.index[::100])
+
+    fig = build_price_figure(df, signals, 'en')
+
+    line, markers = fig.data
+    assert line.type == markers.type == 'scattergl'
+    assert len(line.x) <= config_ui.CHART_MAX_POINTS + len(signals)
+    assert set(pd.DatetimeIndex(markers.x)) <= set(pd.DatetimeIndex(line.x))
@@ -1,6 +1,10 @@
+import datetime
+import json
 import pytest
+import pandas as pd
 from fetcher.alpha_vantage_news_fetcher import AlphaVantageNewsFetcher
 from fetcher.alpha_vantage_price_fetcher import AlphaVantagePriceFetcher
+from fetcher.newsapi_news_fetcher import NewsAPIFetcher
 
 class DummyResponse:
     def __init__(self, payload):
@@ -9,11 +13,15 @@ class DummyResponse:
         pass
     def json(self):
         return self._payload
+    def iter_content(self, chunk_size):
+        body = json.dumps(self._payload).encode('utf-8')
+        for start in range(0, len(body), chunk_size):
+            yield body[start:start + chunk_size]
 
 class DummySession:
     def __init__(self, response):
         self._response = response
-    def get(self, url, params=None, timeout=None):
+    def get(self, url, params=None, timeout=None, **kwargs):
         return self._response
 
 # Tests for AlphaVantageNewsFetcher
@@ -37,6 +45,24 @@ def test_news_fetcher_raises_on_missing_feed():
         fetcher.fetch(symbol='TSLA')
     assert 'Unexpected API response' in str(exc.value)
 
+def test_news_fetcher_streams_feed_items():
+    feed = [{'title': f'News {i}', 'ticker_sentiment': []} for i in range(50)]
+    session = DummySession(DummyResponse({'items': '50', 'feed': feed}))
+    fetcher = AlphaVantageNewsFetcher(api_key='testkey', session=session)
+
+    items = fetcher.fetch_stream('TSLA', pd.Timestamp('2025-06-01'), pd.Timestamp('2025-06-30'), chunk_size=64)
+
+    assert next(items) == feed[0]
+    assert list(items) == feed[1:]
+
+def test_news_fetcher_stream_raises_on_missing_feed():
+    session = DummySession(DummyResponse({'Information': 'rate limit'}))
+    fetcher = AlphaVantageNewsFetcher(api_key='testkey', session=session)
+    items = fetcher.fetch_stream('TSLA', pd.Timestamp('2025-06-01'), pd.Timestamp('2025-06-30'))
+    with pytest.raises(RuntimeError) as exc:
+        list(items)
+    assert 'Unexpected API response' in str(exc.value)
+
 # Tests for AlphaVantagePriceFetcher
 
 def test_price_fetcher_returns_json_when_key_present():
@@ -59,3 +85,187 @@ def test_price_fetcher_raises_on_missing_timeseries():
     with pytest.raises(RuntimeError) as exc:
         fetcher.fetch(symbol='TSLA')
     assert 'Unexpected API response' in str(exc.value)
+
+# Tests for NewsAPIFetcher range fetch
+
+class PagedSession:
+    """Serves `articles` in pages of params['pageSize'] and records each request."""
+    def __init__(self, articles):
+        self.articles = articles
+        self.requests = []
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.requests.append(params)
+        size, page = params['pageSize'], params['page']
+        batch = self.articles[(page - 1) * size:page * size]
+        return DummyResponse({'status': 'ok', 'totalResults': len(self.articles), 'articles': batch})
+
+def make_articles(n):
+    return [{'title': f'News {i}', 'publishedAt': '2025-06-02T12:00:00Z'} for i in range(n)]
+
+def test_newsapi_range_fetch_uses_one_query_for_whole_window():
+    session = PagedSession(make_articles(30))
+    fetcher = NewsAPIFetcher(api_key='testkey', session=session)
+
+    result = fetcher.fetch_range('Tesla', pd.Timestamp('2025-06-02'), pd.Timestamp('2025-06-30'))
+
+    assert len(result) == 30
+    assert result.complete
+    assert len(session.requests) == 1
+    assert session.requests[0]['from'] == '2025-06-02T00:00:00'
+    assert session.requests[0]['to'] == '2025-06-30T23:59:59'
+
+def test_newsapi_range_fetch_paginates_up_to_max_pages():
+    session = PagedSession(make_articles(250))
+    fetcher = NewsAPIFetcher(api_key='testkey', session=session, max_pages=2)
+
+    result = fetcher.fetch_range('Tesla', pd.Timestamp('2025-06-02'), pd.Timestamp('2025-06-30'))
+
+    assert len(result) == 200
+    assert not result.complete
+    assert [p['page'] for p in session.requests] == [1, 2]
+    assert session.requests[0]['sortBy'] == 'publishedAt'
+
+def test_newsapi_truncated_range_fetch_reports_covered_dates():
+    # Newest first, two articles per day from 2025-06-30 back
+    days = pd.date_range(end='2025-06-30', periods=125, freq='D')[::-1]
+    articles = [{'title': f'News {i}', 'publishedAt': f'{day.date()}T{h}:00:00Z'}
+                for i, (day, h) in enumerate((d, h) for d in days for h in (18, 9))]
+    fetcher = NewsAPIFetcher(api_key='testkey', session=PagedSession(articles), max_pages=1)
+
+    result = fetcher.fetch_range('Tesla', pd.Timestamp('2025-02-26'), pd.Timestamp('2025-06-30'))
+
+    # The page ends on 2025-05-12, which may have more articles
+    assert not result.complete
+    assert result.covered_from == datetime.date(2025, 5, 13)
+
+# Tests for YfinanceFetcher
+
+from fetcher.symbol_metadata import SymbolMetadata
+from fetcher.yfinance_price_fetcher import YfinanceFetcher, split_range
+
+
+class FakeTicker:
+    """yf.Ticker stand-in serving hourly bars of any range, recording each request."""
+    requests = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, start, end, interval):
+        FakeTicker.requests.append((start, end, interval))
+        index = pd.date_range(start, end, freq='h', inclusive='left', name='Datetime')
+        return pd.DataFrame({'Close': range(len(index))}, index=index)
+
+
+class StaticMetadata:
+    def cached(self, symbol):
+        return SymbolMetadata(symbol=symbol, name='Tesla, Inc.', exchange=None, currency=None)
+
+def make_yfinance_fetcher(monkeypatch):
+    import yfinance
+    FakeTicker.requests = []
+    monkeypatch.setattr(yfinance, 'Ticker', FakeTicker)
+    return YfinanceFetcher(metadata_cache=StaticMetadata())
+
+def test_split_range_covers_range_without_overlap():
+    windows = split_range(pd.Timestamp('2025-01-01'), pd.Timestamp('2025-01-20'), pd.Timedelta(days=7))
+
+    assert windows[0][0] == pd.Timestamp('2025-01-01')
+    assert windows[-1][1] == pd.Timestamp('2025-01-20')
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    assert len(windows) == 3
+
+def test_yfinance_fetcher_requests_exact_range(monkeypatch):
+    fetcher = make_yfinance_fetcher(monkeypatch)
+
+    name, bars = fetcher.fetch('TSLA', start='2025-06-02', end='2025-06-04', interval='1h')
+
+    assert name == 'Tesla, Inc.'
+    assert FakeTicker.requests == [(pd.Timestamp('2025-06-02'), pd.Timestamp('2025-06-04'), '1h')]
+    assert len(bars) == 48
+
+def test_yfinance_fetcher_downloads_long_ranges_in_chunks(monkeypatch):
+    fetcher = make_yfinance_fetcher(monkeypatch)
+
+    _, bars = fetcher.fetch('TSLA', start='2025-01-01', end='2025-01-30', interval='1m')
+
+    assert len(FakeTicker.requests) == 5
+    assert bars.index.is_monotonic_increasing and bars.index.is_unique
+    assert bars.index[0] == pd.Timestamp('2025-01-01') and len(bars) == 29 * 24
+
+def test_yfinance_fetcher_period_is_calendar_days(monkeypatch):
+    fetcher = make_yfinance_fetcher(monkeypatch)
+
+    fetcher.fetch('TSLA', 30)
+
+    start, end, interval = FakeTicker.requests[0]
+    assert end - start >= pd.Timedelta(days=30) and end - start <= pd.Timedelta(days=31)
+    assert interval == '1d'
+
+def test_yfinance_fetcher_short_period_counts_bars(monkeypatch):
+    fetcher = make_yfinance_fetcher(monkeypatch)
+
+    _, bars = fetcher.fetch('TSLA', 7)
+
+    start, end, _ = FakeTicker.requests[0]
+    assert end - start >= pd.Timedelta(days=30)
+    assert len(bars) == 7 and bars.index[-1] == end - pd.Timedelta(hours=1)
+
+def test_yfinance_fetcher_accepts_mixed_timezone_bounds(monkeypatch):
+    fetcher = make_yfinance_fetcher(monkeypatch)
+
+    fetcher.fetch_history('TSLA', '2025-06-02', pd.Timestamp('2025-06-04', tz='America/New_York'), interval='1h')
+
+    start, end, _ = FakeTicker.requests[0]
+    assert start == pd.Timestamp('2025-06-02', tz='America/New_York')
+    assert end == pd.Timestamp('2025-06-04', tz='America/New_York')
+
+def test_yfinance_fetcher_rejects_unknown_interval(monkeypatch):
+    fetcher = make_yfinance_fetcher(monkeypatch)
+    with pytest.raises(ValueError):
+        fetcher.fetch('TSLA', start='2025-06-02', interval='3h')
+
+# Tests for YfinanceBulkFetcher
+
+from fetcher.yfinance_bulk_price_fetcher import YfinanceBulkFetcher
+
+
+def make_bulk_fetcher(monkeypatch):
+    import yfinance
+    requests = []
+
+    def fake_download(symbols, start, end, interval, **kwargs):
+        requests.append((start, end, interval))
+        index = pd.date_range(start, end, freq='D', inclusive='left', name='Date')
+        columns = pd.MultiIndex.from_product([['Close'], symbols], names=['Price', 'Ticker'])
+        return pd.DataFrame(1.0, index=index, columns=columns)
+    monkeypatch.setattr(yfinance, 'download', fake_download)
+    return YfinanceBulkFetcher(), requests
+
+def test_yfinance_bulk_fetcher_accepts_any_period(monkeypatch):
+    fetcher, requests = make_bulk_fetcher(monkeypatch)
+
+    panel = fetcher.fetch(['tsla', 'AAPL'], 90)
+
+    start, end, interval = requests[0]
+    assert end - start >= pd.Timedelta(days=90) and interval == '1d'
+    assert list(panel.columns.get_level_values(1)) == ['AAPL', 'TSLA']
+
+def test_yfinance_bulk_fetcher_short_period_counts_bars(monkeypatch):
+    fetcher, requests = make_bulk_fetcher(monkeypatch)
+
+    panel = fetcher.fetch(['TSLA'], 5)
+
+    start, end, _ = requests[0]
+    assert end - start >= pd.Timedelta(days=30)
+    assert len(panel) == 5
+
+def test_yfinance_bulk_fetcher_downloads_ranges_in_chunks(monkeypatch):
+    fetcher, requests = make_bulk_fetcher(monkeypatch)
+
+    panel = fetcher.fetch(['TSLA'], start='2025-01-01', end='2025-01-20', interval='1m')
+
+    assert [interval for _, _, interval in requests] == ['1m'] * 3
+    assert panel.index.is_unique and len(panel) == 19
+    with pytest.raises(ValueError):
+        fetcher.fetch(['TSLA'], start='2025-01-01', interval='3h')
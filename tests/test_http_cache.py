@@ -0,0 +1,246 @@
+import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+
+from fetcher.http_cache import (
+    CacheEntry,
+    CachedSession,
+    FileSystemCacheBackend,
+    SQLiteCacheBackend,
+    TTLPolicy,
+    json_validator,
+)
+import config
+from fetcher import rate_limit
+from fetcher.alpha_vantage_news_fetcher import AlphaVantageNewsFetcher
+
+
+@pytest.fixture(params=['sqlite', 'filesystem'])
+def make_backend(request, tmp_path):
+    def factory(**kwargs):
+        if request.param == 'sqlite':
+            return SQLiteCacheBackend(str(tmp_path / 'cache.sqlite'), **kwargs)
+        return FileSystemCacheBackend(str(tmp_path / 'cache'), **kwargs)
+    return factory
+
+
+def test_backend_round_trip_is_compressed(make_backend):
+    backend = make_backend()
+    body = b'{"feed": []}' * 1000
+    backend.set('k', CacheEntry(200, {'Content-Type': 'application/json'}, body, None))
+
+    entry = backend.get('k')
+
+    assert entry.content == body
+    assert entry.headers == {'Content-Type': 'application/json'}
+    assert entry.expires_at is None
+    assert backend.total_bytes() < len(body) // 10
+    assert backend.get('missing') is None
+
+
+def test_backend_evicts_least_recently_used(make_backend):
+    backend = make_backend(max_bytes=2500, compression_level=0)
+    for key in ('a', 'b', 'c'):
+        backend.set(key, CacheEntry(200, {}, key.encode() * 1000, None))
+        time.sleep(0.01)
+    # 'a' was evicted to make room for 'c'
+    assert backend.get('a') is None
+    time.sleep(0.01)
+    backend.get('b')  # 'b' is now more recent than 'c'
+    time.sleep(0.01)
+    backend.set('d', CacheEntry(200, {}, b'd' * 1000, None))
+
+    assert backend.get('c') is None
+    assert backend.get('b') is not None
+    assert backend.get('d') is not None
+    assert backend.total_bytes() <= 2500
+
+
+def test_backend_concurrent_writes_of_one_key(make_backend):
+    backend = make_backend()
+    bodies = [bytes([65 + i]) * 50_000 for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda body: backend.set('k', CacheEntry(200, {}, body, None)), bodies))
+
+    assert backend.get('k').content in bodies
+
+
+def test_ttl_policy_is_date_aware():
+    policy = TTLPolicy({'NEWS_SENTIMENT': 300, 'newsapi.org': 120}, default_ttl=60)
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    past = today - datetime.timedelta(days=3)
+
+    assert policy('https://newsapi.org/v2/everything', {'to': past.strftime('%Y-%m-%dT23:59:59')}) is None
+    assert policy('https://www.alphavantage.co/query',
+                  {'function': 'NEWS_SENTIMENT', 'time_to': past.strftime('%Y%m%dT235959')}) is None
+    assert policy('https://newsapi.org/v2/everything', {'to': today.strftime('%Y-%m-%dT23:59:59')}) == 120
+    assert policy('https://www.alphavantage.co/query', {'function': 'NEWS_SENTIMENT'}) == 300
+    assert policy('https://www.alphavantage.co/query', {'function': 'TIME_SERIES_DAILY'}) == 60
+
+
+class CountingSession:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        self.calls.append(params)
+        resp = requests.Response()
+        resp.status_code = self.status_code
+        resp._content = b'{"articles": [1, 2]}'
+        resp.headers['Content-Type'] = 'application/json'
+        return resp
+
+
+def make_session(tmp_path, inner, ttl=600):
+    return CachedSession(
+        backend=SQLiteCacheBackend(str(tmp_path / 'cache.sqlite')),
+        ttl_policy=TTLPolicy(default_ttl=ttl),
+        session=inner,
+    )
+
+
+def test_cached_session_serves_hits_without_network(tmp_path):
+    inner = CountingSession()
+    session = make_session(tmp_path, inner)
+
+    first = session.get('https://newsapi.org/v2/everything', params={'q': 'Tesla', 'apiKey': 'one'})
+    # Another API key still hits the same entry
+    second = session.get('https://newsapi.org/v2/everything', params={'q': 'Tesla', 'apiKey': 'two'})
+
+    assert len(inner.calls) == 1
+    assert not first.from_cache and second.from_cache
+    assert second.json() == {'articles': [1, 2]}
+
+
+def test_cached_session_refetches_expired_entries(tmp_path):
+    inner = CountingSession()
+    session = make_session(tmp_path, inner, ttl=0.05)
+
+    session.get('https://example.com', params={'q': 'x'})
+    time.sleep(0.1)
+    session.get('https://example.com', params={'q': 'x'})
+
+    assert len(inner.calls) == 2
+
+
+def test_cached_session_does_not_cache_errors(tmp_path):
+    inner = CountingSession(status_code=429)
+    session = make_session(tmp_path, inner)
+
+    for _ in range(2):
+        resp = session.get('https://example.com', params={'q': 'x'})
+        with pytest.raises(requests.HTTPError):
+            resp.raise_for_status()
+
+    assert len(inner.calls) == 2
+
+
+class StreamingSession(CountingSession):
+    def get(self, url, params=None, timeout=None, **kwargs):
+        resp = super().get(url, params, timeout, **kwargs)
+        resp._content_consumed = True
+        return resp
+
+
+def test_streamed_miss_is_cached_once_fully_read(tmp_path):
+    inner = StreamingSession()
+    session = make_session(tmp_path, inner)
+    url = 'https://www.alphavantage.co/query'
+
+    first = session.get(url, params={'function': 'NEWS_SENTIMENT'}, stream=True)
+    chunks = list(first.iter_content(4))
+    second = session.get(url, params={'function': 'NEWS_SENTIMENT'}, stream=True)
+
+    assert len(chunks) > 1 and b''.join(chunks) == b'{"articles": [1, 2]}'
+    assert not first.from_cache and second.from_cache
+    assert b''.join(second.iter_content(4)) == b'{"articles": [1, 2]}'
+    assert len(inner.calls) == 1
+
+
+def test_streamed_miss_is_not_cached_when_abandoned(tmp_path):
+    inner = StreamingSession()
+    session = make_session(tmp_path, inner)
+
+    resp = session.get('https://example.com', params={'q': 'x'}, stream=True)
+    next(iter(resp.iter_content(4)))
+    session.get('https://example.com', params={'q': 'x'}, stream=True)
+
+    assert len(inner.calls) == 2
+
+
+def test_streamed_miss_over_size_limit_is_passed_through_uncached(tmp_path):
+    inner = StreamingSession()
+    session = make_session(tmp_path, inner)
+    session.max_stream_bytes = 8
+
+    resp = session.get('https://example.com', params={'q': 'x'}, stream=True)
+    body = b''.join(resp.iter_content(4))
+    session.get('https://example.com', params={'q': 'x'}, stream=True)
+
+    assert body == b'{"articles": [1, 2]}'
+    assert len(inner.calls) == 2
+    with pytest.raises(RuntimeError):
+        list(resp.iter_content(4))
+
+
+class NoteSession(CountingSession):
+    """Answers HTTP 200 with an Alpha Vantage rate-limit note."""
+
+    def mount(self, prefix, adapter):
+        self.adapter = adapter
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        resp = super().get(url, params, timeout, **kwargs)
+        resp._content = b'{"Information": "API rate limit reached"}'
+        return resp
+
+
+@pytest.fixture
+def quota_state(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'QUOTA_STATE_PATH', str(tmp_path / 'quota.sqlite'))
+    monkeypatch.setattr(rate_limit, '_schedulers', {})
+
+
+def test_alpha_vantage_rate_limit_note_is_not_cached(tmp_path, quota_state):
+    inner = NoteSession()
+    fetcher = AlphaVantageNewsFetcher(api_key='key', session=make_session(tmp_path, inner))
+    # A closed past range would otherwise be cached forever
+    day = datetime.date(2024, 1, 2)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match='Unexpected API response'):
+            fetcher.fetch('TSLA', day, day)
+
+    assert len(inner.calls) == 2
+
+
+class StreamingNoteSession(NoteSession):
+    def get(self, url, params=None, timeout=None, **kwargs):
+        resp = super().get(url, params, timeout, **kwargs)
+        resp._content_consumed = True
+        return resp
+
+
+def test_alpha_vantage_streamed_quota_note_pauses_scheduler(tmp_path, quota_state):
+    fetcher = AlphaVantageNewsFetcher(api_key='key', session=make_session(tmp_path, StreamingNoteSession()))
+    day = datetime.date(2024, 1, 2)
+
+    with pytest.raises(RuntimeError, match='Unexpected API response'):
+        list(fetcher.fetch_stream('TSLA', day, day))
+
+    assert rate_limit.get_scheduler('alpha_vantage').remaining()['daily_remaining'] == 0
+
+
+def test_cached_session_skips_bodies_rejected_by_validator(tmp_path):
+    inner = CountingSession()
+    session = make_session(tmp_path, inner)
+    validate = json_validator(lambda payload: payload.get('status') == 'ok')
+
+    for _ in range(2):
+        session.get('https://example.com', params={'q': 'x'}, validate=validate)
+
+    assert len(inner.calls) == 2
@@ -0,0 +1,90 @@
+import pandas as pd
+import pytest
+
+from analyzer.intraday import IntradayMoveDetector
+
+OPEN = pd.Timestamp('2025-06-27 13:30', tz='UTC').timestamp()
+
+
+def feed(detector, symbol, prices, start=OPEN, step=60):
+    signals = []
+    for i, price in enumerate(prices):
+        signals.extend(detector.update(symbol, start + i * step, price))
+    return signals
+
+
+def test_five_minute_spike_fires_once_when_crossed():
+    detector = IntradayMoveDetector(thresholds={'5m': 2.0})
+    prices = [100.0] * 10 + [101.0, 102.5, 103.0, 103.0]
+
+    signals = feed(detector, 'TSLA', prices)
+
+    assert len(signals) == 1
+    signal = signals[0]
+    assert signal.window == '5m' and signal.symbol == 'TSLA'
+    assert signal.price == 102.5 and signal.reference == 100.0
+    assert signal.time == pd.Timestamp(OPEN + 11 * 60, unit='s', tz='UTC')
+
+
+def test_window_rearms_after_move_fades():
+    detector = IntradayMoveDetector(thresholds={'5m': 2.0})
+    prices = [100.0] * 6 + [103.0] * 7 + [103.0] * 5 + [106.0]
+
+    signals = feed(detector, 'TSLA', prices)
+
+    # Up 3% at minute 6, flat long enough to re-arm, then up again
+    assert [s.price for s in signals] == [103.0, 106.0]
+
+
+def test_no_window_reference_before_session_is_long_enough():
+    detector = IntradayMoveDetector(thresholds={'30m': 1.0, 'open': 1.0})
+
+    signals = feed(detector, 'TSLA', [100.0, 100.5, 102.0])
+
+    assert [s.window for s in signals] == ['open']
+
+
+def test_gaps_are_carried_forward():
+    detector = IntradayMoveDetector(thresholds={'5m': 2.0})
+    detector.update('TSLA', OPEN, 100.0)
+    # No bars for ten minutes: the price five minutes ago is the last one seen
+    signals = detector.update('TSLA', OPEN + 600, 103.0)
+
+    assert [(s.window, s.reference) for s in signals] == [('5m', 100.0)]
+
+
+def test_overnight_gap_starts_a_new_session():
+    detector = IntradayMoveDetector(thresholds={'open': 5.0})
+    feed(detector, 'TSLA', [100.0, 100.0])
+
+    signals = feed(detector, 'TSLA', [110.0, 110.5], start=OPEN + 86400)
+
+    assert signals == []
+
+
+def test_symbols_are_independent_and_late_bars_ignored():
+    detector = IntradayMoveDetector(thresholds={'open': 3.0})
+    bars = [('AAA', OPEN, 10.0), ('BBB', OPEN, 50.0), ('AAA', OPEN + 60, 10.5),
+            ('BBB', OPEN + 60, 50.1), ('AAA', OPEN + 30, 20.0)]
+
+    signals = detector.update_many(bars)
+
+    assert [(s.symbol, round(s.pct_change, 1)) for s in signals] == [('AAA', 5.0)]
+    assert len(detector) == 2
+
+
+def test_accepts_datetimes_and_second_bars():
+    detector = IntradayMoveDetector(thresholds={'5m': 1.0}, windows={'5m': 300}, resolution=1)
+    start = pd.Timestamp('2025-06-27 13:30', tz='UTC')
+
+    detector.update('TSLA', start, 100.0)
+    signals = detector.update('TSLA', start + pd.Timedelta(seconds=300), 101.5)
+
+    assert len(signals) == 1
+
+
+def test_rejects_windows_not_aligned_with_resolution():
+    with pytest.raises(ValueError):
+        IntradayMoveDetector(thresholds={'90s': 1.0}, windows={'90s': 90})
+    with pytest.raises(ValueError):
+        IntradayMoveDetector(thresholds={'1h': 1.0})
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from fetcher.json_stream import iter_array_items
+
+
+def chunked(payload, size):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 4096])
+def test_items_survive_any_chunk_boundary(size):
+    feed = [
+        {'title': 'Tesla 股价大涨 🚀', 'score': 0.25, 'tags': ['a', 'b']},
+        {'title': 'Plain', 'score': -12, 'nested': {'x': None, 'y': True}},
+        123456,
+    ]
+    payload = {'items': '7', 'sentiment_score_definition': 'x <= -0.35', 'feed': feed}
+
+    items, others = iter_array_items(chunked(payload, size), 'feed')
+
+    assert list(items) == feed
+    assert others == {'items': '7', 'sentiment_score_definition': 'x <= -0.35'}
+
+
+def test_items_are_yielded_before_the_stream_ends():
+    consumed = []
+
+    def chunks():
+        for chunk in (b'{"feed": [{"a": 1},', b' {"a": 2}', b']}'):
+            consumed.append(chunk)
+            yield chunk
+
+    items, _ = iter_array_items(chunks(), 'feed')
+
+    assert next(items) == {'a': 1}
+    assert len(consumed) == 1
+
+
+def test_empty_array():
+    items, _ = iter_array_items([b'{"feed": []}'], 'feed')
+    assert list(items) == []
+
+
+def test_missing_key_raises_key_error_with_other_values():
+    items, others = iter_array_items(chunked({'Information': 'rate limit'}, 5), 'feed')
+
+    with pytest.raises(KeyError):
+        list(items)
+    assert others == {'Information': 'rate limit'}
+
+
+def test_non_object_raises_value_error():
+    items, _ = iter_array_items([b'[1, 2]'], 'feed')
+    with pytest.raises(ValueError):
+        list(items)
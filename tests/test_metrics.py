@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+import requests
+
+import metrics
+from fetcher.base import Fetcher
+from fetcher.http_cache import CachedSession, SQLiteCacheBackend, TTLPolicy
+from metrics.registry import MetricsRegistry
+from model.local_llm_client import LocalLLMClient
+from parser.base import Parser
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+class StaticSession:
+    def get(self, url, params=None, timeout=None, **kwargs):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = b'[1, 2, 3]'
+        return resp
+
+
+class HTTPFetcher(Fetcher):
+    def _init(self, session):
+        self._session = session
+
+    def _fetch(self, query):
+        if query is None:
+            raise ValueError('no query')
+        return self._session.get('https://api.example.com/news', params={'q': query}).json()
+
+
+class FrameParser(Parser):
+    def _parse(self, raw_data):
+        return pd.DataFrame({'value': raw_data})
+
+
+def test_fetcher_records_calls_errors_rows_and_cache_hits(tmp_path):
+    session = CachedSession(
+        backend=SQLiteCacheBackend(str(tmp_path / 'cache.sqlite')),
+        ttl_policy=TTLPolicy(default_ttl=600),
+        session=StaticSession(),
+    )
+    fetcher = HTTPFetcher(session)
+
+    fetcher.fetch('tesla')
+    fetcher.fetch('tesla')
+    with pytest.raises(ValueError):
+        fetcher.fetch(None)
+
+    labels = dict(provider='HTTPFetcher', method='fetch')
+    assert metrics.FETCH_REQUESTS.value(**labels) == 3
+    assert metrics.FETCH_ERRORS.value(**labels) == 1
+    assert metrics.FETCH_ROWS.value(provider='HTTPFetcher') == 6
+    assert metrics.HTTP_BYTES.value(provider='HTTPFetcher', cache='miss') == len(b'[1, 2, 3]')
+    snapshot = metrics.snapshot()
+    assert snapshot['cache_hit_ratio'] == {'HTTPFetcher': 0.5}
+    latency = snapshot['stockai_fetch_latency_seconds']['samples'][0]
+    assert latency['count'] == 3
+
+
+def test_parser_records_rows_and_latency():
+    FrameParser().parse([1, 2, 3, 4])
+
+    assert metrics.PARSE_CALLS.value(parser='FrameParser') == 1
+    assert metrics.PARSE_ROWS.value(parser='FrameParser') == 4
+    assert 'stockai_parse_latency_seconds_count{parser="FrameParser"} 1' in metrics.export_prometheus()
+
+
+def test_model_client_records_tokens_and_latency():
+    client = LocalLLMClient(model='local-test')
+    client.complete('system', 'prompt')
+
+    labels = dict(client='LocalLLMClient', model=client.model_id)
+    assert metrics.LLM_REQUESTS.value(**labels) == 1
+    assert metrics.LLM_TOKENS.value(direction='input', **labels) > 0
+
+
+def test_prometheus_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('demo_seconds', 'Demo.', ('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, stage='parse')
+
+    text = registry.export_prometheus()
+
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="parse",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="parse",le="1"} 2' in text
+    assert 'demo_seconds_bucket{stage="parse",le="+Inf"} 3' in text
+    assert histogram.quantile(0.5, stage='parse') == 1.0
@@ -0,0 +1,258 @@
+import json
+import threading
+import pytest
+
+import model
+import model.base as model_base
+from model.base import ModelClient, ModelResponse
+from model.local_llm_client import LocalLLMClient
+
+
+class FlakyClient(ModelClient):
+    """Fails `failures` times with `error`, then answers."""
+
+    def __init__(self, failures, error, **kwargs):
+        super().__init__(model='flaky', **kwargs)
+        self.failures = failures
+        self.error = error
+        self.attempts = 0
+
+    def _complete(self, instructions, prompt, timeout, **options):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.error
+        return ModelResponse(text='ok', input_tokens=10, output_tokens=5)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(model_base.time, 'sleep', lambda seconds: None)
+
+
+def test_complete_retries_transient_errors():
+    client = FlakyClient(failures=2, error=TimeoutError('slow'), max_retries=2)
+
+    response = client.complete('instructions', 'prompt')
+
+    assert response.text == 'ok'
+    assert client.attempts == 3
+    stats = client.stats()
+    assert stats['retries'] == 2
+    assert stats['errors'] == 2
+    assert stats['requests'] == 1
+
+
+def test_complete_gives_up_after_max_retries():
+    client = FlakyClient(failures=5, error=TimeoutError('slow'), max_retries=1)
+
+    with pytest.raises(TimeoutError):
+        client.complete('instructions', 'prompt')
+    assert client.attempts == 2
+
+
+def test_complete_does_not_retry_other_errors():
+    client = FlakyClient(failures=1, error=ValueError('bad request'), max_retries=3)
+
+    with pytest.raises(ValueError):
+        client.complete('instructions', 'prompt')
+    assert client.attempts == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    client = FlakyClient(failures=0, error=None, backoff_base=0.5, backoff_max=2.0)
+
+    delays = [client._backoff(attempt) for attempt in range(10) for _ in range(20)]
+
+    assert all(0 <= d <= 2.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_stats_count_tokens_and_latency():
+    client = FlakyClient(failures=0, error=None)
+    for _ in range(3):
+        response = client.complete('instructions', 'prompt')
+        assert response.latency >= 0
+
+    stats = client.stats()
+    assert stats['requests'] == 3
+    assert stats['input_tokens'] == 30
+    assert stats['output_tokens'] == 15
+    assert stats['latency_p95'] >= 0
+
+
+class StreamingClient(FlakyClient):
+    """Streams 'a', 'b', 'c'; fails `failures` times before the first piece, then after `fail_after` pieces."""
+
+    def __init__(self, failures, error, fail_after=None, **kwargs):
+        super().__init__(failures, error, **kwargs)
+        self.fail_after = fail_after
+
+    def _stream(self, instructions, prompt, timeout, **options):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise self.error
+        for i, piece in enumerate('abc'):
+            if i == self.fail_after:
+                raise self.error
+            yield piece
+        return ModelResponse(text='abc', input_tokens=10, output_tokens=3)
+
+
+def test_stream_yields_pieces_and_records_usage():
+    client = StreamingClient(failures=1, error=TimeoutError('slow'))
+
+    assert list(client.stream('instructions', 'prompt')) == ['a', 'b', 'c']
+
+    stats = client.stats()
+    assert stats['requests'] == 1 and stats['retries'] == 1
+    assert stats['output_tokens'] == 3
+
+
+def test_stream_does_not_retry_after_first_piece():
+    client = StreamingClient(failures=0, error=TimeoutError('cut off'), fail_after=2)
+    pieces = []
+
+    with pytest.raises(TimeoutError):
+        for piece in client.stream('instructions', 'prompt'):
+            pieces.append(piece)
+
+    assert pieces == ['a', 'b']
+    assert client.attempts == 1
+
+
+def test_stream_falls_back_to_complete():
+    client = FlakyClient(failures=0, error=None)
+    assert list(client.stream('instructions', 'prompt')) == ['ok']
+    assert client.stats()['requests'] == 1
+
+
+class SlowClient(ModelClient):
+    """Attempt n waits `delays[n]` seconds, then streams three words `word_delay` apart."""
+
+    def __init__(self, delays, word_delay=0.0, **kwargs):
+        super().__init__(model='slow', **kwargs)
+        self.delays = delays
+        self.word_delay = word_delay
+        self.attempts = 0
+        self.closed = []
+        self._attempt_lock = threading.Lock()
+
+    def _complete(self, instructions, prompt, timeout, **options):
+        raise NotImplementedError
+
+    def _stream(self, instructions, prompt, timeout, **options):
+        with self._attempt_lock:
+            n = self.attempts
+            self.attempts += 1
+        # threading.Event().wait instead of time.sleep, which no_sleep disables
+        try:
+            threading.Event().wait(self.delays[n])
+            for word in 'abc':
+                threading.Event().wait(self.word_delay)
+                yield f'{n}{word} '
+            return ModelResponse(text=f'{n}a {n}b {n}c', output_tokens=3)
+        finally:
+            self.closed.append(n)
+
+
+def test_complete_hedged_uses_first_answer_and_cancels_the_other():
+    client = SlowClient(delays=[1.0, 0.0])
+
+    response = client.complete_hedged('instructions', 'prompt', deadline=5, hedge_delay=0.05)
+
+    assert response.text == '1a 1b 1c'
+    assert not response.partial
+    assert response.latency < 1.0
+    stats = client.stats()
+    assert stats['hedges'] == 1 and stats['hedge_wins'] == 1
+    assert stats['requests'] == 1
+
+
+def test_complete_hedged_does_not_hedge_fast_answers():
+    client = SlowClient(delays=[0.0])
+
+    response = client.complete_hedged('instructions', 'prompt', deadline=5, hedge_delay=0.5)
+
+    assert response.text == '0a 0b 0c'
+    assert client.attempts == 1
+    assert client.stats()['hedges'] == 0
+
+
+def test_complete_hedged_returns_partial_answer_at_deadline():
+    client = SlowClient(delays=[0.0], word_delay=0.3)
+    pieces = []
+
+    response = client.complete_hedged('instructions', 'prompt', deadline=0.45, hedge_delay=5, on_piece=pieces.append)
+
+    assert response.partial
+    assert response.text == '0a '
+    assert pieces == ['0a ']
+    assert client.stats()['deadline_exceeded'] == 1
+    assert client.stats()['requests'] == 0
+
+
+def test_complete_hedged_streams_only_the_leading_attempt():
+    client = SlowClient(delays=[0.3, 0.0], word_delay=0.05)
+    pieces = []
+
+    response = client.complete_hedged('instructions', 'prompt', deadline=5, hedge_delay=0.05, on_piece=pieces.append)
+
+    assert pieces == ['1a ', '1b ', '1c ']
+    assert response.text == '1a 1b 1c'
+    # The slow attempt stops at its first piece once it notices the cancellation
+    for _ in range(50):
+        if 0 in client.closed:
+            break
+        threading.Event().wait(0.02)
+    assert 0 in client.closed
+
+
+def test_complete_hedged_replaces_failed_attempt():
+    client = FlakyClient(failures=1, error=TimeoutError('slow'))
+
+    response = client.complete_hedged('instructions', 'prompt', deadline=5, hedge_delay=5)
+
+    assert response.text == 'ok'
+    assert client.attempts == 2
+    assert client.stats()['retries'] == 1
+
+
+def test_complete_hedged_raises_non_retryable_errors():
+    client = FlakyClient(failures=1, error=ValueError('bad request'))
+
+    with pytest.raises(ValueError):
+        client.complete_hedged('instructions', 'prompt', deadline=5, hedge_delay=5)
+
+
+def test_hedge_delay_follows_latency_p95():
+    client = FlakyClient(failures=0, error=None, hedge_delay=7.0)
+    assert client.hedge_delay() == 7.0
+
+    client._latencies.extend(float(i) for i in range(1, 101))
+
+    assert client.hedge_delay() == client.stats()['latency_p95'] == 95.0
+
+
+def test_local_client_streams_word_by_word():
+    pieces = list(LocalLLMClient().stream('instructions', 'prompt'))
+    assert len(pieces) > 1
+    assert ''.join(pieces).startswith('[local stub]')
+
+
+def test_local_client_answers_json_mode_per_date_key():
+    client = LocalLLMClient()
+    prompt = '### 2025-06-02: up\n\nnews\n\n### 2025-06-03: down\n\nnews'
+
+    response = client.complete('instructions', prompt, text={'format': {'type': 'json_object'}})
+
+    assert set(json.loads(response.text)) == {'2025-06-02', '2025-06-03'}
+    assert not client.requires_api_key
+
+
+def test_get_model_client_is_process_wide(monkeypatch):
+    monkeypatch.setattr(model, '_clients', {})
+
+    first = model.get_model_client('local')
+
+    assert first is model.get_model_client('local')
+    assert isinstance(first, LocalLLMClient)
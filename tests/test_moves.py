@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer.moves import detect_significant_moves, detect_significant_moves_panel
+
+
+def make_panel(n=60, seed=0):
+    """Calm symbol (0.5% daily noise) and volatile symbol (6% daily noise)."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2025-01-01', periods=n, freq='D')
+    calm = 100 * np.cumprod(1 + rng.normal(0, 0.005, n))
+    wild = 100 * np.cumprod(1 + rng.normal(0, 0.06, n))
+    return pd.DataFrame({'CALM': calm, 'WILD': wild}, index=index)
+
+
+def test_pct_method_matches_single_symbol_detector():
+    close = make_panel()
+
+    signals = detect_significant_moves_panel(close, 5.0)
+
+    for symbol in close.columns:
+        expected = detect_significant_moves(close[[symbol]].rename(columns={symbol: 'close'}), 5.0)
+        assert [s.date for s in signals if s.symbol == symbol] == expected
+
+
+def test_panel_detector_compares_against_last_close_before_a_gap():
+    index = pd.date_range('2025-06-02', periods=5, freq='D')
+    close = pd.DataFrame({
+        'HALT': [100.0, np.nan, np.nan, 110.0, 111.0],
+        'NEW': [np.nan, np.nan, 50.0, 55.0, 55.5],
+    }, index=index)
+
+    signals = detect_significant_moves_panel(close, 5.0)
+
+    assert [(s.date, s.symbol) for s in signals] == [(index[3], 'HALT'), (index[3], 'NEW')]
+    assert signals[0].pct_change == pytest.approx(10.0)
+
+
+def test_panel_detector_does_not_mutate_input():
+    close = make_panel()
+    before = close.copy()
+
+    detect_significant_moves_panel(close, 5.0)
+    detect_significant_moves_panel(close, 3.0, method='zscore')
+
+    pd.testing.assert_frame_equal(close, before)
+
+
+def test_signals_are_sorted_by_date():
+    signals = detect_significant_moves_panel(make_panel(), 1.0)
+
+    dates = [s.date for s in signals]
+    assert dates == sorted(dates)
+
+
+def test_zscore_flags_jump_relative_to_own_volatility():
+    close = make_panel()
+    # A 3% jump is huge for the calm symbol and noise for the volatile one
+    jump_date = close.index[40]
+    close.loc[jump_date:, 'CALM'] *= 1.03
+
+    signals = detect_significant_moves_panel(close, 4.0, method='zscore', window=20)
+
+    assert (jump_date, 'CALM') in [(s.date, s.symbol) for s in signals]
+    assert not detect_significant_moves_panel(close[['CALM']], 5.0)
+
+
+def test_atr_uses_high_low_ranges():
+    index = pd.date_range('2025-01-01', periods=30, freq='D')
+    close = pd.DataFrame({'X': [100.0] * 29 + [104.0]}, index=index)
+    high, low = close + 1.0, close - 1.0
+
+    signals = detect_significant_moves_panel(close, 1.5, method='atr', window=10, high=high, low=low)
+
+    assert [(s.date, s.symbol) for s in signals] == [(index[-1], 'X')]
+    assert signals[0].score == pytest.approx(2.0)
+
+
+def test_unknown_method_raises():
+    with pytest.raises(ValueError):
+        detect_significant_moves_panel(make_panel(), 1.0, method='median')
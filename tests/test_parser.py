@@ -1,8 +1,11 @@
 import pytest
 import json
 import pandas as pd
+import numpy as np
 from parser.alpha_vantage_news_parser import AlphaVantageNewsParser
 from parser.alpha_vantage_price_parser import AlphaVantagePriceParser
+from parser.newsapi_news_parser import NewsAPIParser
+from parser.yfinance_panel_parser import YFinancePanelParser
 
 # Test data fixtures
 
@@ -192,4 +195,116 @@ def test_price_parser_calculates_pct_change():
     
     # Second row should have calculated pct_change
     expected_pct = (327.55 / 340.47 - 1) * 100  # (close[1] / close[0] - 1) * 100
-    assert abs(result.iloc[1]['pct_change'] - expected_pct) < 0.01
\ No newline at end of file
+    assert abs(result.iloc[1]['pct_change'] - expected_pct) < 0.01
+# Tests for YFinancePanelParser
+
+def get_sample_panel():
+    """Return a small panel shaped like yf.download(group_by='column') output."""
+    index = pd.date_range('2025-06-02', periods=3, freq='D', name='Date')
+    columns = pd.MultiIndex.from_product([['Close', 'Open'], ['AAPL', 'TSLA']], names=['Price', 'Ticker'])
+    values = [
+        [200.0, float('nan'), 199.0, float('nan')],
+        [210.0, 330.0, 201.0, 325.0],
+        [205.0, 300.0, 209.0, 331.0],
+    ]
+    return pd.DataFrame(values, index=index, columns=columns)
+
+def test_panel_parser_splits_per_symbol_frames():
+    parser = YFinancePanelParser()
+
+    result = parser.parse(get_sample_panel())
+
+    assert set(result) == {'AAPL', 'TSLA'}
+    assert list(result['AAPL'].columns) == ['close', 'open']
+    assert list(result['AAPL']['close']) == [200.0, 210.0, 205.0]
+    assert isinstance(result['AAPL'].index, pd.DatetimeIndex)
+
+def test_panel_parser_drops_dates_without_close():
+    parser = YFinancePanelParser()
+
+    result = parser.parse(get_sample_panel())
+
+    assert len(result['TSLA']) == 2
+    assert result['TSLA'].index[0] == pd.Timestamp('2025-06-03')
+
+def test_panel_parser_rejects_flat_columns():
+    parser = YFinancePanelParser()
+    with pytest.raises(ValueError):
+        parser.parse(pd.DataFrame({'Close': [1.0]}))
+
+# Tests for the vectorized news frames
+
+def test_news_parser_returns_typed_frame_sorted_by_time():
+    parser = AlphaVantageNewsParser(target_ticker="TSLA")
+    feed = list(reversed(get_sample_news_data()))
+
+    result = parser.parse(feed)
+
+    assert result['time_published'].is_monotonic_increasing
+    assert result['relevance_score'].dtype == np.float32
+    assert result['ticker_sentiment_score'].dtype == np.float32
+    assert isinstance(result['ticker_sentiment_label'].dtype, pd.CategoricalDtype)
+    assert set(result['ticker_sentiment_label']) <= {"Bullish", "Somewhat-Bearish"}
+
+def test_news_parser_picks_target_ticker_and_defaults():
+    parser = AlphaVantageNewsParser(target_ticker="TSLA")
+    feed = [
+        {"title": "other only", "time_published": "20250604T100000",
+         "ticker_sentiment": [{"ticker": "AAPL", "relevance_score": "0.9"}]},
+        {"title": "target second", "time_published": "20250604T090000",
+         "ticker_sentiment": [
+             {"ticker": "AAPL", "relevance_score": "0.9", "ticker_sentiment_score": "0.5"},
+             {"ticker": "TSLA", "relevance_score": "bad", "ticker_sentiment_label": None},
+         ]},
+        {"title": "no time", "ticker_sentiment": [{"ticker": "TSLA"}]},
+    ]
+
+    result = parser.parse(feed)
+
+    assert list(result['title']) == ["target second"]
+    assert result.iloc[0]['relevance_score'] == 1.0
+    assert result.iloc[0]['ticker_sentiment_score'] == 0.0
+    assert result.iloc[0]['ticker_sentiment_label'] == "Neutral"
+
+def test_news_parser_empty_feed_keeps_columns():
+    result = AlphaVantageNewsParser(target_ticker="TSLA").parse([])
+
+    assert result.empty
+    assert 'ticker_sentiment_label' in result.columns
+
+def test_news_parser_stream_matches_list_parse():
+    parser = AlphaVantageNewsParser(target_ticker="TSLA")
+    feed = list(reversed(get_sample_news_data()))
+
+    expected = parser.parse(feed)
+    streamed = parser.parse(iter(feed))
+    batches = list(parser.parse_stream(iter(feed), batch_size=1))
+
+    pd.testing.assert_frame_equal(streamed, expected, check_categorical=False)
+    assert len(batches) == len(expected)
+    assert all(batch['relevance_score'].dtype == np.float32 for batch in batches)
+
+def test_news_parser_filters_by_min_relevance():
+    feed = [
+        {"title": title, "time_published": "20250604T100000",
+         "ticker_sentiment": [{"ticker": "TSLA", "relevance_score": score}]}
+        for title, score in (("low", "0.1"), ("high", "0.8"))
+    ]
+    parser = AlphaVantageNewsParser(target_ticker="TSLA", min_relevance=0.5)
+
+    assert list(parser.parse(feed)['title']) == ["high"]
+    assert list(parser.parse(iter(feed))['title']) == ["high"]
+
+def test_newsapi_parser_parses_times_in_bulk():
+    raw = [
+        {"title": "a", "description": "d", "url": "u1", "publishedAt": "2025-06-04T12:00:00Z",
+         "source": {"id": None, "name": "CNBC"}},
+        {"title": "b", "description": "e", "url": "u2", "publishedAt": "not a date", "source": None},
+    ]
+
+    result = NewsAPIParser().parse(raw)
+
+    assert list(result.columns) == ['title', 'summary', 'url', 'time_published', 'source']
+    assert result.iloc[0]['time_published'] == pd.Timestamp('2025-06-04 12:00', tz='UTC')
+    assert pd.isna(result.iloc[1]['time_published'])
+    assert isinstance(result['source'].dtype, pd.CategoricalDtype)
@@ -0,0 +1,179 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import config
+from fetcher.price_store import PriceStore
+from fetcher.stored_price_fetcher import StoredPriceFetcher
+from fetcher.symbol_metadata import SymbolMetadata, SymbolMetadataCache
+
+
+def make_bars(start, periods, first_close=100.0):
+    index = pd.date_range(start, periods=periods, freq='D', tz='America/New_York', name='Date')
+    closes = [first_close + i for i in range(periods)]
+    return pd.DataFrame({'Open': closes, 'Close': closes, 'Volume': [1000] * periods}, index=index)
+
+
+class FakeHistoryFetcher:
+    """Stand-in for YfinanceFetcher serving bars from a fixed frame."""
+    def __init__(self, bars):
+        self.bars = bars
+        self.history_calls = []
+        self.name_calls = 0
+
+    def fetch_history(self, symbol, start, end=None):
+        self.history_calls.append(start)
+        return self.bars[self.bars.index >= pd.Timestamp(start, tz=self.bars.index.tz)]
+
+    def fetch_company_name(self, symbol):
+        self.name_calls += 1
+        return 'Tesla, Inc.'
+
+
+# Tests for PriceStore
+
+def test_store_round_trip_keeps_index_and_timezone(tmp_path):
+    store = PriceStore(str(tmp_path))
+    bars = make_bars('2025-06-02', 5)
+
+    store.append('tsla', bars)
+    loaded = store.load('TSLA')
+
+    pd.testing.assert_frame_equal(loaded, bars, check_freq=False)
+    assert store.last_date('TSLA') == bars.index[-1]
+
+
+def test_store_append_replaces_overlapping_bars(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append('TSLA', make_bars('2025-06-02', 5))
+
+    merged = store.append('TSLA', make_bars('2025-06-06', 3, first_close=500.0))
+
+    assert len(merged) == 7
+    assert merged['Close'].iloc[4] == 500.0
+    assert merged.index.is_monotonic_increasing
+
+
+def test_store_load_slices_period(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append('TSLA', make_bars('2025-06-02', 10))
+
+    sliced = store.load('TSLA', start=pd.Timestamp('2025-06-05'), end=pd.Timestamp('2025-06-07'))
+
+    assert len(sliced) == 3
+
+
+def test_store_metadata_survives_appends(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.append('TSLA', make_bars('2025-06-02', 2), company_name='Tesla, Inc.')
+    store.append('TSLA', make_bars('2025-06-04', 2))
+
+    assert store.metadata('TSLA')['company_name'] == 'Tesla, Inc.'
+    assert store.fetched_at('TSLA') is not None
+
+
+def test_store_concurrent_appends_keep_every_bar(tmp_path):
+    store = PriceStore(str(tmp_path))
+    starts = pd.date_range('2025-06-02', periods=8, freq='3D')
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda start: store.append('TSLA', make_bars(start, 3)), starts))
+
+    assert len(store.load('TSLA')) == 24
+    assert os.listdir(tmp_path) == ['TSLA.feather']
+
+
+# Tests for StoredPriceFetcher
+
+def test_stored_fetcher_downloads_only_missing_days(tmp_path):
+    today = pd.Timestamp.now().normalize()
+    bars = make_bars(today - pd.Timedelta(days=40), 41)
+    store = PriceStore(str(tmp_path))
+    store.append('TSLA', bars.iloc[:30])
+    inner = FakeHistoryFetcher(bars)
+    fetcher = StoredPriceFetcher(inner=inner, store=store, refresh_seconds=0)
+
+    company_name, hist = fetcher.fetch('TSLA', 30)
+
+    assert company_name == 'Tesla, Inc.'
+    assert inner.history_calls == [bars.index[29].strftime('%Y-%m-%d')]
+    assert hist.index[-1] == bars.index[-1]
+    assert store.last_date('TSLA') == bars.index[-1]
+
+
+def test_stored_fetcher_repeat_query_uses_no_network(tmp_path):
+    today = pd.Timestamp.now().normalize()
+    inner = FakeHistoryFetcher(make_bars(today - pd.Timedelta(days=40), 41))
+    fetcher = StoredPriceFetcher(inner=inner, store=PriceStore(str(tmp_path)), refresh_seconds=3600)
+
+    first = fetcher.fetch('TSLA', 30)
+    second = fetcher.fetch('TSLA', 7)
+
+    assert len(inner.history_calls) == 1
+    assert len(second[1]) == 7
+    assert second[1].index[-1] == first[1].index[-1]
+
+
+# Tests for SymbolMetadataCache
+
+class CountingLookup:
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def __call__(self, symbol):
+        self.calls.append(symbol)
+        if symbol in self.fail:
+            raise RuntimeError('Yahoo unavailable')
+        return SymbolMetadata(symbol, f'{symbol} Inc.', 'NasdaqGS', 'USD')
+
+
+def test_metadata_cache_looks_up_once(tmp_path):
+    lookup = CountingLookup()
+    cache = SymbolMetadataCache(lookup, path=str(tmp_path / 'meta.sqlite'))
+
+    first = cache.get('tsla')
+    second = SymbolMetadataCache(lookup, path=str(tmp_path / 'meta.sqlite')).get('TSLA')
+
+    assert first.name == second.name == 'TSLA Inc.'
+    assert second.exchange == 'NasdaqGS' and second.currency == 'USD'
+    assert lookup.calls == ['TSLA']
+
+
+def test_metadata_cache_defaults_to_configured_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'configured.sqlite')
+    monkeypatch.setattr(config, 'SYMBOL_METADATA_PATH', path)
+
+    SymbolMetadataCache(CountingLookup()).get('TSLA')
+
+    assert os.path.exists(path)
+
+
+def test_metadata_cache_refreshes_expired_entries(tmp_path):
+    lookup = CountingLookup()
+    cache = SymbolMetadataCache(lookup, path=str(tmp_path / 'meta.sqlite'), ttl_seconds=0)
+
+    cache.get('TSLA')
+    cache.get('TSLA')
+
+    assert lookup.calls == ['TSLA', 'TSLA']
+
+
+def test_metadata_cache_bulk_lookup_of_cold_symbols(tmp_path):
+    lookup = CountingLookup()
+    cache = SymbolMetadataCache(lookup, path=str(tmp_path / 'meta.sqlite'))
+    cache.get('AAPL')
+
+    result = cache.get_many(['AAPL', 'MSFT', 'TSLA'])
+
+    assert list(result) == ['AAPL', 'MSFT', 'TSLA']
+    assert sorted(lookup.calls) == ['AAPL', 'MSFT', 'TSLA']
+
+
+def test_metadata_cache_failed_lookup_falls_back(tmp_path):
+    lookup = CountingLookup(fail={'RKLB'})
+    cache = SymbolMetadataCache(lookup, path=str(tmp_path / 'meta.sqlite'))
+
+    assert cache.get('RKLB').name == 'RKLB'
+    assert cache.cached('RKLB') is None
@@ -0,0 +1,92 @@
+import pandas as pd
+
+from analyzer.prompt import (
+    build_news_text,
+    collapse_near_duplicates,
+    minhash_signatures,
+    select_articles,
+)
+from config_lang import LANG_CONFIG
+
+
+def make_news(rows):
+    return pd.DataFrame([
+        {
+            'time_published': pd.Timestamp(ts),
+            'title': title,
+            'summary': summary,
+            'url': f'https://example.com/{i}',
+            'relevance_score': relevance,
+        }
+        for i, (ts, title, summary, relevance) in enumerate(rows)
+    ])
+
+
+STORY = "Tesla shares jump after record quarterly deliveries beat Wall Street estimates"
+
+
+def test_minhash_is_deterministic_and_tracks_similarity():
+    texts = [STORY, STORY + " on Tuesday", "Apple unveils a new iPhone lineup at its fall event"]
+
+    first = minhash_signatures(texts)
+    second = minhash_signatures(texts)
+
+    assert (first == second).all()
+    assert (first[0] == first[1]).mean() > 0.6
+    assert (first[0] == first[2]).mean() < 0.2
+
+
+def test_collapse_keeps_first_of_each_duplicate_group():
+    texts = [STORY, "Apple unveils a new iPhone lineup", STORY + " on Tuesday", STORY.upper()]
+
+    assert collapse_near_duplicates(texts).tolist() == [True, True, False, False]
+
+
+def test_select_collapses_syndicated_copies_and_keeps_time_order():
+    df = make_news([
+        ('2025-06-04 09:00', STORY, 'Deliveries rose to a record.', 0.9),
+        ('2025-06-04 10:00', 'Apple unveils a new iPhone lineup', 'At its fall event.', 0.3),
+        ('2025-06-04 11:00', STORY, 'Deliveries rose to a record.', 0.9),
+        ('2025-06-04 12:00', STORY, 'Deliveries rose to a record.', 0.9),
+    ])
+
+    result = select_articles(df, max_tokens=10_000)
+
+    assert len(result) == 2
+    assert result['time_published'].is_monotonic_increasing
+    # The most recent copy of the story is the one kept
+    assert result.iloc[-1]['time_published'] == pd.Timestamp('2025-06-04 12:00')
+
+
+def test_select_packs_highest_ranked_articles_into_budget():
+    df = make_news([
+        (f'2025-06-04 {hour:02d}:00', f'Headline number {hour} about topic {hour * 7}', 'x' * 400, relevance)
+        for hour, relevance in [(9, 0.1), (10, 0.9), (11, 0.2), (12, 0.8)]
+    ])
+
+    result = select_articles(df, max_tokens=250)
+
+    assert sorted(result['relevance_score']) == [0.8, 0.9]
+
+
+def test_select_always_keeps_one_article():
+    df = make_news([('2025-06-04 09:00', 'Huge', 'x' * 10_000, 0.5)])
+    assert len(select_articles(df, max_tokens=10)) == 1
+
+
+def test_build_news_text_formats_like_the_prompt_template():
+    df = make_news([
+        ('2025-06-04 09:00', 'First', 'One', 1.0),
+        ('2025-06-04 10:00', 'Second', None, 1.0),
+    ])
+    config_lang = LANG_CONFIG['en']
+
+    text = build_news_text(df, config_lang)
+
+    first, second = text.split("\n\n---\n\n")
+    assert first == (
+        f"{config_lang['time_label']}: 2025-06-04 09:00:00\n"
+        f"{config_lang['title_label']}: First\n"
+        f"{config_lang['summary_label']}: One\n"
+    )
+    assert second.startswith(f"{config_lang['time_label']}: 2025-06-04 10:00:00\n")
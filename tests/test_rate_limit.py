@@ -0,0 +1,152 @@
+import threading
+import time
+import pytest
+from requests.adapters import HTTPAdapter
+
+import metrics
+from fetcher.rate_limit import (
+    QuotaAdapter,
+    QuotaExceededError,
+    RequestScheduler,
+    quota_note_validator,
+    request_priority,
+)
+
+
+def make_scheduler(tmp_path, **kwargs):
+    params = dict(per_second=1000.0, burst=1, per_day=None)
+    params.update(kwargs)
+    return RequestScheduler('test', state_path=str(tmp_path / 'quota.sqlite'), **params)
+
+
+def test_token_bucket_spreads_requests(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_second=20.0, burst=1)
+
+    start = time.monotonic()
+    for _ in range(4):
+        scheduler.acquire()
+    elapsed = time.monotonic() - start
+
+    # First request uses the initial token, the next three wait ~50ms each
+    assert elapsed >= 0.14
+
+
+def test_daily_quota_persists_across_restarts(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_day=3)
+    scheduler.acquire()
+    scheduler.acquire()
+
+    restarted = make_scheduler(tmp_path, per_day=3)
+    assert restarted.remaining()['daily_remaining'] == 1
+    restarted.acquire()
+    with pytest.raises(QuotaExceededError):
+        restarted.acquire()
+
+
+def test_exhaust_blocks_until_reset(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_day=25)
+
+    scheduler.exhaust()
+
+    assert scheduler.remaining()['daily_remaining'] == 0
+    with pytest.raises(QuotaExceededError):
+        scheduler.acquire()
+
+
+def test_remaining_daily_quota_is_exported_as_a_gauge(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_day=5)
+    gauge = metrics.QUOTA_DAILY_REMAINING
+    assert gauge.value(provider='test') == 5
+
+    scheduler.acquire()
+    scheduler.acquire()
+    assert gauge.value(provider='test') == 3
+
+    scheduler.exhaust()
+    assert gauge.value(provider='test') == 0
+    assert 'stockai_quota_daily_remaining{provider="test"} 0' in metrics.export_prometheus()
+
+
+def test_waiting_requests_are_served_by_priority(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_second=10.0, burst=1)
+    scheduler.acquire()  # empty the bucket
+    order = []
+
+    def worker(name, priority):
+        scheduler.acquire(priority=priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=worker, args=('low', 20))]
+    threads[0].start()
+    time.sleep(0.02)
+    threads.append(threading.Thread(target=worker, args=('high', 1)))
+    threads[1].start()
+    for t in threads:
+        t.join()
+
+    assert order == ['high', 'low']
+
+
+def test_acquire_times_out(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_second=0.1, burst=1)
+    scheduler.acquire()
+
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(timeout=0.05)
+
+
+def test_request_priority_context_applies_to_acquire(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_second=10.0, burst=1)
+    scheduler.acquire()  # empty the bucket
+    order = []
+
+    def default_worker():
+        scheduler.acquire()
+        order.append('default')
+
+    def urgent_worker():
+        with request_priority(0):
+            scheduler.acquire()
+        order.append('urgent')
+
+    threads = [threading.Thread(target=default_worker), threading.Thread(target=urgent_worker)]
+    threads[0].start()
+    time.sleep(0.02)
+    threads[1].start()
+    for t in threads:
+        t.join()
+
+    assert order == ['urgent', 'default']
+
+
+class DummyHTTPResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def test_adapter_counts_requests_and_handles_429(tmp_path, monkeypatch):
+    scheduler = make_scheduler(tmp_path, per_day=10)
+    statuses = iter([200, 429])
+    monkeypatch.setattr(HTTPAdapter, 'send', lambda self, request, **kw: DummyHTTPResponse(next(statuses)))
+    adapter = QuotaAdapter(scheduler)
+
+    assert adapter.send(object()).status_code == 200
+    assert scheduler.remaining()['daily_remaining'] == 9
+    assert adapter.send(object()).status_code == 429
+    assert scheduler.remaining()['daily_remaining'] == 0
+
+
+def test_quota_note_validator_exhausts_on_alpha_vantage_note(tmp_path):
+    scheduler = make_scheduler(tmp_path, per_day=25)
+    validate = quota_note_validator('feed', scheduler)
+
+    assert validate(b'{"feed": []}')
+    assert scheduler.remaining()['daily_remaining'] == 25
+    # Invalid parameters are reported the same way, but are no quota note
+    assert not validate(b'{"Error Message": "Invalid API call"}')
+    assert scheduler.remaining()['daily_remaining'] == 25
+
+    assert not validate(b'{"Information": "We have detected your API key and our standard API rate limit is 25 requests per day."}')
+    assert scheduler.remaining()['daily_remaining'] == 0
+    with pytest.raises(QuotaExceededError):
+        scheduler.acquire()
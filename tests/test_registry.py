@@ -0,0 +1,58 @@
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+import registry
+from registry import LazyRegistry, import_object
+
+
+def test_import_object_accepts_both_path_styles():
+    from parser.newsapi_news_parser import NewsAPIParser
+
+    assert import_object('parser.newsapi_news_parser:NewsAPIParser') is NewsAPIParser
+    assert import_object('parser.newsapi_news_parser.NewsAPIParser') is NewsAPIParser
+
+
+def test_registry_imports_only_the_provider_looked_up(monkeypatch):
+    imported = []
+    monkeypatch.setattr(registry, 'import_object', lambda path: imported.append(path) or type('A', (), {}))
+    providers = LazyRegistry({'a': 'pkg.a:A', 'b': 'pkg.b:B'})
+
+    assert providers['a'] is providers['a']
+    assert imported == ['pkg.a:A']
+    assert sorted(providers) == ['a', 'b']
+
+
+def test_registry_adds_entry_points_without_overriding_builtins(monkeypatch):
+    found = [
+        EntryPoint('extra', 'collections:OrderedDict', 'stockai.test'),
+        EntryPoint('builtin', 'collections:Counter', 'stockai.test'),
+    ]
+    monkeypatch.setattr(registry, 'entry_points', lambda group: found if group == 'stockai.test' else [])
+    providers = LazyRegistry({'builtin': dict}, group='stockai.test')
+
+    from collections import OrderedDict
+    assert providers['extra'] is OrderedDict
+    assert providers['builtin'] is dict
+    assert 'extra' in providers and len(providers) == 2
+    with pytest.raises(KeyError):
+        providers['missing']
+
+
+def test_registry_accepts_classes_and_overrides():
+    providers = LazyRegistry({'a': 'collections:OrderedDict'})
+    providers['a'] = dict
+
+    assert providers['a'] is dict
+
+
+def test_headless_import_skips_heavy_dependencies():
+    code = (
+        'import sys, server; '
+        'print(",".join(m for m in ("streamlit", "plotly", "yfinance", "openai") if m in sys.modules))'
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ''
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from tornado.testing import AsyncHTTPTestCase
+
+from analyzer.cache import AnalysisCache
+from model.local_llm_client import LocalLLMClient
+from server import PipelineCoalescer, build_components, make_app, make_executor
+from ui.json_renderer import frame_records
+
+KEY = ('TSLA', 30, 5.0, 'en')
+
+
+def test_identical_requests_share_one_run():
+    calls = []
+    release = threading.Event()
+
+    def execute(key, emit):
+        calls.append(key)
+        emit({'event': 'prices'})
+        release.wait(5)
+        emit({'event': 'analysis', 'date': '2025-06-04'})
+        return 1
+
+    async def consume(run):
+        return [event async for event in run.stream()]
+
+    async def scenario():
+        coalescer = PipelineCoalescer(execute, ThreadPoolExecutor(max_workers=2))
+        first = coalescer.subscribe(KEY)
+        await asyncio.sleep(0.05)
+        # Joins the run already in flight and gets the earlier events replayed
+        second = coalescer.subscribe(KEY)
+        assert second is first
+        tasks = [asyncio.create_task(consume(first)), asyncio.create_task(consume(second))]
+        release.set()
+        results = await asyncio.gather(*tasks)
+        assert len(coalescer) == 0
+        return results
+
+    first, second = asyncio.run(scenario())
+
+    assert calls == [KEY]
+    assert first == second
+    assert [e['event'] for e in first] == ['prices', 'analysis', 'done']
+    assert first[-1]['total_signals'] == 1
+
+
+def test_failed_run_ends_with_error_event():
+    def execute(key, emit):
+        raise RuntimeError('no data')
+
+    async def scenario():
+        coalescer = PipelineCoalescer(execute, ThreadPoolExecutor(max_workers=1))
+        return [event async for event in coalescer.subscribe(KEY).stream()]
+
+    events = asyncio.run(scenario())
+
+    assert events == [{'event': 'error', 'message': 'no data'}]
+
+
+class MockServerTest(AsyncHTTPTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.tmp_dir, 'analysis_cache.sqlite')
+        self.model_client = LocalLLMClient()
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def get_app(self):
+        components = build_components(
+            mock=True, price_file='tests/TSLA_daily.json', news_file='tests/TSLA_news_3months.json',
+            cache_path=self.cache_path, model_client=self.model_client
+        )
+        return make_app(make_executor(components), max_workers=1)
+
+    def test_streams_ndjson_analysis_per_signal(self):
+        response = self.fetch('/api/analyze?symbol=TSLA&period=30&threshold=5&lang=en')
+
+        assert response.code == 200
+        events = [json.loads(line) for line in response.body.decode('utf-8').splitlines()]
+        kinds = [e['event'] for e in events]
+        assert kinds[:3] == ['prices', 'signals', 'progress']
+        assert kinds[-1] == 'done'
+        analyses = [e for e in events if e['event'] == 'analysis']
+        assert [a['date'] for a in analyses] == events[1]['dates']
+        assert analyses and all(abs(a['pct_change']) >= 5 for a in analyses)
+        assert all(a['news'] for a in analyses)
+        assert all(re.fullmatch(r'\[local stub\] received a prompt of \d+ characters', a['analysis']) for a in analyses)
+        # Every analysis came from this test's client and went to its own cache
+        assert self.model_client.stats()['requests'] == len(analyses)
+        assert len(AnalysisCache(self.cache_path)) == len(analyses)
+
+    def test_rejects_unsupported_period(self):
+        response = self.fetch('/api/analyze?symbol=TSLA&period=3')
+
+        assert response.code == 400
+        assert json.loads(response.body)['event'] == 'error'
+
+    def test_exports_pipeline_metrics(self):
+        self.fetch('/api/analyze?symbol=TSLA&period=30&threshold=5&lang=en')
+
+        text = self.fetch('/metrics').body.decode('utf-8')
+        snapshot = json.loads(self.fetch('/metrics.json').body)
+
+        assert 'stockai_fetch_requests_total{provider="MockPriceFetcher",method="fetch"}' in text
+        assert 'stockai_parse_latency_seconds_bucket' in text
+        assert snapshot['stockai_llm_requests_total']['type'] == 'counter'
+        assert snapshot['stockai_llm_requests_total']['samples']
+        assert snapshot['stockai_parse_rows_total']['samples']
+
+
+def test_frame_records_turn_missing_values_into_null():
+    df = pd.DataFrame({
+        'publishedAt': [pd.NaT, pd.Timestamp('2025-06-02T10:00:00Z')],
+        'score': [float('nan'), 1.5],
+    })
+
+    records = frame_records(df)
+
+    assert json.loads(json.dumps(records)) == [
+        {'publishedAt': None, 'score': None},
+        {'publishedAt': '2025-06-02T10:00:00+00:00', 'score': 1.5},
+    ]
@@ -0,0 +1,101 @@
+import copy
+import pandas as pd
+
+import app
+from fetcher.base import Fetcher
+from parser.base import Parser
+from tests.test_app import PassThroughParser, StreamingNewsFetcher, StreamingParser
+from ui.streamlit_cache import MemoizedFetcher, MemoizedParser, clear_data_cache
+
+
+class CountingFetcher(Fetcher):
+    SUPPORTS_RANGE = True
+
+    def _init(self):
+        self.calls = []
+
+    def _fetch(self, symbol, period):
+        self.calls.append((symbol, period))
+        return symbol, pd.DataFrame({'Close': [1.0, 2.0]})
+
+    def _fetch_range(self, name, time_from, time_to):
+        self.calls.append((name, time_from, time_to))
+        return [{'title': name}]
+
+    def fetch_company_name(self, symbol):
+        return f'{symbol} Inc.'
+
+
+class CountingParser(Parser):
+    def __init__(self):
+        self.calls = 0
+
+    def _parse(self, raw_data):
+        self.calls += 1
+        return raw_data.rename(columns=str.lower)
+
+
+def test_memoized_fetcher_reuses_results_per_arguments():
+    clear_data_cache()
+    inner = CountingFetcher()
+    fetcher = MemoizedFetcher(inner, key='test_fetcher')
+
+    first = fetcher.fetch('TSLA', 30)
+    second = fetcher.fetch('TSLA', 30)
+    fetcher.fetch('TSLA', 7)
+
+    assert inner.calls == [('TSLA', 30), ('TSLA', 7)]
+    pd.testing.assert_frame_equal(first[1], second[1])
+    assert fetcher.SUPPORTS_RANGE
+    assert fetcher.fetch_company_name('TSLA') == 'TSLA Inc.'
+
+
+def test_memoized_fetcher_range_is_keyed_on_dates():
+    clear_data_cache()
+    inner = CountingFetcher()
+    fetcher = MemoizedFetcher(inner, key='test_fetcher')
+    start, end = pd.Timestamp('2025-07-01'), pd.Timestamp('2025-07-10')
+
+    fetcher.fetch_range('Tesla', start, end)
+    fetcher.fetch_range('Tesla', start, end)
+    fetcher.fetch_range('Tesla', start, end + pd.Timedelta(days=1))
+
+    assert len(inner.calls) == 2
+
+
+def test_memoized_parser_returns_independent_copies():
+    clear_data_cache()
+    inner = CountingParser()
+    parser = MemoizedParser(inner, key='test_parser')
+    raw = pd.DataFrame({'Close': [1.0, 2.0]})
+
+    parsed = parser.parse(raw)
+    # Later stages add columns in place, that must not leak into the cache
+    parsed['pct_change'] = 0.0
+    again = parser.parse(raw.copy())
+
+    assert inner.calls == 1
+    assert list(again.columns) == ['close']
+
+
+def test_memoized_fetcher_without_inner_raises_attribute_error():
+    bare = MemoizedFetcher.__new__(MemoizedFetcher)
+
+    assert not hasattr(bare, 'fetch_company_name')
+    clone = copy.copy(MemoizedFetcher(CountingFetcher(), key='counting'))
+    assert clone.key == 'counting'
+
+
+def test_memoized_wrappers_keep_the_streaming_path():
+    clear_data_cache()
+    inner = StreamingNewsFetcher()
+    fetcher = MemoizedFetcher(inner, key='test_stream_fetcher')
+    parser = MemoizedParser(StreamingParser(), key='test_stream_parser')
+    signal_date = pd.Timestamp('2025-06-03')
+
+    df_news = app.load_signal_news('Tesla', signal_date, fetcher, parser)
+
+    assert fetcher.SUPPORTS_STREAM
+    assert list(df_news['title']) == ['News 2025-06-03']
+    assert inner.stream_calls == [signal_date] and inner.calls == []
+    assert not hasattr(MemoizedParser(PassThroughParser(), key='test_plain_parser'), 'parse_stream')
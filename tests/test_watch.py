@@ -0,0 +1,120 @@
+import pandas as pd
+
+import app
+from analyzer.signal_ledger import SignalLedger
+from fetcher.price_store import PriceStore
+from fetcher.stored_price_fetcher import StoredPriceFetcher
+from parser.yfinance_price_parser import YFinanceParser
+from watch import Watcher
+from tests.test_app import FakeNewsFetcher, PassThroughParser
+from tests.test_price_store import FakeHistoryFetcher
+
+
+def make_bars(closes):
+    """Daily bars ending today with the given closes."""
+    today = pd.Timestamp.now().normalize()
+    index = pd.date_range(end=today, periods=len(closes), freq='D', tz='America/New_York', name='Date')
+    return pd.DataFrame({'Close': closes, 'Volume': [1000] * len(closes)}, index=index)
+
+
+def make_watcher(tmp_path, inner, lookback_days=30):
+    events = []
+    watcher = Watcher(
+        symbols=['tsla'],
+        threshold=5.0,
+        lang='en',
+        price_fetcher=StoredPriceFetcher(inner=inner, store=PriceStore(str(tmp_path / 'prices')), refresh_seconds=0),
+        price_parser=YFinanceParser(),
+        news_fetcher=FakeNewsFetcher(),
+        news_parser=PassThroughParser(),
+        ledger=SignalLedger(str(tmp_path / 'watch.sqlite')),
+        emit=events.append,
+        lookback_days=lookback_days
+    )
+    return watcher, events
+
+
+def fake_llm(monkeypatch, calls, fail_dates=()):
+    def analyze(df_news, signal_date, pct_change, symbol, lang, on_token=None, model_client=None):
+        calls.append(signal_date.normalize().tz_localize(None))
+        if signal_date.normalize().tz_localize(None) in fail_dates:
+            return 'LLM analysis failed: timeout'
+        return f'analysis {signal_date.date()}'
+    monkeypatch.setattr(app, 'analyze_news_with_openai', analyze)
+
+
+def test_watcher_analyzes_each_signal_once(tmp_path, monkeypatch):
+    calls = []
+    fake_llm(monkeypatch, calls)
+    inner = FakeHistoryFetcher(make_bars([100.0, 110.0, 111.0, 100.0, 101.0]))
+    watcher, events = make_watcher(tmp_path, inner)
+
+    first = watcher.poll()
+    second = watcher.poll()
+
+    assert len(first['TSLA']) == 2
+    assert second == {'TSLA': []}
+    assert len(calls) == 2
+    assert [e['symbol'] for e in events] == ['TSLA', 'TSLA']
+    assert events[0]['analysis'].startswith('analysis')
+
+
+def test_watcher_only_checks_new_bars_and_survives_restart(tmp_path, monkeypatch):
+    calls = []
+    fake_llm(monkeypatch, calls)
+    bars = make_bars([100.0, 110.0, 111.0, 112.0, 120.0])
+    inner = FakeHistoryFetcher(bars.iloc[:4])
+    watcher, _ = make_watcher(tmp_path, inner)
+    watcher.poll()
+    assert len(calls) == 1
+
+    # A new bar arrives; a restarted watcher reuses the ledger and the store
+    inner.bars = bars
+    restarted, events = make_watcher(tmp_path, inner)
+    analyzed = restarted.poll()
+
+    assert analyzed['TSLA'] == [bars.index[-1]]
+    assert len(calls) == 2
+    assert [e['date'] for e in events] == [bars.index[-1].strftime('%Y-%m-%d')]
+
+
+def test_watcher_first_poll_only_looks_back_lookback_days(tmp_path, monkeypatch):
+    calls = []
+    fake_llm(monkeypatch, calls)
+    inner = FakeHistoryFetcher(make_bars([100.0, 120.0, 121.0, 122.0, 123.0]))
+    watcher, _ = make_watcher(tmp_path, inner, lookback_days=2)
+
+    assert watcher.poll() == {'TSLA': []}
+    assert calls == []
+
+
+def test_watcher_retries_failed_analysis(tmp_path, monkeypatch):
+    bars = make_bars([100.0, 110.0, 111.0])
+    calls = []
+    fake_llm(monkeypatch, calls, fail_dates={bars.index[1].normalize().tz_localize(None)})
+    watcher, events = make_watcher(tmp_path, FakeHistoryFetcher(bars))
+
+    assert watcher.poll() == {'TSLA': []}
+    assert len(watcher.ledger.pending('TSLA')) == 1
+
+    fake_llm(monkeypatch, calls)
+    assert len(watcher.poll()['TSLA']) == 1
+    assert watcher.ledger.pending('TSLA') == []
+    assert len(events) == 1
+
+
+def test_signal_ledger_records_signals_and_cursor(tmp_path):
+    ledger = SignalLedger(str(tmp_path / 'watch.sqlite'))
+    date = pd.Timestamp('2025-06-03', tz='America/New_York')
+
+    assert ledger.add('TSLA', date, 7.5)
+    assert not ledger.add('TSLA', date, 7.5)
+    assert ledger.pending('TSLA') == [(date, 7.5)]
+
+    ledger.mark_analyzed('TSLA', date)
+    assert ledger.is_analyzed('TSLA', date)
+    assert ledger.pending('TSLA') == []
+
+    assert ledger.last_bar('TSLA') is None
+    ledger.set_last_bar('TSLA', date)
+    assert SignalLedger(str(tmp_path / 'watch.sqlite')).last_bar('TSLA') == date
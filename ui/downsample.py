@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from typing import Iterable
+
+
+def lttb_indices(y: np.ndarray, n_out: int, x: np.ndarray = None) -> np.ndarray:
+    """
+    Positions of the points kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the point kept in the
+    previous bucket and the average of the next bucket, which preserves the
+    visual shape (peaks, troughs) of the series.
+
+    Args:
+        y: Values of the series.
+        n_out: Number of points to keep (at least 3).
+        x: Positions of the points, default evenly spaced.
+
+    Returns:
+        np.ndarray: Sorted integer positions into `y`.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # Bucket boundaries of the n - 2 inner points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((x[prev] - next_x) * (by - y[prev]) - (x[prev] - bx) * (next_y - y[prev]))
+        # NaN gaps never win a bucket over a real point
+        prev = start + int(np.nanargmax(area)) if not np.isnan(area).all() else start
+        kept[i + 1] = prev
+    return kept
+
+
+def downsample(df: pd.DataFrame, column: str, n_out: int, keep: Iterable = ()) -> pd.DataFrame:
+    """
+    Rows of `df` chosen by LTTB on `column`, plus every row whose index label
+    is in `keep` (e.g. signal dates), in the original order.
+
+    Returns `df` itself when it already has at most `n_out` rows.
+    """
+    if len(df) <= n_out:
+        return df
+    x = df.index.asi8 if isinstance(df.index, pd.DatetimeIndex) else None
+    positions = lttb_indices(df[column].to_numpy(dtype=float), n_out, x)
+    required = df.index.get_indexer(pd.Index(list(keep)))
+    positions = np.union1d(positions, required[required >= 0])
+    return df.iloc[positions]
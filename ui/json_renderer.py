@@ -0,0 +1,93 @@
+import pandas as pd
+from typing import Any, Callable, Dict, List, Tuple
+from .base import Renderer
+import config_ui
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    Convert pandas/NumPy scalars to plain JSON values (NaN, NaT and other
+    missing values become None).
+    """
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        value = value.item()
+    return value
+
+
+def frame_records(df: pd.DataFrame, index_name: str = None) -> List[Dict[str, Any]]:
+    """
+    Rows of `df` as JSON-ready dicts, with the index under `index_name` if given.
+    """
+    if df is None or df.empty:
+        return []
+    records = []
+    for index, row in zip(df.index, df.itertuples(index=False, name=None)):
+        record = {} if index_name is None else {index_name: to_json_value(index)}
+        record.update({column: to_json_value(value) for column, value in zip(df.columns, row)})
+        records.append(record)
+    return records
+
+
+class JSONRenderer(Renderer):
+    """
+    Renderer that turns every rendering step of `app.run` into a JSON event
+    passed to `emit`, for headless consumers such as the API server.
+    """
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], None]):
+        self.emit = emit
+
+    def render_price_chart(self, df_prices: pd.DataFrame, signal_dates: List[pd.Timestamp], lang: str) -> bool:
+        prices = df_prices.copy()
+        prices.index = prices.index.strftime('%Y-%m-%d')
+        self.emit({'event': 'prices', 'prices': frame_records(prices, index_name='date')})
+        self.emit({'event': 'signals', 'dates': [d.strftime('%Y-%m-%d') for d in signal_dates]})
+        return bool(signal_dates)
+
+    def render_analysis_header(self, lang: str) -> None:
+        pass
+
+    def show_analysis_progress_info(self, total_signals: int, lang: str, estimated_seconds: float = None) -> None:
+        self.emit({'event': 'progress', 'total_signals': total_signals, 'estimated_seconds': estimated_seconds})
+
+    def render_single_llm_analysis(
+        self,
+        signal_date: pd.Timestamp,
+        llm_analysis: str,
+        pct_change: float,
+        lang: str,
+        df_news: pd.DataFrame = None
+    ) -> None:
+        self.emit({
+            'event': 'analysis',
+            'date': signal_date.strftime('%Y-%m-%d'),
+            'pct_change': to_json_value(pct_change),
+            'analysis': llm_analysis,
+            'news': frame_records(df_news),
+        })
+
+    def render_llm_analysis(self, association: Dict[pd.Timestamp, Dict], df_prices: pd.DataFrame, lang: str) -> None:
+        for signal_date, item in sorted(association.items()):
+            self.render_single_llm_analysis(
+                signal_date, item['llm_analysis'], df_prices.loc[signal_date]['pct_change'], lang, item['news']
+            )
+
+    def add_separator(self) -> None:
+        pass
+
+    def render_language_selector(self) -> str:
+        return config_ui.DEFAULT_LANGUAGE
+
+    def sidebar_controls(self, lang: str) -> Tuple[str, int, float]:
+        return (
+            config_ui.DEFAULT_COMPANY,
+            config_ui.PERIOD_DAYS[config_ui.DEFAULT_PERIOD],
+            config_ui.DEFAULT_PRICE_MOVE_THRESHOLD,
+        )
+
+    def render_title(self, lang: str, title: str = None) -> None:
+        pass
@@ -0,0 +1,113 @@
+import streamlit as st
+from collections.abc import Iterator
+from typing import Any, Dict, Tuple
+
+import config
+from analyzer.cache import AnalysisCache
+from fetcher.base import Fetcher
+from parser.base import Parser
+
+# Streamlit reruns the whole script on every widget interaction. The wrappers
+# below keep fetched and parsed data across reruns and sessions (st.cache_data),
+# and the fetcher/parser instances themselves for the life of the process
+# (st.cache_resource), so only stages whose inputs changed run again.
+
+
+@st.cache_data(ttl=config.STREAMLIT_CACHE_TTL, max_entries=config.STREAMLIT_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_fetch(key: str, method: str, args: Tuple, kwargs: Dict, _fetcher: Fetcher) -> Any:
+    # `_fetcher` is left out of the hash; `key` identifies it instead
+    return getattr(_fetcher, method)(*args, **kwargs)
+
+
+@st.cache_data(ttl=config.STREAMLIT_CACHE_TTL, max_entries=config.STREAMLIT_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_parse(key: str, raw_data: Any, _parser: Parser) -> Any:
+    return _parser.parse(raw_data)
+
+
+class MemoizedFetcher(Fetcher):
+    """
+    Fetcher whose results are memoized on (`key`, call arguments).
+
+    Failed fetches raise as usual and are not memoized. Streamed fetches go
+    straight to the inner fetcher: an iterator cannot be memoized (repeated
+    requests are still served by the HTTP cache).
+    """
+    def _init(self, inner: Fetcher, key: str):
+        self.inner = inner
+        self.key = key
+        self.SUPPORTS_RANGE = inner.SUPPORTS_RANGE
+        self.SUPPORTS_STREAM = inner.SUPPORTS_STREAM
+
+    def _fetch(self, *args, **kwargs):
+        return _cached_fetch(self.key, 'fetch', args, kwargs, _fetcher=self.inner)
+
+    def _fetch_range(self, *args, **kwargs):
+        return _cached_fetch(self.key, 'fetch_range', args, kwargs, _fetcher=self.inner)
+
+    def _fetch_stream(self, *args, **kwargs):
+        return self.inner.fetch_stream(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # Anything else (e.g. fetch_company_name) goes straight to the inner fetcher
+        # (looked up in __dict__: before _init, e.g. while copying, there is none)
+        inner = self.__dict__.get('inner')
+        if inner is None:
+            raise AttributeError(name)
+        return getattr(inner, name)
+
+
+class MemoizedParser(Parser):
+    """
+    Parser whose results are memoized on (`key`, raw data).
+
+    Streamed input (an iterator, see Fetcher.fetch_stream) is parsed by the
+    inner parser directly, it can be neither hashed nor read twice.
+    """
+    def __init__(self, inner: Parser, key: str):
+        self.inner = inner
+        self.key = key
+
+    def _parse(self, raw_data):
+        if isinstance(raw_data, Iterator):
+            return self.inner.parse(raw_data)
+        return _cached_parse(self.key, raw_data, _parser=self.inner)
+
+    def __getattr__(self, name):
+        # Capabilities such as parse_stream are those of the inner parser
+        inner = self.__dict__.get('inner')
+        if inner is None:
+            raise AttributeError(name)
+        return getattr(inner, name)
+
+
+@st.cache_resource(show_spinner=False)
+def get_news_fetcher(name: str, api_key: str) -> MemoizedFetcher:
+    return MemoizedFetcher(config.NEWS_FETCHERS[name](api_key=api_key), key=f'news_fetcher:{name}')
+
+
+@st.cache_resource(show_spinner=False)
+def get_price_fetcher(name: str) -> MemoizedFetcher:
+    return MemoizedFetcher(config.PRICE_FETCHERS[name](), key=f'price_fetcher:{name}')
+
+
+@st.cache_resource(show_spinner=False)
+def get_news_parser(name: str) -> MemoizedParser:
+    return MemoizedParser(config.NEWS_PARSERS[name](), key=f'news_parser:{name}')
+
+
+@st.cache_resource(show_spinner=False)
+def get_price_parser(name: str) -> MemoizedParser:
+    return MemoizedParser(config.PRICE_PARSERS[name](), key=f'price_parser:{name}')
+
+
+@st.cache_resource(show_spinner=False)
+def get_analysis_cache(path: str, max_entries: int) -> AnalysisCache:
+    return AnalysisCache(path, max_entries)
+
+
+def clear_data_cache() -> None:
+    """
+    Drop the memoized data of every session, e.g. after a manual refresh.
+    """
+    _cached_fetch.clear()
+    _cached_parse.clear()
@@ -1,16 +1,116 @@
+import time
 import streamlit as st
 import plotly.graph_objs as go
 import pandas as pd
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterable, List, Any, Tuple
 from .base import Renderer
+from .downsample import downsample
 import config_ui
 from config_lang import LANG_CONFIG
 
+
+def build_price_figure(
+    df_prices: pd.DataFrame,
+    signal_dates: List[pd.Timestamp],
+    lang: str
+) -> go.Figure:
+    """
+    Build the closing price chart with a marker on every signal date.
+
+    All signal markers share one trace whose hover values come from per-point
+    `customdata`. Series longer than config_ui.CHART_WEBGL_MIN_POINTS are drawn
+    with WebGL, and those longer than config_ui.CHART_MAX_POINTS are
+    downsampled with LTTB (signal dates are always kept).
+
+    Args:
+        df_prices: DataFrame indexed by date with 'close' and 'pct_change' columns.
+        signal_dates: List of significant move dates to mark on the chart.
+        lang: Language code for UI text
+
+    Returns:
+        go.Figure: The chart, ready for st.plotly_chart.
+    """
+    texts = LANG_CONFIG.get(lang, LANG_CONFIG['en'])['ui']
+    scatter = go.Scattergl if len(df_prices) > config_ui.CHART_WEBGL_MIN_POINTS else go.Scatter
+
+    # Create the figure
+    fig = go.Figure()
+
+    # Add closing price line
+    line = downsample(df_prices, 'close', config_ui.CHART_MAX_POINTS, keep=signal_dates)
+    fig.add_trace(scatter(
+        x=line.index,
+        y=line['close'],
+        mode='lines',
+        name=texts["close_price"]
+    ))
+
+    # Add one marker per signal date, all in a single trace
+    signals = df_prices.loc[df_prices.index.intersection(pd.DatetimeIndex(signal_dates))]
+    if not signals.empty:
+        if texts["hover_date_format"] == "custom":
+            # For Chinese, use custom formatted date
+            date_text = "%{customdata[0]}"
+        else:
+            # For English, use Plotly's built-in date formatting
+            date_text = "%{x|%Y-%m-%d}"
+
+        hovertemplate = (
+            f'{texts["hover_date_label"]}: {date_text}<br>' +
+            f'{texts["hover_close_label"]}: %{{y:.2f}}<br>' +
+            f'{texts["hover_change_label"]}: %{{customdata[1]:.2f}}%<br>'
+        )
+
+        fig.add_trace(scatter(
+            x=signals.index,
+            y=signals['close'],
+            mode='markers',
+            marker=dict(color='red', size=10),
+            name=texts["signal"],
+            customdata=list(zip(
+                signals.index.strftime(texts["date_format"]),
+                signals['pct_change'].astype(float),
+            )),
+            hovertemplate=hovertemplate
+        ))
+
+    # Update layout with language-specific formatting
+    layout_config = {
+        'title': texts["chart_title"],
+        'xaxis_title': texts["chart_xaxis"],
+        'yaxis_title': texts["chart_yaxis"],
+        'hovermode': 'closest'
+    }
+
+    # Add Chinese-specific formatting if needed
+    if lang == 'zh':
+        layout_config['xaxis'] = dict(
+            tickformat=texts["chart_date_format"],
+            tickangle=45
+        )
+
+    fig.update_layout(**layout_config)
+    return fig
+
+
+def analysis_title(signal_date: pd.Timestamp, pct_change: float, lang: str) -> str:
+    """
+    Expander title of one signal's analysis.
+    """
+    change_text = f"{pct_change:.2f}%"
+    if lang == 'zh':
+        return f"📅 {signal_date.date()} 变动{change_text}分析"
+    return f"📅 {signal_date.date()} Analysis ({change_text} change)"
+
+
 class StreamlitRenderer(Renderer):
     """
     Streamlit-specific implementation of the Renderer interface.
     Renders charts and news/summaries using Streamlit components.
     """
+
+    # Minimum interval between two redraws of a streamed analysis
+    STREAM_REFRESH_SECONDS = 0.05
     
     def __init__(self):
         """
@@ -111,65 +211,7 @@ class StreamlitRenderer(Renderer):
             st.info(texts["try_lower_threshold"])
             return False
         
-        # Create the figure
-        fig = go.Figure()
-        
-        # Add closing price line
-        fig.add_trace(go.Scatter(
-            x=df_prices.index,
-            y=df_prices['close'],
-            mode='lines',
-            name=texts["close_price"]
-        ))
-        
-        # Add markers for each signal date
-        for date in signal_dates:
-            if date in df_prices.index:
-                price = df_prices.at[date, 'close']
-                pct_change = df_prices.at[date, 'pct_change']
-                
-                # Format date display based on language configuration
-                date_display = date.strftime(texts["date_format"])
-                
-                # Create hover template using language-specific labels and format
-                if texts["hover_date_format"] == "custom":
-                    # For Chinese, use custom formatted date
-                    date_text = date_display
-                else:
-                    # For English, use Plotly's built-in date formatting
-                    date_text = "%{x|%Y-%m-%d}"
-                
-                hovertemplate = (
-                    f'{texts["hover_date_label"]}: {date_text}<br>' +
-                    f'{texts["hover_close_label"]}: %{{y:.2f}}<br>' +
-                    f'{texts["hover_change_label"]}: {pct_change:.2f}%<br>'
-                )
-                
-                fig.add_trace(go.Scatter(
-                    x=[date],
-                    y=[price],
-                    mode='markers',
-                    marker=dict(color='red', size=10),
-                    name=f'{texts["signal"]} {date_display}',
-                    hovertemplate=hovertemplate
-                ))
-        
-        # Update layout with language-specific formatting
-        layout_config = {
-            'title': texts["chart_title"],
-            'xaxis_title': texts["chart_xaxis"],
-            'yaxis_title': texts["chart_yaxis"],
-            'hovermode': 'closest'
-        }
-        
-        # Add Chinese-specific formatting if needed
-        if lang == 'zh':
-            layout_config['xaxis'] = dict(
-                tickformat=texts["chart_date_format"],
-                tickangle=45
-            )
-        
-        fig.update_layout(**layout_config)
+        fig = build_price_figure(df_prices, signal_dates, lang)
         
         # Render the chart in Streamlit
         st.plotly_chart(fig, use_container_width=True)
@@ -197,13 +239,7 @@ class StreamlitRenderer(Renderer):
             llm_analysis = data.get('llm_analysis', '')
             if llm_analysis:
                 pct_change = df_prices.loc[date]['pct_change']
-                change_text = f"{pct_change:.2f}%"
-                if lang == 'zh':
-                    expander_title = f"📅 {date.date()} 变动{change_text}分析"
-                else:
-                    expander_title = f"📅 {date.date()} Analysis ({change_text} change)"
-                    
-                with st.expander(expander_title, expanded=True):
+                with st.expander(analysis_title(date, pct_change, lang), expanded=True):
                     st.markdown(llm_analysis)
             else:
                 if lang == 'zh':
@@ -321,29 +357,24 @@ class StreamlitRenderer(Renderer):
         signal_date: pd.Timestamp,
         llm_analysis: str,
         pct_change: float,
-        lang: str
+        lang: str,
+        df_news: pd.DataFrame = None
     ) -> None:
         """
-        Render a single LLM analysis result.
-        Note: Due to Streamlit's rendering mechanism, this will be displayed 
-        with other results when the script completes execution.
+        Render a single, complete LLM analysis result.
+        See `render_llm_analysis_stream` to show an analysis while it is generated.
         
         Args:
             signal_date: The date of the signal
             llm_analysis: The LLM analysis text
             pct_change: The percentage change for that date
             lang: Language code for UI text
+            df_news: The news the analysis is based on (not shown here)
         """
         texts = LANG_CONFIG.get(lang, LANG_CONFIG['en'])['ui']
         
         if llm_analysis and llm_analysis.strip():
-            change_text = f"{pct_change:.2f}%"
-            if lang == 'zh':
-                expander_title = f"📅 {signal_date.date()} 变动{change_text}分析"
-            else:
-                expander_title = f"📅 {signal_date.date()} Analysis ({change_text} change)"
-                
-            with st.expander(expander_title, expanded=True):
+            with st.expander(analysis_title(signal_date, pct_change, lang), expanded=True):
                 st.markdown(llm_analysis)
         else:
             if lang == 'zh':
@@ -351,6 +382,46 @@ class StreamlitRenderer(Renderer):
             else:
                 st.info(f"📅 {signal_date.date()}: {texts['no_analysis']}")
 
+    def render_llm_analysis_stream(
+        self,
+        signal_date: pd.Timestamp,
+        tokens: Iterable[str],
+        pct_change: float,
+        lang: str
+    ) -> str:
+        """
+        Render one LLM analysis while it is being generated: every piece read
+        from `tokens` is appended to a live placeholder, so the text starts to
+        show with the model's first token.
+
+        Args:
+            signal_date: The date of the signal
+            tokens: Pieces of the analysis text, ending when it is complete
+            pct_change: The percentage change for that date
+            lang: Language code for UI text
+
+        Returns:
+            str: The full text that was rendered.
+        """
+        texts = LANG_CONFIG.get(lang, LANG_CONFIG['en'])['ui']
+
+        with st.expander(analysis_title(signal_date, pct_change, lang), expanded=True):
+            placeholder = st.empty()
+            text = ""
+            last_refresh = 0.0
+            for piece in tokens:
+                text += piece
+                now = time.monotonic()
+                if now - last_refresh >= self.STREAM_REFRESH_SECONDS:
+                    placeholder.markdown(text + "▌")
+                    last_refresh = now
+
+            if text.strip():
+                placeholder.markdown(text)
+            else:
+                placeholder.info(f"📅 {signal_date.date()}: {texts['no_analysis']}")
+        return text
+
     def render_analysis_header(self, lang: str) -> None:
         """
         Render the analysis section header.
@@ -365,22 +436,23 @@ class StreamlitRenderer(Renderer):
         """Add a visual separator."""
         st.markdown("---")
 
-    def show_analysis_progress_info(self, total_signals: int, lang: str) -> None:
+    def show_analysis_progress_info(self, total_signals: int, lang: str, estimated_seconds: float = None) -> None:
         """
         Show progress information before analysis starts.
         
         Args:
             total_signals: Total number of signals to analyze
             lang: Language code for UI text
+            estimated_seconds: Expected duration from the model's observed
+                latency, None when there is no measurement yet
         """
-        texts = LANG_CONFIG.get(lang, LANG_CONFIG['en'])['ui']
-        
-        # Estimate processing time (assuming ~3 seconds per signal for LLM analysis)
-        estimated_time = total_signals * 3
-        
         if lang == 'zh':
-            info_text = f"🔍 检测到 {total_signals} 个异动信号，正在进行AI分析，预计需要 {estimated_time} 秒..."
+            info_text = f"🔍 检测到 {total_signals} 个异动信号，正在进行AI分析，结果将在生成时逐步显示"
+            if estimated_seconds:
+                info_text += f"（预计共需约 {estimated_seconds:.0f} 秒）"
         else:
-            info_text = f"🔍 Detected {total_signals} significant moves. Running AI analysis, estimated time: {estimated_time} seconds..."
+            info_text = f"🔍 Detected {total_signals} significant moves. Running AI analysis, results appear as they are generated"
+            if estimated_seconds:
+                info_text += f" (about {estimated_seconds:.0f} seconds in total)"
         
-        st.info(info_text)
+        st.info(info_text + "...")
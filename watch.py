@@ -0,0 +1,224 @@
+"""
+Continuous watch mode: analyze new significant moves of a watchlist as they happen.
+
+    python watch.py --symbols TSLA,AAPL [--interval 300] [--threshold 5] [--lang en] [--once]
+
+Every `interval` seconds the stored prices of each symbol are brought up to
+date, moves are detected over the bars added since the previous poll only,
+and news fetch plus LLM analysis run just for signals not seen before. The
+seen signals are kept in config.WATCH_STATE_PATH, so a restart does not pay
+for them again. Each analysis is printed as one JSON object per line, in the
+format of the API server's `analysis` events plus the `symbol`.
+"""
+import argparse
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence
+
+import pandas as pd
+
+import app
+import config
+from analyzer.cache import AnalysisCache
+from analyzer.moves import detect_significant_moves
+from analyzer.openai import is_incomplete_analysis
+from analyzer.signal_ledger import SignalLedger
+from config_lang import LANG_CONFIG
+from fetcher.base import Fetcher
+from fetcher.rate_limit import PRIORITY_BACKGROUND, request_priority
+from fetcher.stored_price_fetcher import StoredPriceFetcher
+from parser.base import Parser
+from ui.json_renderer import frame_records, to_json_value
+
+logger = logging.getLogger(__name__)
+
+
+class Watcher:
+    """
+    Polls a watchlist and analyzes each significant move once.
+
+    Per symbol the ledger keeps a cursor, the last bar whose move is final.
+    A poll loads the stored bars from the cursor on (the cursor bar only
+    provides the previous close) and detects moves on the later ones. The
+    newest bar may still be partial, so the cursor stops one bar short of it
+    and it is checked again on the next poll; the ledger makes sure a signal
+    found on it is analyzed only once. On the first poll of a symbol the last
+    `lookback_days` are checked.
+
+    Signals whose analysis failed or was cut off by the LLM deadline (news
+    fetch error, LLM error, partial answer) stay pending in the ledger and
+    are retried on the next poll.
+
+    Args:
+        symbols: Ticker symbols to watch.
+        threshold: Move threshold in percent.
+        lang: Language of the analyses.
+        price_fetcher: Incremental price source (its store is read directly).
+        price_parser: Parser turning the stored bars into a 'close' frame.
+        news_fetcher, news_parser: News source of the analyses.
+        ledger: Persistent record of the seen signals.
+        analysis_cache: Optional cache of LLM analyses.
+        emit: Called (from a worker thread) with one event per analysis.
+        lookback_days: Days checked on the first poll of a symbol.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        threshold: float,
+        lang: str,
+        price_fetcher: StoredPriceFetcher,
+        price_parser: Parser,
+        news_fetcher: Fetcher,
+        news_parser: Parser,
+        ledger: SignalLedger,
+        analysis_cache: AnalysisCache = None,
+        emit: Callable[[Dict[str, Any]], None] = None,
+        lookback_days: int = None
+    ):
+        self.symbols = [s.upper() for s in symbols]
+        self.threshold = threshold
+        self.lang = lang
+        self.price_fetcher = price_fetcher
+        self.price_parser = price_parser
+        self.news_fetcher = news_fetcher
+        self.news_parser = news_parser
+        self.ledger = ledger
+        self.analysis_cache = analysis_cache
+        self.emit = emit or (lambda event: None)
+        self.lookback_days = lookback_days or config.WATCH_LOOKBACK_DAYS
+        self._company_names: Dict[str, str] = {}
+
+    def new_signals(self, symbol: str) -> Dict[pd.Timestamp, float]:
+        """
+        Update the prices of `symbol` and record the moves found in its new
+        bars; returns the recorded signals not analyzed yet (date -> pct_change).
+        """
+        self.price_fetcher.update(symbol)
+        cursor = self.ledger.last_bar(symbol)
+        start = cursor
+        if start is None:
+            start = pd.Timestamp.now().normalize() - pd.Timedelta(days=self.lookback_days)
+        bars = self.price_fetcher.store.load(symbol, start=start)
+
+        if len(bars) >= 2:
+            df_prices = self.price_parser.parse(bars)
+            for signal_date in detect_significant_moves(df_prices, self.threshold):
+                if cursor is not None and signal_date <= cursor:
+                    continue
+                if self.ledger.add(symbol, signal_date, df_prices.at[signal_date, 'pct_change']):
+                    logger.info(f'New signal {symbol} {signal_date:%Y-%m-%d}')
+            self.ledger.set_last_bar(symbol, df_prices.index[-2])
+
+        return dict(self.ledger.pending(symbol))
+
+    def company_name(self, symbol: str) -> str:
+        if symbol not in self._company_names:
+            self._company_names[symbol] = self.price_fetcher.inner.fetch_company_name(symbol)
+        return self._company_names[symbol]
+
+    def analyze(self, symbol: str, signal_date: pd.Timestamp, pct_change: float) -> bool:
+        """
+        Analyze one signal and emit it; True once it is done for good.
+        """
+        try:
+            df_news, llm_analysis = app.analyze_signal(
+                symbol, self.company_name(symbol), signal_date, pct_change, self.lang,
+                self.news_fetcher, self.news_parser, self.analysis_cache
+            )
+        except Exception as e:
+            logger.error(f'Analysis of {symbol} {signal_date:%Y-%m-%d} failed, retrying next poll: {e}')
+            return False
+        if is_incomplete_analysis(llm_analysis, self.lang):
+            logger.warning(f'Analysis of {symbol} {signal_date:%Y-%m-%d} is incomplete, retrying next poll')
+            return False
+
+        self.emit({
+            'event': 'analysis',
+            'symbol': symbol,
+            'date': signal_date.strftime('%Y-%m-%d'),
+            'pct_change': to_json_value(pct_change),
+            'analysis': llm_analysis,
+            'news': frame_records(df_news),
+        })
+        self.ledger.mark_analyzed(symbol, signal_date)
+        return True
+
+    def poll_symbol(self, symbol: str) -> List[pd.Timestamp]:
+        """
+        One poll of `symbol`; returns the dates analyzed by it.
+        """
+        analyzed = []
+        for signal_date, pct_change in self.new_signals(symbol).items():
+            if self.analyze(symbol, signal_date, pct_change):
+                analyzed.append(signal_date)
+        return analyzed
+
+    def poll(self) -> Dict[str, List[pd.Timestamp]]:
+        """
+        Poll every symbol, up to config.MAX_CONCURRENT_SIGNALS at a time.
+        A symbol that fails is logged and skipped until the next poll.
+
+        Returns:
+            Dict[str, List[pd.Timestamp]]: Dates analyzed per symbol.
+        """
+        def safe_poll(symbol):
+            # Nobody is waiting on a poll: the UI and the API go first
+            try:
+                with request_priority(PRIORITY_BACKGROUND):
+                    return self.poll_symbol(symbol)
+            except Exception as e:
+                logger.error(f'Polling {symbol} failed: {e}')
+                return []
+
+        max_workers = max(1, min(config.MAX_CONCURRENT_SIGNALS, len(self.symbols)))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(self.symbols, pool.map(safe_poll, self.symbols)))
+
+    def run_forever(self, interval: float = None, stop: threading.Event = None) -> None:
+        """
+        Poll every `interval` seconds until `stop` is set.
+        """
+        interval = interval or config.WATCH_INTERVAL_SECONDS
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            analyzed = self.poll()
+            logger.info(f'Poll done, {sum(map(len, analyzed.values()))} new analyses')
+            stop.wait(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='StockAI watch mode')
+    parser.add_argument('--symbols', required=True, help='comma-separated ticker symbols')
+    parser.add_argument('--interval', type=float, default=config.WATCH_INTERVAL_SECONDS)
+    parser.add_argument('--threshold', type=float, default=5.0)
+    parser.add_argument('--lang', default='en', choices=sorted(LANG_CONFIG))
+    parser.add_argument('--once', action='store_true', help='poll once and exit')
+    args = parser.parse_args()
+
+    def emit(event):
+        print(json.dumps(event, ensure_ascii=False), flush=True)
+
+    watcher = Watcher(
+        symbols=[s.strip() for s in args.symbols.split(',') if s.strip()],
+        threshold=args.threshold,
+        lang=args.lang,
+        # Refresh at every poll instead of the UI's hourly refresh
+        price_fetcher=StoredPriceFetcher(refresh_seconds=args.interval / 2),
+        price_parser=config.PRICE_PARSERS[config.DEFAULT_PRICE_PARSER](),
+        news_fetcher=config.NEWS_FETCHERS[config.DEFAULT_NEWS_FETCHER](api_key=config.NEWSAPI_API_KEY),
+        news_parser=config.NEWS_PARSERS[config.DEFAULT_NEWS_PARSER](),
+        ledger=SignalLedger(),
+        analysis_cache=AnalysisCache(),
+        emit=emit
+    )
+    if args.once:
+        watcher.poll()
+    else:
+        watcher.run_forever(args.interval)
+
+
+if __name__ == '__main__':
+    main()